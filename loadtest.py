@@ -0,0 +1,445 @@
+'''
+합성 커뮤니티 부하 테스트 (python main.py loadtest)
+
+네 사이트 모양의 목록/상세 HTML과 목 GitHub Releases API를 로컬 서버로 띄우고,
+규모별로 새 프로세스에서 크롤링 → 샤드 → 병합 → 점수 → 통합 → 업로드를 실행해
+처리량/최대 RSS/단계별 지연을 기록한다. 크롤러 본체(main.py)를 그대로 import해 쓴다.
+'''
+
+from datetime import datetime, timedelta
+import multiprocessing as mp
+import json
+import time
+import os
+
+from main import (
+    KST, SITE_CRAWLERS, SITE_SPECS, Highlights, HotScoreCalculator, calculate_hot_scores, cluster_near_duplicates,
+    crawl_site_spec, load_shards, upload_highlights_to_release, upload_to_github_release, write_shard,
+)
+
+# 부하 테스트 기본 규모: 사이트별 목표 날짜 게시물 수 (합계 약 1,000건/일)와 목록 페이지당 행 수
+LOADTEST_BASE_POSTS = {'dcinside': 300, 'fmkorea': 300, 'theqoo': 250, 'instiz': 150}
+LOADTEST_ROWS_PER_PAGE = {'dcinside': 100, 'fmkorea': 20, 'theqoo': 20, 'instiz': 20}
+
+# 합성 제목 어휘 (같은 주제 단어를 공유해 사이트 간 유사 제목 클러스터가 생기도록)
+LOADTEST_WORDS = (
+    '속보', '근황', '논란', '반응', '공개', '역대급', '충격', '레전드', '후기', '정리', '요약', '발표',
+    '컴백', '티저', '직캠', '예능', '드라마', '영화', '야구', '축구', '게임', '신작', '패치', '출시',
+    '가격', '인상', '할인', '대란', '날씨', '폭염', '한파', '태풍', '지하철', '버스', '출근', '퇴근',
+    '회사', '연봉', '면접', '시험', '수능', '대학', '맛집', '카페', '여행', '공항', '호텔', '캠핑',
+)
+
+class SyntheticCommunity:
+    """부하 테스트용 합성 커뮤니티: 네 사이트 모양의 목록/상세 HTML과 목 GitHub Releases API를 로컬에서 서빙
+
+    - scale: 사이트별 기본 게시물 수(LOADTEST_BASE_POSTS)의 배수
+    - newer / older: 목표 날짜 게시물 대비 목록 앞(다음 날) / 뒤(이전 이틀)에 깔리는 게시물 비율
+    - boards: 디시 갤러리 수 (dcbest + board1...; 목표 날짜 게시물은 갤러리에 나눠 배치)
+    목록은 최신 글이 앞에 오고 HTML은 요청 시 만든다. 업로드된 에셋은 이름과 크기만 기록한다.
+    """
+
+    def __init__(self, crawl_date, scale=1.0, sites=None, rows_per_page=None, newer=0.2, older=0.5,
+                 boards=1, seed=0):
+        import random as random_module
+
+        self.crawl_date = crawl_date
+        self.scale = scale
+        self.sites = list(sites or SITE_CRAWLERS)
+        self.rows_per_page = dict(LOADTEST_ROWS_PER_PAGE, **(rows_per_page or {}))
+        self.boards = ['dcbest'] + [f'board{i}' for i in range(1, max(boards, 1))]
+        self.rng = random_module.Random(seed)
+        self.topics = [' '.join(self.rng.sample(LOADTEST_WORDS, 3)) for _ in range(500)]
+        self.listings = {}
+        self.expected = {}
+        self.releases = {}
+        self.uploads = []
+        self.server = None
+
+        for key in self.sites:
+            partitions = self.boards if key == 'dcinside' else [None]
+            total = int(LOADTEST_BASE_POSTS[key] * scale)
+            self.expected[key] = 0
+            for i, partition in enumerate(partitions):
+                # 목표 날짜 게시물은 파티션에 고르게 나눔
+                count = total // len(partitions) + (1 if i < total % len(partitions) else 0)
+                self.listings[(key, partition)] = self._listing(key, count, newer, older)
+                self.expected[key] += count
+
+    def _listing(self, key, count, newer, older):
+        """최신순 게시물 목록 [(날짜, 제목, 조회수, 댓글수)]"""
+        rows_per_page = self.rows_per_page[key]
+        # 더쿠처럼 수집 0건 페이지가 이어져야 끝나는 사이트를 위해 이전 날짜 글은 최소 3페이지
+        older_count = max(int(count * older), rows_per_page * 3)
+        days = ([self.crawl_date + timedelta(days=1)] * int(count * newer) + [self.crawl_date] * count
+                + sorted((self.crawl_date - timedelta(days=1 + i % 2) for i in range(older_count)), reverse=True))
+
+        posts = []
+        for day in days:
+            # 인기 주제일수록 자주 등장 (Zipf 비슷한 분포)
+            topic = self.topics[min(int(self.rng.paretovariate(1.1)) - 1, len(self.topics) - 1)]
+            title = f"{topic} {self.rng.choice(LOADTEST_WORDS)} {self.rng.randint(1, 999)}"
+            views = int(self.rng.paretovariate(1.3) * 300)
+            comments = int(self.rng.paretovariate(1.5) * 5)
+            posts.append((day, title, views, comments))
+        return posts
+
+    def page_count(self, key, partition=None):
+        posts = self.listings[(key, partition)]
+        return -(-len(posts) // self.rows_per_page[key])
+
+    def meta(self):
+        return {
+            'crawl_date': self.crawl_date.isoformat(),
+            'boards': self.boards,
+            'pages': {key: max(self.page_count(k, p) for (k, p) in self.listings if k == key) for key in self.sites},
+            'expected': self.expected,
+        }
+
+    def _post_url(self, key, partition, index):
+        return f"{self.base_url}/{key}/post/{partition or '-'}/{index}"
+
+    def render_list(self, key, page, partition=None):
+        rows_per_page = self.rows_per_page[key]
+        posts = self.listings[(key, partition)]
+        start = (page - 1) * rows_per_page
+        rows = [
+            (start + i, *post) for i, post in enumerate(posts[start:start + rows_per_page])
+        ]
+        return getattr(self, f'_render_{key}')(rows, partition, page)
+
+    def _render_dcinside(self, rows, board, page):
+        old = (self.crawl_date - timedelta(days=30)).strftime('%y.%m.%d')
+        # 실시간 베스트는 1페이지 2개, 이후 1개의 상단 고정글 / 일반 갤러리는 공지 1개
+        pinned = 2 if board == 'dcbest' and page == 1 else 1
+        html = [
+            f'<tr class="ub-content"><td class="gall_num">공지</td><td class="gall_tit ub-word">'
+            f'<a href="/notice">공지</a></td><td class="gall_date">{old}</td><td class="gall_count">0</td></tr>'
+        ] * (pinned if rows else 0)
+        for index, day, title, views, comments in rows:
+            html.append(
+                f'<tr class="ub-content"><td class="gall_num">{index + 1}</td>'
+                f'<td class="gall_tit ub-word"><a href="{self._post_url("dcinside", board, index)}">{title}</a>'
+                f'<a class="reply_numbox"><span class="reply_num">[{comments}]</span></a></td>'
+                f'<td class="gall_date">{day.strftime("%y.%m.%d")}</td><td class="gall_count">{views}</td></tr>'
+            )
+        return f'<table class="gall_list"><tbody>{"".join(html)}</tbody></table>'
+
+    def _render_fmkorea(self, rows, partition, page):
+        html = [
+            f'<div class="li"><h3 class="title"><a href="{self._post_url("fmkorea", None, index)}">'
+            f'{title} [{comments}]</a></h3><span class="regdate">{day.strftime("%Y.%m.%d")}</span></div>'
+            for index, day, title, views, comments in rows
+        ]
+        return f'<div class="fm_best_widget">{"".join(html)}</div>'
+
+    def _render_theqoo(self, rows, partition, page):
+        html = ['<tr class="notice"><td class="title"><a href="/notice">공지</a></td><td class="time">공지</td></tr>']
+        for index, day, title, views, comments in rows:
+            html.append(
+                f'<tr><td class="no">{index + 1}</td><td class="title">'
+                f'<a href="{self._post_url("theqoo", None, index)}">{title}</a>'
+                f'<a class="replyNum">{comments}</a></td>'
+                f'<td class="time">{day.strftime("%y.%m.%d")}</td><td class="m_no">{views}</td></tr>'
+            )
+        return f'<table class="theqoo_board_table"><tbody>{"".join(html)}</tbody></table>'
+
+    def _render_instiz(self, rows, partition, page):
+        html = [
+            f'<tr><td class="listsubject r{index % 2}"><a href="{self._post_url("instiz", None, index)}">'
+            f'<div class="sbj">{title} (<span class="cmt2">{comments}</span>)</div></a>'
+            f'<div class="listno regdate">{day.strftime("%m.%d")} 조회 {views:,}</div></td></tr>'
+            for index, day, title, views, comments in rows
+        ]
+        return f'<table id="mainboard">{"".join(html)}</table>'
+
+    def render_post(self, key, partition, index):
+        _, title, views, _ = self.listings[(key, None if partition == '-' else partition)][index]
+        return f'<h1>{title}</h1><div class="side fr"><span>조회 {views:,}</span></div>'
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def serve(self, port=0):
+        """목록/상세 페이지 + 목 Releases API(/api)를 백그라운드 스레드로 실행"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import urlparse, parse_qs
+
+        community = self
+
+        class SyntheticHandler(BaseHTTPRequestHandler):
+            def _send(self, status, body, content_type='text/html; charset=utf-8'):
+                if not isinstance(body, bytes):
+                    body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status, data):
+                self._send(status, json.dumps(data, ensure_ascii=False), 'application/json; charset=utf-8')
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                parts = url.path.strip('/').split('/')
+                try:
+                    if parts == ['meta']:
+                        self._json(200, community.meta())
+                    elif parts[0] == 'api' and parts[-2] == 'tags':
+                        release = community.releases.get(parts[-1])
+                        if release:
+                            self._json(200, release)
+                        else:
+                            self._json(404, {'message': 'Not Found'})
+                    elif len(parts) == 4 and parts[1] == 'post':
+                        self._send(200, community.render_post(parts[0], parts[2], int(parts[3])))
+                    elif len(parts) == 1 and parts[0] in community.sites:
+                        page = int(query.get('page', ['1'])[0])
+                        board = query.get('id', [None])[0] if parts[0] == 'dcinside' else None
+                        self._send(200, community.render_list(parts[0], page, board))
+                    else:
+                        self.send_error(404)
+                except (KeyError, IndexError, ValueError):
+                    self.send_error(404)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                parts = url.path.strip('/').split('/')
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if parts[0] == 'api' and parts[-1] == 'releases':
+                    tag = json.loads(body)['tag_name']
+                    release_id = len(community.releases) + 1
+                    community.releases[tag] = {
+                        'id': release_id,
+                        'tag_name': tag,
+                        'html_url': f"{community.base_url}/releases/{tag}",
+                        'upload_url': f"{community.base_url}/uploads/{release_id}/assets{{?name,label}}",
+                        'assets': [],
+                    }
+                    self._json(201, community.releases[tag])
+                elif parts[0] == 'uploads':
+                    name = parse_qs(url.query).get('name', [''])[0]
+                    release = next(r for r in community.releases.values() if str(r['id']) == parts[1])
+                    # GitHub처럼 같은 이름 에셋이 있으면 422
+                    if any(asset['name'] == name for asset in release['assets']):
+                        self._json(422, {'message': 'Validation Failed', 'errors': [{'code': 'already_exists'}]})
+                        return
+                    asset = {'id': len(community.uploads) + 1, 'name': name, 'size': len(body),
+                             'browser_download_url': f"{community.base_url}/download/{name}"}
+                    community.uploads.append(asset)
+                    release['assets'].append(asset)
+                    self._json(201, asset)
+                else:
+                    self.send_error(404)
+
+            def do_DELETE(self):
+                parts = urlparse(self.path).path.strip('/').split('/')
+                if parts[0] == 'api' and parts[-2] == 'assets':
+                    for release in community.releases.values():
+                        release['assets'] = [a for a in release['assets'] if str(a['id']) != parts[-1]]
+                    self._send(204, b'')
+                else:
+                    self.send_error(404)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), SyntheticHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='synthetic', daemon=True).start()
+        return self.base_url
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+def load_test_specs(base_url, meta):
+    """SITE_SPECS를 합성 서버용으로 복사 (URL만 바꾸고 요청 간격 0, 결과 수 제한 없음, 목록 끝까지)"""
+    import copy
+
+    specs = {}
+    for key in meta['pages']:
+        spec = copy.copy(SITE_SPECS[key])
+        template = f"{base_url}/dcinside?id={{board}}&page={{page}}" if key == 'dcinside' else f"{base_url}/{key}?page={{page}}"
+        spec.url_template = template
+        spec.delay = (0, 0)
+        spec.max_records = None
+        if key == 'dcinside':
+            boards = meta['boards']
+            spec.partitions = lambda: boards
+        if spec.stop_rule == 'page_range':
+            spec.max_pages = meta['pages'][key]
+        specs[key] = spec
+    return specs
+
+def _load_test_worker(base_url, work_dir, queue):
+    """부하 테스트 한 규모 실행 (spawn 자식 프로세스): 크롤링 → 샤드 → 병합 → 점수 → 통합 → 업로드"""
+    import resource
+    import pandas as pd
+    import requests
+
+    def peak_rss_mb():
+        # Linux ru_maxrss는 KB 단위
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    try:
+        os.environ.update({
+            'G_TOKEN': 'loadtest', 'REPO_OWNER': 'loadtest', 'REPO_NAME': 'loadtest',
+            'GITHUB_API_URL': f"{base_url}/api", 'NO_PROXY': '127.0.0.1,localhost',
+        })
+        # 업로드 실패 시 백업 파일도 작업 디렉터리에 남도록
+        os.makedirs(work_dir, exist_ok=True)
+        os.chdir(work_dir)
+        meta = requests.get(f"{base_url}/meta", timeout=30).json()
+        crawl_date = datetime.strptime(meta['crawl_date'], '%Y-%m-%d').date()
+        target_date = crawl_date.strftime('%m%d')
+        specs = load_test_specs(base_url, meta)
+        hot_calc = HotScoreCalculator()
+
+        stages, counts = [], {}
+
+        def stage(name, fn):
+            started = time.perf_counter()
+            result = fn()
+            stages.append({'stage': name, 'sec': round(time.perf_counter() - started, 3), 'peak_rss_mb': round(peak_rss_mb(), 1)})
+            return result
+
+        shard_dir = 'shards'
+        for key, spec in specs.items():
+            df = stage(f"crawl:{key}", lambda: crawl_site_spec(spec, target_date, fetch_mode='http', on_record=hot_calc.observe))
+            counts[key] = len(df)
+            stage(f"shard:{key}", lambda: write_shard(shard_dir, key, df, crawl_date))
+
+        all_results, _ = stage('merge', lambda: load_shards(shard_dir))
+        highlights = Highlights()
+        stage('score', lambda: calculate_hot_scores(all_results, hot_calc, crawl_date=crawl_date.isoformat(),
+                                                     highlights=highlights))
+
+        def combine():
+            final_df = pd.concat([df for df in all_results.values() if len(df)], ignore_index=True)
+            return cluster_near_duplicates(final_df).sort_values('hot_score', ascending=False)
+        final_df = stage('combine', combine)
+
+        def upload():
+            result = upload_to_github_release(final_df, f"community_crawling_{target_date}_loadtest.csv")
+            upload_highlights_to_release(highlights, f"community_highlights_{target_date}_loadtest.json", crawl_date)
+            return result
+        upload_result = stage('upload', upload)
+
+        queue.put(('done', {'counts': counts, 'stages': stages, 'peak_rss_mb': round(peak_rss_mb(), 1),
+                            'uploaded': upload_result['success']}))
+    except Exception as e:
+        queue.put(('error', f"{type(e).__name__}: {e}"))
+
+def run_load_test(scales=(1, 10, 100), sites=None, out_dir='data/loadtest', newer=0.2, older=0.5, boards=1,
+                  timeout=3600):
+    """합성 커뮤니티로 규모별 전체 파이프라인을 실행해 처리량/최대 RSS/단계별 지연을 기록
+
+    규모마다 깨끗한 spawn 자식 프로세스에서 실행하므로 최대 RSS가 규모별로 분리된다.
+    결과는 out_dir의 loadtest.json / loadtest.csv (+ matplotlib이 있으면 loadtest.png).
+    """
+    import queue as queue_module
+    import shutil
+
+    os.makedirs(out_dir, exist_ok=True)
+    crawl_date = datetime.now(KST).date() - timedelta(days=1)
+    ctx = mp.get_context('spawn')
+    results = []
+
+    for scale in scales:
+        community = SyntheticCommunity(crawl_date, scale, sites=sites, newer=newer, older=older, boards=boards)
+        base_url = community.serve()
+        work_dir = os.path.abspath(os.path.join(out_dir, f"scale_{scale:g}"))
+        shutil.rmtree(work_dir, ignore_errors=True)
+        print(f"🧪 부하 테스트 {scale:g}배: 목표 날짜 게시물 {sum(community.expected.values())}건 ({base_url})")
+
+        queue = ctx.Queue()
+        process = ctx.Process(target=_load_test_worker, args=(base_url, work_dir, queue), daemon=True)
+        started = time.perf_counter()
+        process.start()
+        try:
+            kind, payload = queue.get(timeout=timeout)
+        except queue_module.Empty:
+            kind, payload = 'error', f"{timeout}초 안에 끝나지 않음"
+        finally:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+            community.shutdown()
+        wall_sec = time.perf_counter() - started
+
+        if kind == 'error':
+            print(f"❌ {scale:g}배 실패: {payload}")
+            results.append({'scale': scale, 'error': payload})
+            continue
+
+        posts = sum(payload['counts'].values())
+        result = {
+            'scale': scale,
+            'posts': posts,
+            'expected': sum(community.expected.values()),
+            'missing': {k: community.expected[k] - n for k, n in payload['counts'].items() if n != community.expected[k]},
+            'wall_sec': round(wall_sec, 2),
+            'throughput': round(posts / wall_sec, 1) if wall_sec else None,
+            'peak_rss_mb': payload['peak_rss_mb'],
+            'stages': {s['stage']: s['sec'] for s in payload['stages']},
+            'uploaded_bytes': sum(u['size'] for u in community.uploads),
+            'uploaded': payload['uploaded'],
+        }
+        results.append(result)
+        print(f"📈 {scale:g}배: {posts}/{result['expected']}건, {wall_sec:.1f}초, "
+              f"{result['throughput']}건/초, 최대 RSS {result['peak_rss_mb']}MB")
+
+    with open(os.path.join(out_dir, 'loadtest.json'), 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    write_load_test_report(results, out_dir)
+    return results
+
+def write_load_test_report(results, out_dir):
+    """규모별 결과 표(CSV)와 차트(PNG, matplotlib이 있을 때만) 저장"""
+    import pandas as pd
+
+    rows = [
+        dict({k: v for k, v in r.items() if k not in ('stages', 'missing')},
+             **{f"sec_{stage}": sec for stage, sec in r.get('stages', {}).items()})
+        for r in results
+    ]
+    table = pd.DataFrame(rows)
+    table.to_csv(os.path.join(out_dir, 'loadtest.csv'), index=False, encoding='utf-8-sig')
+    print(table.drop(columns=[c for c in table.columns if c.startswith('sec_shard')]).to_string(index=False))
+
+    ok = [r for r in results if 'error' not in r]
+    if not ok:
+        return
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("ℹ️ matplotlib이 없어 차트는 건너뜀 (loadtest.csv 참고)")
+        return
+
+    posts = [r['posts'] for r in ok]
+    fig, axes = plt.subplots(1, 3, figsize=(16, 4.5))
+    axes[0].plot(posts, [r['throughput'] for r in ok], marker='o')
+    axes[0].set_title('throughput (posts/s)')
+    axes[1].plot(posts, [r['peak_rss_mb'] for r in ok], marker='o')
+    axes[1].set_title('peak RSS (MB)')
+    for stage in ok[-1]['stages']:
+        if not stage.startswith('shard:'):
+            axes[2].plot(posts, [r['stages'].get(stage) for r in ok], marker='o', label=stage)
+    axes[2].set_title('stage latency (s)')
+    axes[2].set_yscale('log')
+    axes[2].legend(fontsize=8)
+    for ax in axes:
+        ax.set_xscale('log')
+        ax.set_xlabel('posts')
+        ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(os.path.join(out_dir, 'loadtest.png'), dpi=120)
+    plt.close(fig)
+    print(f"📊 차트 저장: {os.path.join(out_dir, 'loadtest.png')}")
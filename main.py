@@ -1,14 +1,13 @@
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime, timedelta, timezone
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import multiprocessing as mp
 from io import BytesIO
-import pandas as pd
-import numpy as np
 import requests
 import logging
+import sqlite3
+import pickle
+import math
+import zlib
 import random
 import json
 import time
@@ -25,11 +24,184 @@ logger = logging.getLogger(__name__)
 
 KST = timezone(timedelta(hours=9))
 
+DEFAULT_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 페이지 수집 방식: hybrid(HTTP 우선, 챌린지 시 브라우저) / http / browser
+DEFAULT_FETCH_MODE = os.environ.get('FETCH_MODE', 'hybrid')
+
+# 봇 차단/JS 챌린지 응답 판별용
+CHALLENGE_STATUS_CODES = (403, 429)
+CHALLENGE_MARKERS = (
+    'cf-browser-verification',
+    '_cf_chl_opt',
+    'Just a moment...',
+    'Checking your browser before accessing',
+    'DDoS-Guard',
+)
+
+# Chrome 드라이버 프로필: default(기존 설정) / lean(리소스 차단 + eager 로드)
+DEFAULT_DRIVER_PROFILE = os.environ.get('DRIVER_PROFILE', 'lean')
+
+# lean 프로필에서 CDP로 차단할 리소스 (확장자 + 광고/분석 도메인)
+LEAN_BLOCKED_URLS = [
+    # 이미지, 미디어, 폰트, 스타일시트
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.ogg',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.css',
+    # 광고/분석
+    '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*',
+    '*google-analytics.com*', '*googletagmanager.com*', '*googletagservices.com*',
+    '*adservice.google.*', '*facebook.net*', '*scorecardresearch.com*',
+    '*criteo.com*', '*criteo.net*', '*taboola.com*', '*outbrain.com*',
+    '*dable.io*', '*mobon.net*', '*realclick.co.kr*', '*adfit*', '*kakaoad*',
+    '*analytics.naver.com*', '*wcs.naver.net*', '*tenping.kr*',
+]
+
+class P2Quantile:
+    """P² 알고리즘 기반 스트리밍 분위수 추정기 (값 저장 없이 마커 5개만 유지)"""
+
+    def __init__(self, q):
+        self.q = q
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        h = self.heights
+
+        # 처음 5개는 그대로 모아 정렬
+        if self.count <= 5:
+            h.append(x)
+            h.sort()
+            return
+
+        n = self.positions
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while not (h[k] <= x < h[k + 1]):
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # 가운데 마커 위치/높이 보정
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolic = h[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+                if h[i - 1] < parabolic < h[i + 1]:
+                    h[i] = parabolic
+                else:
+                    h[i] = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def value(self):
+        if not self.heights:
+            return 0.0
+        if self.count <= 5:
+            index = min(int(round(self.q * (len(self.heights) - 1))), len(self.heights) - 1)
+            return float(self.heights[index])
+        return float(self.heights[2])
+
+class OnlineSiteStats:
+    """수집 중 레코드가 들어올 때마다 갱신되는 사이트별 러닝 최대값/분위수"""
+
+    def __init__(self, quantiles=(0.5, 0.9, 0.99)):
+        self.count = 0
+        self.max_views = 0
+        self.max_comments = 0
+        self.view_quantiles = {q: P2Quantile(q) for q in quantiles}
+        self.comment_quantiles = {q: P2Quantile(q) for q in quantiles}
+
+    def update(self, views, comments):
+        self.count += 1
+        self.max_views = max(self.max_views, views)
+        self.max_comments = max(self.max_comments, comments)
+        for sketch in self.view_quantiles.values():
+            sketch.add(views)
+        for sketch in self.comment_quantiles.values():
+            sketch.add(comments)
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'max_views': self.max_views,
+            'max_comments': self.max_comments,
+            'views_quantiles': {q: round(s.value(), 1) for q, s in self.view_quantiles.items()},
+            'comments_quantiles': {q: round(s.value(), 1) for q, s in self.comment_quantiles.items()},
+        }
+
 class HotScoreCalculator:
-    def __init__(self):
+    """화제성 점수 계산기
+
+    - normalization='max': 당일 사이트별 최고 조회수/댓글수 기준 (기존 방식)
+    - normalization='rolling': 최근 history_days일의 일별 분위수(quantile) 중앙값 기준.
+      하루 한 개의 극단값 게시물이 그날 전체 점수를 끌어내리는 것을 막는다.
+
+    observe()로 수집 중에 레코드를 흘려 넣으면 러닝 통계로 잠정 점수를 바로 계산하고,
+    모든 수집이 끝난 뒤 collect_stats()가 전체 데이터로 정확한 값을 다시 계산한다.
+    """
+
+    def __init__(self, normalization='max', history_path=None, history_days=7, quantile=0.99):
+        if normalization not in ('max', 'rolling'):
+            raise ValueError(f"알 수 없는 정규화 방식: {normalization}")
+
         self.site_stats = {}
-    
-    def collect_stats(self, data):
+        self.online_stats = {}
+        self.normalization = normalization
+        self.history_path = history_path
+        self.history_days = history_days
+        self.quantile = quantile
+        self.history = self._load_history() if normalization == 'rolling' else {}
+
+    def observe(self, record):
+        """수집된 레코드 1건으로 러닝 통계를 갱신하고 잠정 화제성 점수를 반환"""
+        source = record['source']
+        if source not in self.online_stats:
+            self.online_stats[source] = OnlineSiteStats(quantiles=(0.5, 0.9, self.quantile))
+
+        views = record.get('views') or 0
+        comments = record.get('comments') or 0
+        self.online_stats[source].update(views, comments)
+        return self.provisional_score(views, comments, source)
+
+    def provisional_score(self, views, comments, source):
+        """수집 도중의 잠정 점수 (rolling 이력이 있으면 이력 기준, 없으면 러닝 최대값 기준)"""
+        baseline = self._rolling_baseline(source) if self.normalization == 'rolling' else None
+        if baseline:
+            norm_views, norm_comments = baseline
+        elif source in self.online_stats:
+            stats = self.online_stats[source]
+            norm_views, norm_comments = max(stats.max_views, 1), max(stats.max_comments, 1)
+        else:
+            return 0.0
+        return self._score(views, comments, norm_views, norm_comments)
+
+    def report_provisional(self, source):
+        """사이트별 러닝 통계 요약 출력"""
+        if source not in self.online_stats:
+            return
+        snap = self.online_stats[source].snapshot()
+        print(f"   ⏱️ {source} 잠정 통계: {snap['count']}건, 최고 조회수 {snap['max_views']:,}, "
+              f"최고 댓글 {snap['max_comments']}, 댓글 p90 {snap['comments_quantiles'][0.9]}")
+
+    def collect_stats(self, data, crawl_date=None):
         for site_name, df in data.items():
             if len(df) > 0:
                 # 조회수와 댓글수 컬럼 확인
@@ -52,6 +224,12 @@ class HotScoreCalculator:
                 }
                 
                 print(f"   {site_name}: 최고 조회수 {max_views:,}, 최고 댓글 {max_comments}")
+
+                if self.normalization == 'rolling':
+                    self._apply_rolling(site_name, df, views_col, comments_col, crawl_date)
+
+        if self.normalization == 'rolling':
+            self._save_history()
     
     def calculate_hot_score(self, views, comments, source):
         """화제성 점수 계산 (최대 11점)"""
@@ -59,20 +237,94 @@ class HotScoreCalculator:
             return 0.0
         
         stats = self.site_stats[source]
-        
+        return self._score(views, comments, stats['max_views'], stats['max_comments'])
+
+    def score_frame(self, df):
+        """DataFrame 전체의 화제성 점수를 벡터 연산으로 계산 (calculate_hot_score와 같은 식)"""
+        import numpy as np
+
+        views = df['views'].fillna(0).to_numpy(dtype=float) if 'views' in df.columns else np.zeros(len(df))
+        comments = df['comments'].fillna(0).to_numpy(dtype=float) if 'comments' in df.columns else np.zeros(len(df))
+        # 통계가 없는 사이트는 기준값을 무한대로 두어 0점 (샤드에서 읽은 source는 category)
+        sources = df['source'].astype(object)
+        max_views = sources.map({source: stats['max_views'] for source, stats in self.site_stats.items()})
+        max_comments = sources.map({source: stats['max_comments'] for source, stats in self.site_stats.items()})
+        max_views = max_views.fillna(np.inf).to_numpy(dtype=float)
+        max_comments = max_comments.fillna(np.inf).to_numpy(dtype=float)
+
+        scores = np.minimum(views / max_views, 1.0) + np.minimum(comments / max_comments * 10, 10.0)
+        # np.round와 round()는 경계값에서 결과가 달라 기존 점수와 맞추려고 round() 사용
+        return np.array([round(score, 2) for score in scores.tolist()])
+
+    @staticmethod
+    def _score(views, comments, norm_views, norm_comments):
         # 조회수 점수 (최대 1점)
-        view_score = min(views / stats['max_views'], 1.0)
+        view_score = min(views / norm_views, 1.0)
         
         # 댓글 점수 (최대 10점)  
-        comment_score = min((comments / stats['max_comments']) * 10, 10.0)
+        comment_score = min((comments / norm_comments) * 10, 10.0)
         
         # 총합 (최대 11점)
         total_score = view_score + comment_score
         
         return round(total_score, 2)
 
-def setup_driver():
-    """GitHub Actions 환경에 최적화된 Chrome 설정 (Selenium 4.x 호환)"""
+    def _apply_rolling(self, site_name, df, views_col, comments_col, crawl_date):
+        """당일 정확한 분위수를 이력에 기록하고 최근 N일 기준값으로 정규화값 교체"""
+        day_key = crawl_date or datetime.now(KST).date().isoformat()
+        views_q = float(df[views_col].quantile(self.quantile)) if views_col else 1.0
+        comments_q = float(df[comments_col].quantile(self.quantile)) if comments_col else 1.0
+
+        site_history = self.history.setdefault(site_name, {})
+        site_history[day_key] = {'views': views_q, 'comments': comments_q}
+
+        # 오래된 날짜 정리
+        for old_key in sorted(site_history)[:-self.history_days]:
+            del site_history[old_key]
+
+        norm_views, norm_comments = self._rolling_baseline(site_name)
+        self.site_stats[site_name] = {
+            'max_views': norm_views,
+            'max_comments': norm_comments
+        }
+        print(f"   {site_name}: 최근 {len(site_history)}일 p{int(self.quantile * 100)} 기준 "
+              f"조회수 {norm_views:,.0f}, 댓글 {norm_comments:.1f}")
+
+    def _rolling_baseline(self, site_name):
+        import numpy as np
+
+        site_history = self.history.get(site_name)
+        if not site_history:
+            return None
+        days = sorted(site_history)[-self.history_days:]
+        views = float(np.median([site_history[d]['views'] for d in days]))
+        comments = float(np.median([site_history[d]['comments'] for d in days]))
+        return max(views, 1.0), max(comments, 1.0)
+
+    def _load_history(self):
+        if self.history_path and os.path.exists(self.history_path):
+            with open(self.history_path, encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save_history(self):
+        if not self.history_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.history_path)), exist_ok=True)
+        with open(self.history_path, 'w', encoding='utf-8') as f:
+            json.dump(self.history, f, ensure_ascii=False, indent=2)
+
+def setup_driver(profile=None, proxy=None):
+    """GitHub Actions 환경에 최적화된 Chrome 설정 (Selenium 4.x 호환)
+
+    profile='lean'이면 이미지/미디어/폰트/CSS/광고 요청을 차단하고
+    eager 로드 전략을 사용하며 암묵적 대기를 끈다 (명시적 대기 전제)
+    proxy를 주면 (예: 'http://host:3128') 모든 요청을 해당 프록시로 보낸다
+    """
+    profile = profile or DEFAULT_DRIVER_PROFILE
+    if profile not in ('default', 'lean'):
+        raise ValueError(f"알 수 없는 드라이버 프로필: {profile}")
+
     try:
         from selenium import webdriver
         from selenium.webdriver.chrome.service import Service
@@ -88,7 +340,6 @@ def setup_driver():
         opts.add_argument("--disable-gpu")
         opts.add_argument("--disable-extensions")
         opts.add_argument("--disable-plugins")
-        opts.add_argument("--disable-images")
         
         # 안정성 향상 옵션들
         opts.add_argument("--disable-web-security")
@@ -113,8 +364,18 @@ def setup_driver():
         opts.add_argument("--disable-sync")
         
         # User Agent 설정
-        opts.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        opts.add_argument(f"--user-agent={DEFAULT_USER_AGENT}")
         
+        # 출구 프록시 (Chrome 플래그는 인증 정보를 받지 않으므로 인증 프록시는 거부)
+        if proxy:
+            from urllib.parse import urlparse
+
+            parsed = urlparse(proxy)
+            if parsed.username:
+                raise ValueError(f"브라우저는 인증 프록시를 지원하지 않습니다: {parsed.hostname}")
+            port = f":{parsed.port}" if parsed.port else ""
+            opts.add_argument(f"--proxy-server={parsed.scheme}://{parsed.hostname}{port}")
+
         # 창 크기 설정
         opts.add_argument("--window-size=1920,1080")
         opts.add_argument("--start-maximized")
@@ -124,6 +385,16 @@ def setup_driver():
         opts.add_experimental_option('excludeSwitches', ['enable-logging'])
         opts.add_experimental_option('useAutomationExtension', False)
         
+        # lean 프로필: 리소스 차단 + DOMContentLoaded 시점에 반환
+        if profile == 'lean':
+            opts.page_load_strategy = 'eager'
+            opts.add_argument("--blink-settings=imagesEnabled=false")
+            opts.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.managed_default_content_settings.media_stream': 2,
+                'profile.default_content_setting_values.notifications': 2,
+            })
+        
         # GitHub Actions 환경 감지 및 Chrome 경로 설정
         if os.environ.get('GITHUB_ACTIONS'):
             logger.info("GitHub Actions 환경 감지됨")
@@ -187,9 +458,19 @@ def setup_driver():
 
         # 타임아웃 설정
         driver.set_page_load_timeout(30)
-        driver.implicitly_wait(10)
         driver.set_script_timeout(30)
         
+        if profile == 'lean':
+            # 암묵적 대기 대신 명시적 대기(WebDriverWait)만 사용
+            driver.implicitly_wait(0)
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+            except Exception as e:
+                logger.warning(f"CDP 리소스 차단 설정 실패: {e}")
+        else:
+            driver.implicitly_wait(10)
+        
         # 창 크기 설정 확인
         try:
             driver.set_window_size(1920, 1080)
@@ -213,852 +494,4315 @@ def which(command):
         pass
     return None
 
-def upload_to_github_release(df, filename):
-    """GitHub Release에 CSV 파일 업로드"""    
-    try:
-        github_token = os.environ.get('G_TOKEN')
-        repo_owner = os.environ.get('REPO_OWNER')
-        repo_name = os.environ.get('REPO_NAME')
-        
-        # 환경변수 확인
-        if not github_token:
-            raise ValueError("GITHUB_TOKEN 환경변수가 필요합니다")
-        if not repo_owner:
-            raise ValueError("REPO_OWNER 환경변수가 필요합니다")  
-        if not repo_name:
-            raise ValueError("REPO_NAME 환경변수가 필요합니다")
-        
-        logger.info(f"GitHub Release 업로드: {repo_owner}/{repo_name}")
-        
-        headers = {
-            'Authorization': f'token {github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
-        # 오늘 날짜로 릴리즈 태그 생성
-        today = datetime.now().strftime('%Y%m%d')
-        tag_name = f"data-{today}"
-        release_name = f"크롤링 데이터 {today}"
-        
-        # 기존 릴리즈 확인
-        release_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/tags/{tag_name}"
-        response = requests.get(release_url, headers=headers)
-        
-        if response.status_code == 200:
-            # 기존 릴리즈 사용
-            release_data = response.json()
-            upload_url = release_data['upload_url'].replace('{?name,label}', '')
-            logger.info(f"기존 릴리즈 사용: {tag_name}")
-        else:
-            # 새 릴리즈 생성
-            logger.info(f"새 릴리즈 생성: {tag_name}")
-            create_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases"
-            
-            create_data = {
-                "tag_name": tag_name,
-                "name": release_name,
-                "body": f"자동 크롤링 데이터\\n\\n생성시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\\n게시글 수: {len(df)}개",
-                "draft": False,
-                "prerelease": False
-            }
-            
-            response = requests.post(create_url, headers=headers, json=create_data)
-            if response.status_code != 201:
-                raise Exception(f"릴리즈 생성 실패: {response.status_code} - {response.text}")
-            
-            release_data = response.json()
-            upload_url = release_data['upload_url'].replace('{?name,label}', '')
-        
-        # CSV 데이터 준비
-        csv_data = df.to_csv(index=False, encoding='utf-8-sig')
-        
-        # 파일 업로드
-        upload_headers = headers.copy()
-        upload_headers['Content-Type'] = 'text/csv'
-        
-        logger.info(f"파일 업로드 중: {filename}")
-        upload_response = requests.post(
-            f"{upload_url}?name={filename}",
-            headers=upload_headers,
-            data=csv_data.encode('utf-8-sig')
-        )
-        
-        if upload_response.status_code == 201:
-            file_data = upload_response.json()
-            download_url = file_data['browser_download_url']
-            
-            logger.info(f"✅ GitHub Release 업로드 성공: {filename}")
-            logger.info(f"🔗 다운로드 링크: {download_url}")
-            
-            return {
-                'success': True,
-                'download_url': download_url,
-                'release_url': release_data['html_url'],
-                'file_size': len(csv_data.encode('utf-8-sig'))
-            }
-        else:
-            raise Exception(f"파일 업로드 실패: {upload_response.status_code} - {upload_response.text}")
-            
-    except Exception as e:
-        logger.error(f"❌ GitHub Release 업로드 실패: {e}")
-        
-        # 백업: 로컬에 파일 저장 (GitHub Actions artifact)
-        logger.info("백업: 로컬에 파일 저장")
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
-        
-        return {
-            'success': False,
-            'error': str(e),
-            'local_file': filename
-        }
+class StableElementCount:
+    """요소 개수가 settle초 동안 변하지 않으면 참이 되는 대기 조건"""
 
-def is_today_post(date_str, target_date):
-    """당일 게시물인지 확인 (시간 형태는 당일로 간주)"""
-    try:
-        today = datetime.today()
-        
-        # 시간 형태 (HH:MM)면 당일로 간주
-        if ':' in date_str and not re.search(r'\d{2}\.\d{2}', date_str):
-            today_mmdd = today.strftime("%m%d")
-            return target_date == today_mmdd
-        
-        # 날짜 형태에서 MMDD 추출
-        date_digits = re.sub(r'[^\d]', '', date_str)[-4:]
-        return target_date == date_digits
-    except:
-        return False
+    def __init__(self, selector, settle=0.3):
+        self.selector = selector
+        self.settle = settle
+        self.last_count = -1
+        self.changed_at = time.time()
 
-def crawl_dcinside_requests(target_date):    
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
-    
-    results = []
-    page = 1
-    started_collecting = False
-    
-    def should_stop_crawling(date_str, target_date):
-        # 시간 형태면 계속 진행
-        if ':' in date_str and not re.search(r'\d{2}\.\d{2}', date_str):
-            return False
-        
-        try:
-            date_digits = re.sub(r'[^\d]', '', date_str)[-4:]
-            return date_digits < target_date
-        except:
+    def __call__(self, driver):
+        from selenium.webdriver.common.by import By
+
+        count = len(driver.find_elements(By.CSS_SELECTOR, self.selector))
+        now = time.time()
+        if count != self.last_count:
+            self.last_count = count
+            self.changed_at = now
             return False
-    
-    while True: 
-        try:
-            url = f"https://gall.dcinside.com/board/lists/?id=dcbest&page={page}&list_num=100&_dcbest=9"
-            response = session.get(url, timeout=60)
-            
-            if response.status_code != 200:
-                print(f"❌ {page}페이지 요청 실패: {response.status_code}")
-                break
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            rows = soup.select('tr.ub-content')
-            
-            if page == 1:
-                rows = rows[2:]
-            else:
-                rows = rows[1:]
-                
-            if not rows:
-                print(f"{page}페이지: 게시물 없음, 크롤링 종료")
-                break
-            
-            # 해당 페이지의 모든 날짜 먼저 확인
-            page_dates = []
-            for row in rows:
-                try:
-                    date_tag = row.select_one('td.gall_date')
-                    date = date_tag.get_text(strip=True) if date_tag else ''
-                    page_dates.append(date)
-                except:
-                    continue
-            
-            # 해당 페이지에 target_date가 있는지 확인
-            has_target_date = any(is_today_post(date, target_date) for date in page_dates)
-            
-            # 모든 날짜가 target_date보다 이전이면 중단
-            all_dates_before_target = all(should_stop_crawling(date, target_date) for date in page_dates if date)
-            
-            if all_dates_before_target and started_collecting:
-                print(f"{page}페이지: 모든 게시물이 목표 날짜 이전. 크롤링 종료")
-                break
-            
-            if has_target_date:
-                started_collecting = True
-                print(f"{page}페이지: 목표 날짜 발견, 수집 시작")
-                
-                for row in rows:
-                    try:
-                        # 날짜 먼저 확인
-                        date_tag = row.select_one('td.gall_date')
-                        date = date_tag.get_text(strip=True) if date_tag else ''
-                        
-                        if not is_today_post(date, target_date):
-                            continue
-                            
-                        # 기본 정보 추출
-                        title_tag = row.select_one('td.gall_tit.ub-word a')
-                        title_raw = title_tag.get_text(strip=True) if title_tag else ''
-                        post_url = title_tag.get('href') if title_tag else ''
-                        
-                        if post_url and not post_url.startswith('http'):
-                            post_url = f"https://gall.dcinside.com{post_url}"
-                        
-                        title = re.sub(r'^[\[\(][^\]\)]{1,3}[\]\)]\s*', '', title_raw)
-                        
-                        view_tag = row.select_one('td.gall_count')
-                        view = int(view_tag.text.replace(',', '').strip()) if view_tag and view_tag.text.strip().isdigit() else 0
-                        
-                        comment_tag = row.select_one('a.reply_numbox span.reply_num')
-                        comment = 0
-                        if comment_tag:
-                            match = re.search(r'\[(\d+)', comment_tag.text.strip())
-                            if match:
-                                comment = int(match.group(1))
-                        
-                        results.append({
-                            'title': title,
-                            'url': post_url,
-                            'source': '디시인사이드',
-                            'views': view,
-                            'comments': comment,
-                            'date': date,
-                        })
-                        
-                    except Exception as e:
-                        continue
-            else:
-                print(f"⏭️ {page}페이지: 목표 날짜 없음, 스킵")
-                
-            page += 1
-            time.sleep(random.uniform(0.5, 1.0))  # 요청 간격
-            
-            if len(results) > 300:
-                print(f"🔚 결과 수 제한 (300개) 도달, 크롤링 중단")
-                break
-            
-        except Exception as e:
-            print(f"⚠️ 디시인사이드 {page}페이지 오류: {e}")
-            page += 1
-            continue
-    
-    df = pd.DataFrame(results)
-    print(f"✅ 디시인사이드 크롤링 완료 (총 {len(df)}건)")
-    return df
+        return count > 0 and now - self.changed_at >= self.settle
 
-def crawl_fmkorea_selenium_simple(target_date):    
-    driver = setup_driver()
-    results = []
+def wait_for_page(driver, selector=None, timeout=10, settle=0.0):
+    """문서 준비 → 대상 요소 등장 → (settle>0이면) 요소 개수 안정화까지 대기
 
-    def get_views_from_post(driver, url, wait_sec=10):
-        origin = driver.current_window_handle
-        try:
-            # 새 탭으로 열기 (뒤로가기보다 안정적)
-            driver.execute_script("window.open(arguments[0], '_blank');", url)
-            driver.switch_to.window(driver.window_handles[-1])
+    전체 대기 시간은 timeout 안에서 나눠 쓰며, 실제 대기한 시간(초)을 반환한다.
+    문서 준비/요소 등장이 시간 안에 안 되면 TimeoutException이 발생한다.
+    """
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
 
-            # 상세 페이지 로드 대기: side 영역 등장
-            WebDriverWait(driver, wait_sec).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.side.fr span"))
-            )
+    started = time.time()
 
-            # 보통 '조회 1,234' 형태. 여러 span 중 '조회' 포함 텍스트를 우선 파싱
-            spans = driver.find_elements(By.CSS_SELECTOR, "div.side.fr span")
-            views = 0
-            for s in spans:
-                t = s.text.strip()
-                m = re.search(r'조회\s*([\d,]+)', t)
-                if m:
-                    views = int(m.group(1).replace(",", ""))
-                    break
+    def remaining():
+        return max(timeout - (time.time() - started), 0.1)
 
-            # 위 패턴이 없으면 첫 span에서 숫자만 추출(백업)
-            if views == 0 and spans:
-                m = re.search(r'([\d,]+)', spans[0].text)
-                if m:
-                    views = int(m.group(1).replace(",", ""))
+    # eager 로드에서는 interactive 시점에 driver.get이 반환됨
+    WebDriverWait(driver, remaining(), poll_frequency=0.1).until(
+        lambda d: d.execute_script("return document.readyState") in ('interactive', 'complete')
+    )
 
-            # 탭 정리
-            driver.close()
-            driver.switch_to.window(origin)
-            return views
+    if selector:
+        WebDriverWait(driver, remaining(), poll_frequency=0.1).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+        )
 
-        except Exception:
-            # 문제 생겨도 세션 복구
-            try:
-                if len(driver.window_handles) > 1:
-                    driver.close()
-            finally:
-                driver.switch_to.window(origin)
-            return 0
-    
-    def extract_date_mmdd(date_text):
-        date_text = str(date_text).strip()
-        now = datetime.now(KST)
-        
-        # HH:MM 형식 확인
-        if ':' in date_text and not re.search(r'\d{2,4}[.\-/]\d{2}[.\-/]\d{2}', date_text):
-            time_match = re.search(r'(\d{1,2}):(\d{2})', date_text)
-            if time_match:
-                hour, minute = int(time_match.group(1)), int(time_match.group(2))
-                
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    post_time_today = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    
-                    if post_time_today > now:
-                        yesterday = now - timedelta(days=1)
-                        return yesterday.strftime("%m%d")
-                    else:
-                        return now.strftime("%m%d")
-        
-        # 전체 날짜 형식 (YYYY.MM.DD)
-        full_match = re.search(r'(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})', date_text)
-        if full_match:
-            _, month, day = full_match.groups()
-            return f"{int(month):02d}{int(day):02d}"
-    
-    def get_page_last_date(page_num):
+        if settle:
             try:
-                url = f"https://www.fmkorea.com/index.php?mid=best&page={page_num}"
-                driver.get(url)
-                
-                WebDriverWait(driver, 6).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.li"))
+                WebDriverWait(driver, remaining(), poll_frequency=0.1).until(
+                    StableElementCount(selector, settle)
                 )
-                time.sleep(0.4)
-                
-                posts = driver.find_elements(By.CSS_SELECTOR, "div.li")
-                if not posts:
-                    return None
-
-                for post in reversed(posts):
-                    try:
-                        date_elem = post.find_element(By.CSS_SELECTOR, "span.regdate")
-                        html = date_elem.get_attribute('innerHTML') or ""
-                        m = re.search(r'<!--\s*(\d{1,2}:\d{2})\s*-->', html)
-                        date_text = (m.group(1).strip() if m else date_elem.text.strip())
-
-                        return extract_date_mmdd(date_text)
-                        
-                    except Exception:
-                        continue
-                    
-                return None
-                
-            except Exception as e:
-                print(f"페이지 {page_num} 확인 실패: {e}")
+            except TimeoutException:
+                # 요소는 이미 있으므로 현재 상태로 진행
+                pass
+
+    return time.time() - started
+
+def measure_page_load(driver):
+    """현재 페이지의 로드 시간과 전송량 측정 (Navigation/Resource Timing API)
+
+    교차 출처 리소스는 Timing-Allow-Origin이 없으면 전송량이 0으로 잡히므로
+    프로필 간 비교용 지표로 사용한다
+    """
+    return driver.execute_script("""
+        const nav = performance.getEntriesByType('navigation')[0];
+        const resources = performance.getEntriesByType('resource');
+        let bytes = nav ? nav.transferSize : 0;
+        for (const r of resources) { bytes += r.transferSize || 0; }
+        return {
+            dom_ready_ms: nav ? Math.round(nav.domContentLoadedEventEnd - nav.startTime) : null,
+            load_ms: nav && nav.loadEventEnd > 0 ? Math.round(nav.loadEventEnd - nav.startTime) : null,
+            transfer_bytes: bytes,
+            resource_count: resources.length,
+        };
+    """)
+
+def benchmark_driver_profiles(urls=None, profiles=('default', 'lean'), repeat=3):
+    """드라이버 프로필별 페이지 로드 시간/전송량 비교"""
+    urls = urls or [
+        "https://www.fmkorea.com/index.php?mid=best&page=1",
+        "https://theqoo.net/hot?page=1",
+    ]
+    summary = {}
+
+    for profile in profiles:
+        driver = setup_driver(profile=profile)
+        samples = []
+        try:
+            for url in urls:
+                for _ in range(repeat):
+                    started = time.time()
+                    driver.get(url)
+                    wall_ms = (time.time() - started) * 1000
+                    metrics = measure_page_load(driver)
+                    metrics['wall_ms'] = round(wall_ms)
+                    samples.append(metrics)
+        finally:
+            driver.quit()
+
+        summary[profile] = {
+            'pages': len(samples),
+            'avg_wall_ms': round(sum(m['wall_ms'] for m in samples) / len(samples)),
+            'avg_transfer_kb': round(sum(m['transfer_bytes'] for m in samples) / len(samples) / 1024, 1),
+            'avg_resources': round(sum(m['resource_count'] for m in samples) / len(samples), 1),
+        }
+        print(f"🧪 {profile}: 평균 로드 {summary[profile]['avg_wall_ms']}ms, "
+              f"평균 전송량 {summary[profile]['avg_transfer_kb']}KB, "
+              f"평균 리소스 {summary[profile]['avg_resources']}개")
+
+    return summary
+
+class EgressEndpoint:
+    """출구(egress) 하나: 프록시 URL(또는 직접 연결)과 호스트별 요청 슬롯, 건강도
+
+    health는 최근 요청 성공률의 지수이동평균(0~1)이다. 건강도가 낮을수록 같은 호스트에 대한
+    요청 간격이 길어지고, 차단(챌린지/403/429)이나 연결 오류가 이어지면 잠시 쉬게 한다.
+    """
+
+    def __init__(self, url, min_interval=1.0):
+        self.url = None if url in ('', 'direct') else url
+        self.name = url or 'direct'
+        self.min_interval = min_interval
+        self.health = 1.0
+        self.failures = 0
+        self.cooldown_until = 0.0
+        self.next_slot = {}
+        self.requests = 0
+        self.blocked = 0
+
+    @property
+    def browser_ok(self):
+        """브라우저(--proxy-server)로 쓸 수 있는 출구인지 (인증 프록시는 불가)"""
+        from urllib.parse import urlparse
+
+        return self.url is None or not urlparse(self.url).username
+
+    @property
+    def proxies(self):
+        if self.url is None:
+            return None
+        return {'http': self.url, 'https': self.url}
+
+    def available(self, now=None):
+        return (now or time.time()) >= self.cooldown_until
+
+    def interval(self):
+        # 건강도 0.25 → 간격 4배
+        return self.min_interval / max(self.health, 0.25)
+
+    def status(self):
+        return {
+            'health': round(self.health, 2),
+            'requests': self.requests,
+            'blocked': self.blocked,
+            'cooling_down': not self.available(),
+        }
+
+class EgressPool:
+    """여러 출구(프록시)에 페이지 요청을 나눠 보내는 풀
+
+    출구마다 호스트별 최소 요청 간격(EGRESS_MIN_INTERVAL, 기본 1초)을 따로 지키므로
+    출구를 늘리면 같은 사이트에 대한 전체 요청 속도도 그만큼 늘어난다.
+    acquire()는 가장 빨리 요청할 수 있는 건강한 출구의 슬롯을 예약하고 그 시각까지 대기한다.
+    requests 세션은 EgressSession으로, 브라우저는 setup_driver(proxy=...)로 같은 풀을 쓴다.
+
+    EGRESS_PROXIES: 쉼표 구분 프록시 URL 목록 ('direct'는 프록시 없이 직접 연결)
+    """
+
+    def __init__(self, urls, min_interval=1.0, cooldown=300.0):
+        import threading
+
+        if not urls:
+            raise ValueError("출구가 하나 이상 필요합니다")
+        self.endpoints = [EgressEndpoint(url, min_interval) for url in urls]
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """EGRESS_PROXIES가 없으면 None (기존처럼 직접 연결)"""
+        urls = [u.strip() for u in os.environ.get('EGRESS_PROXIES', '').split(',') if u.strip()]
+        if not urls:
+            return None
+        return cls(
+            urls,
+            min_interval=float(os.environ.get('EGRESS_MIN_INTERVAL', 1.0)),
+            cooldown=float(os.environ.get('EGRESS_COOLDOWN', 300)),
+        )
+
+    def capacity(self):
+        """지금 쓸 수 있는 출구들의 건강도 합 (요청 간격을 나눌 배수, 최소 1)"""
+        now = time.time()
+        return max(sum(e.health for e in self.endpoints if e.available(now)), 1.0)
+
+    def acquire(self, host, exclude=()):
+        """host에 요청할 출구를 골라 슬롯을 예약하고, 슬롯 시각까지 대기한 뒤 반환"""
+        with self.lock:
+            now = time.time()
+            allowed = [e for e in self.endpoints if e not in exclude] or self.endpoints
+            # 모두 쉬는 중이면 가장 먼저 풀리는 출구 사용
+            candidates = ([e for e in allowed if e.available(now)]
+                          or [min(allowed, key=lambda e: e.cooldown_until)])
+
+            endpoint = min(candidates, key=lambda e: (max(e.next_slot.get(host, 0.0), e.cooldown_until), -e.health))
+            slot = max(now, endpoint.next_slot.get(host, 0.0), endpoint.cooldown_until)
+            endpoint.next_slot[host] = slot + endpoint.interval()
+            endpoint.requests += 1
+
+        if slot > now:
+            time.sleep(slot - now)
+        return endpoint
+
+    def pin(self, browser=False):
+        """브라우저처럼 한 출구를 계속 써야 할 때: 가장 건강한 출구
+
+        browser=True면 인증 프록시를 건너뛰고, 쓸 수 있는 출구가 없으면 None (직접 연결)
+        """
+        with self.lock:
+            now = time.time()
+            usable = [e for e in self.endpoints if e.browser_ok] if browser else self.endpoints
+            if not usable:
                 return None
-            
-    def find_start_page_by_regdate(target_date: str, start_page: int) -> int:
-        page = start_page
-        
-        while True:
-            last_date = get_page_last_date(page)
-            if not last_date:
-                page += 1
-                continue
-            
-            # 날짜 비교
-            if last_date > target_date:
-                page += 1
-                continue
-            elif last_date < target_date:
-                page = max(1, page - 1)
-                continue
-            else:
-                break
-        
-        print(f"시작 페이지 확정: p{page}")
-        return page
+            candidates = [e for e in usable if e.available(now)] or usable
+            return max(candidates, key=lambda e: e.health)
 
-    start_page = find_start_page_by_regdate(target_date, start_page=5)
+    def report(self, endpoint, ok, blocked=False):
+        """요청 결과 반영: 성공률 이동평균 갱신, 연속 실패 시 쉬게 함"""
+        with self.lock:
+            endpoint.health = 0.8 * endpoint.health + 0.2 * (1.0 if ok else 0.0)
+            if ok:
+                endpoint.failures = 0
+                return
 
-    page = start_page
-    step = 0
+            endpoint.failures += 1
+            if blocked:
+                endpoint.blocked += 1
+            if blocked or endpoint.failures >= 3:
+                endpoint.cooldown_until = time.time() + self.cooldown * min(endpoint.failures, 4)
+                print(f"🚧 출구 {endpoint.name} {'차단 감지' if blocked else '연속 실패'}, "
+                      f"{self.cooldown * min(endpoint.failures, 4):.0f}초 휴식 (건강도 {endpoint.health:.2f})")
 
-    while True:
-        step += 1
-        url = f"https://www.fmkorea.com/index.php?mid=best&page={page}"
-        driver.get(url)
-        time.sleep(2.0)
+    def status(self):
+        return {e.name: e.status() for e in self.endpoints}
 
-        posts = driver.find_elements(By.CSS_SELECTOR, "div.li")
-        if not posts:
-            print(f"📄 p{page}: 게시물 없음 → 종료")
-            break
+class EgressSession(requests.Session):
+    """요청마다 EgressPool에서 출구를 골라 프록시를 지정하는 requests 세션
+
+    pinned 출구가 있으면 (브라우저 쿠키를 넘겨받은 세션 등) 그 출구만 사용한다.
+    연결 오류나 차단 응답은 다른 출구로 최대 2번 더 시도한다.
+    """
+
+    def __init__(self, pool):
+        super().__init__()
+        self.egress_pool = pool
+        self.pinned = None
+
+    def request(self, method, url, **kwargs):
+        from urllib.parse import urlparse
 
-        page_count = 0
-        found_target_on_page = False
+        host = urlparse(url).netloc
+        if self.pinned is not None and not self.pinned.available():
+            # 고정 출구가 쉬는 중이면 풀에서 고름 (쿠키가 안 맞으면 호출 측이 다시 부트스트랩)
+            self.pinned = None
+
+        attempts = 1 if self.pinned is not None else min(3, len(self.egress_pool.endpoints))
+        tried = []
+        for attempt in range(attempts):
+            if self.pinned is not None:
+                others = [e for e in self.egress_pool.endpoints if e is not self.pinned]
+                endpoint = self.egress_pool.acquire(host, exclude=others)
+            else:
+                endpoint = self.egress_pool.acquire(host, exclude=tried)
+            tried.append(endpoint)
 
-        for post in posts:
             try:
-                date_elem = post.find_element(By.CSS_SELECTOR, "span.regdate")
-                html = date_elem.get_attribute('innerHTML') or ""
-                m = re.search(r'<!--\s*(\d{1,2}:\d{2})\s*-->', html)
-                date_text = (m.group(1).strip() if m else date_elem.text.strip())
-
-                mmdd = extract_date_mmdd(date_text)
-                if mmdd != target_date:
-                    continue  # 어제 것만
-
-                found_target_on_page = True
-                page_count += 1
-
-                title_elem = post.find_element(By.CSS_SELECTOR, "h3.title a")
-                title_text = title_elem.text.strip()
-                post_url = title_elem.get_attribute('href')
-
-                cmtm = re.search(r'\[(\d+)\]', title_text)
-                comments = int(cmtm.group(1)) if cmtm else 0
-                clean_title = re.sub(r'\s*\[\d+\]$', '', title_text)
-
-                views = get_views_from_post(driver, post_url)
-
-                results.append({
-                    'title': clean_title,
-                    'url': post_url,
-                    'source': 'FM코리아',
-                    'views': views,
-                    'comments': comments,
-                    'date': date_text,
-                })
-            except Exception:
+                response = super().request(method, url, proxies=endpoint.proxies, **kwargs)
+            except (requests.exceptions.ProxyError, requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.egress_pool.report(endpoint, ok=False)
+                if attempt == attempts - 1:
+                    raise
                 continue
 
-        if found_target_on_page:
-            print(f"✅ p{page}: {page_count}개 수집")
-            page += 1
-        else:
-            print(f"⭐ p{page}: 어제 게시물 없음 → 수집 종료")
-            break
+            # 403/429와 챌린지 페이지만 차단으로 본다 (5xx는 일반 실패, 재시도는 RetryPolicy 몫)
+            blocked = response.status_code in CHALLENGE_STATUS_CODES or (
+                not kwargs.get('stream') and is_challenge_page(response.status_code, response.text)
+            )
+            self.egress_pool.report(endpoint, ok=response.status_code < 400 and not blocked, blocked=blocked)
+            if blocked and attempt < attempts - 1:
+                response.close()
+                continue
+            return response
 
-    driver.quit()
+_egress_pool = None
+_egress_loaded = False
 
-    df = pd.DataFrame(results)
-    print(f"{len(df)}개 수집")
-    return df
+def get_egress_pool():
+    """EGRESS_PROXIES로 설정한 출구 풀 (설정이 없으면 None)"""
+    global _egress_pool, _egress_loaded
+    if not _egress_loaded:
+        _egress_pool = EgressPool.from_env()
+        _egress_loaded = True
+        if _egress_pool is not None:
+            print(f"🌐 출구 {len(_egress_pool.endpoints)}개 사용: {', '.join(e.name for e in _egress_pool.endpoints)}")
+    return _egress_pool
 
-def crawl_theqoo_selenium(target_date):
-    results = []
-    target_page = 1
+def egress_scale():
+    """요청 간격을 나눌 배수 (출구 풀이 없으면 1)"""
+    pool = get_egress_pool()
+    return pool.capacity() if pool is not None else 1.0
 
-    def extract_date_mmdd_theqoo(date_text):
-        if ':' in date_text and not re.search(r'\d{2,4}\.\d{2}\.\d{2}', date_text):
-            return datetime.today().strftime("%m%d")
-        
-        month_day_match = re.search(r'(\d{1,2})[\.\-/](\d{1,2})', date_text)
-        if month_day_match:
-            month, day = month_day_match.groups()
-            return f"{int(month):02d}{int(day):02d}"
-        
-        return "0000"
+# 데몬 실행 중에만 설정되는 세션/페처 풀 (WarmPool)
+_warm_pool = None
 
-    def crawl_single_page(page_num):        
-        driver = setup_driver()
-        page_results = []
-        
-        try:
-            url = f"https://theqoo.net/hot?page={page_num}"            
-            driver.get(url)
-            
-            # 페이지 로딩 대기
-            time.sleep(random.uniform(3, 6))
-            
-            # 페이지 로드 대기
-            try:
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "table.theqoo_board_table"))
-                )
-                
-                # 스크롤로 lazy loading 요소 활성화
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
-                driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(1)
-                
-            except:
-                print(f"{page_num}페이지 로드 실패")
-                return [], False
-            
-            rows = driver.find_elements(
-                By.CSS_SELECTOR, 
-                "table.theqoo_board_table tbody tr:not(.notice):not(.notice_expand)"
-            )
-            
-            if not rows:
-                print(f"{page_num}페이지: 게시물 없음")
-                return [], False
-                        
-            page_count = 0
-            found_target_date = False
-            
-            for row in rows:
-                try:
-                    # 공지사항 추가 필터링
-                    try:
-                        class_attr = row.get_attribute('class') or ''
-                        data_attr = row.get_attribute('data-permanent-notice') or ''
-                        if ('notice' in class_attr.lower() or 
-                            data_attr == 'Y' or
-                            'sticky' in class_attr.lower()):
-                            continue
-                    except:
-                        pass
-                    
-                    # 날짜 추출
-                    try:
-                        time_elem = row.find_element(By.CSS_SELECTOR, "td.time")
-                        date_text = time_elem.text.strip()
-                    except:
-                        continue
-                    
-                    if not date_text:
-                        continue
-                    
-                    post_mmdd = extract_date_mmdd_theqoo(date_text)
-                    
-                    if post_mmdd == target_date:
-                        found_target_date = True
-                        page_count += 1
-                        
-                        try:
-                            # 제목과 URL
-                            title_elem = row.find_element(By.CSS_SELECTOR, "td.title a[href]")
-                            title_text = title_elem.text.strip()
-                            post_url = title_elem.get_attribute('href')
-                            
-                            if not title_text:
-                                continue
-                            
-                            if post_url and not post_url.startswith('http'):
-                                post_url = f"https://theqoo.net{post_url}"
-                            
-                            # 댓글 수 (안전하게)
-                            comments = 0
-                            try:
-                                reply_elem = row.find_element(By.CSS_SELECTOR, "td.title a.replyNum")
-                                comment_text = reply_elem.text.strip()
-                                comment_match = re.search(r'(\d+)', comment_text)
-                                if comment_match:
-                                    comments = int(comment_match.group(1))
-                            except:
-                                comments = 0
-                            
-                            # 조회수 (안전하게)
-                            views = 0
-                            try:
-                                views_elem = row.find_element(By.CSS_SELECTOR, "td.m_no")
-                                views_text = views_elem.text.strip().replace(",", "")
-                                if views_text.isdigit():
-                                    views = int(views_text)
-                            except:
-                                views = 0
-                            
-                            page_results.append({
-                                'title': title_text,
-                                'url': post_url,
-                                'source': '더쿠',
-                                'views': views,
-                                'comments': comments,
-                                'date': date_text,
-                            })
-                            
-                        except Exception as e:
-                            continue
-                        
-                except Exception:
-                    continue
-            return page_results, found_target_date
-            
-        except Exception as e:
-            print(f"{page_num}페이지 처리 중 오류: {e}")
-            return [], False
-        
-        finally:
-            try:
-                driver.quit()
-            except:
-                pass
-    
-    # 메인 크롤링 루프
-    consecutive_empty_pages = 0
-    
-    while True:
-        # 페이지 간 랜덤 대기 (봇 탐지 회피)
-        if True:
-            wait_time = random.uniform(5, 10)
-            time.sleep(wait_time)
-        
-        # 단일 페이지 크롤링 (새 세션)
-        page_results, found_target = crawl_single_page(target_page)
-        
-        # 결과 누적
-        results.extend(page_results)
-        
-        if found_target and len(page_results) > 0:
-            consecutive_empty_pages = 0
-            target_page += 1
+def create_http_session(user_agent=None, pool_size=10, pool_key=None, egress=True):
+    """커넥션 풀을 재사용하는 requests 세션 생성
+
+    pool_key를 주면 데몬의 WarmPool이 켜져 있을 때 실행 간에 같은 세션(열린 연결)을 재사용한다.
+    EGRESS_PROXIES가 설정되어 있으면 요청을 출구 풀에 나눠 보내는 EgressSession을 반환한다
+    (egress=False면 GitHub API처럼 크롤링 대상이 아닌 요청이므로 직접 연결).
+    """
+    if pool_key and _warm_pool is not None:
+        return _warm_pool.session(pool_key, lambda: create_http_session(user_agent, pool_size, egress=egress))
+
+    pool = get_egress_pool() if egress else None
+    session = EgressSession(pool) if pool is not None else requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': user_agent or DEFAULT_USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+    })
+    return session
+
+def release_http_session(session):
+    """크롤러가 만든 세션 정리 (WarmPool 세션은 다음 실행을 위해 열어 둠)"""
+    if _warm_pool is not None and _warm_pool.owns(session):
+        return
+    session.close()
+
+class WarmPool:
+    """데몬에서 실행 간에 HTTP 세션과 HybridFetcher(쿠키, 브라우저 포함)를 재사용하는 풀
+
+    활성화되어 있는 동안 create_http_session(pool_key=...)과 HybridFetcher.acquire()는
+    새로 만들지 않고 풀의 객체를 돌려준다. 같은 사이트는 데몬이 동시에 실행하지 않으므로
+    사이트 단위로 하나씩만 둔다.
+    """
+
+    def __init__(self):
+        import threading
+
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.fetchers = {}
+
+    def session(self, key, factory):
+        with self.lock:
+            if key not in self.sessions:
+                self.sessions[key] = factory()
+            return self.sessions[key]
+
+    def fetcher(self, site_name, bootstrap_url, **kwargs):
+        with self.lock:
+            fetcher = self.fetchers.get(site_name)
+            if fetcher is None:
+                fetcher = HybridFetcher(site_name, bootstrap_url, pooled=True, **kwargs)
+                self.fetchers[site_name] = fetcher
+            else:
+                fetcher.min_interval = kwargs.get('min_interval', fetcher.min_interval)
+            return fetcher
+
+    def owns(self, session):
+        return any(session is pooled for pooled in self.sessions.values())
+
+    def status(self):
+        return {
+            'sessions': sorted(self.sessions),
+            'fetchers': {
+                name: {'bootstrapped': f.bootstrapped, 'driver_alive': f.driver is not None}
+                for name, f in self.fetchers.items()
+            },
+        }
+
+    def close(self):
+        for fetcher in self.fetchers.values():
+            fetcher.shutdown()
+        for session in self.sessions.values():
+            session.close()
+        self.fetchers.clear()
+        self.sessions.clear()
+
+def is_challenge_page(status_code, html):
+    """봇 차단/JS 챌린지 페이지인지 확인"""
+    if status_code in CHALLENGE_STATUS_CODES:
+        return True
+    return any(marker in html for marker in CHALLENGE_MARKERS)
+
+# 감독 프로세스(watchdog)로 진행 상황을 알리는 훅. 자식 프로세스에서만 설정된다
+_progress_hook = None
+_last_progress = 0.0
+
+def report_progress(event, min_interval=5.0):
+    """진행 신호(heartbeat) 전송 (min_interval초에 한 번으로 제한)"""
+    global _last_progress
+    if _progress_hook is None:
+        return
+    now = time.time()
+    if now - _last_progress >= min_interval:
+        _last_progress = now
+        _progress_hook(event)
+
+class HybridFetcher:
+    """브라우저로 한 번 챌린지를 통과한 뒤 쿠키를 넘겨받아 HTTP로 페이지를 가져오는 페처
+
+    - hybrid: HTTP 우선, 챌린지/예상 요소 누락 시 브라우저로 폴백
+    - http: 브라우저 없이 HTTP만 사용
+    - browser: 모든 페이지를 브라우저로 로드
+
+    pooled=True(WarmPool)이면 close()가 통계만 출력하고 세션/쿠키/브라우저를 다음 실행을 위해 유지한다.
+    """
+
+    def __init__(self, site_name, bootstrap_url, mode=None, min_interval=0.0, keep_driver=True, pooled=False):
+        self.site_name = site_name
+        self.bootstrap_url = bootstrap_url
+        self.mode = mode or DEFAULT_FETCH_MODE
+        self.min_interval = min_interval
+        self.keep_driver = keep_driver
+        self.pooled = pooled
+        self.session = create_http_session()
+        self.driver = None
+        self.endpoint = None
+        self.bootstrapped = False
+        self.last_request_at = 0.0
+        self.http_count = 0
+        self.browser_count = 0
+        self.fallback_count = 0
+        self.page_metrics = []
+        self.wait_times = []
+
+        if self.mode not in ('hybrid', 'http', 'browser'):
+            raise ValueError(f"알 수 없는 수집 방식: {self.mode}")
+
+    @classmethod
+    def acquire(cls, site_name, bootstrap_url, **kwargs):
+        """WarmPool이 켜져 있으면 풀의 페처를, 아니면 새 페처를 반환"""
+        if _warm_pool is not None:
+            return _warm_pool.fetcher(site_name, bootstrap_url, **kwargs)
+        return cls(site_name, bootstrap_url, **kwargs)
+
+    def bootstrap(self):
+        """Selenium 세션으로 챌린지를 통과하고 쿠키와 User-Agent를 HTTP 세션에 복사"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        self.bootstrapped = True
+        try:
+            driver = self._ensure_driver()
+            driver.get(self.bootstrap_url)
+            wait_for_page(driver, timeout=15)
+
+            # JS 챌린지가 있으면 통과될 때까지 대기
+            try:
+                WebDriverWait(driver, 15, poll_frequency=0.5).until(
+                    lambda d: not is_challenge_page(200, d.page_source)
+                )
+            except TimeoutException:
+                print(f"⚠️ {self.site_name} 챌린지 통과 대기 시간 초과")
+
+            self._export_browser_state()
+            print(f"🍪 {self.site_name} 쿠키 {len(self.session.cookies)}개 확보, HTTP 모드로 전환")
+        except Exception as e:
+            print(f"⚠️ {self.site_name} 브라우저 부트스트랩 실패, 쿠키 없이 진행: {e}")
+        finally:
+            # 부트스트랩 이후에는 브라우저가 필요 없으므로 바로 종료
+            self._release_driver(force=True)
+
+    def get_soup(self, url, expect=None, loader=None):
+        """페이지를 가져와 BeautifulSoup으로 반환 (실패 시 None)"""
+        report_progress(url)
+
+        if self.mode != 'browser':
+            if self.mode == 'hybrid' and not self.bootstrapped:
+                self.bootstrap()
+
+            soup = self._get_http(url, expect)
+            if soup is not None or self.mode == 'http':
+                return soup
+
+            self.fallback_count += 1
+            print(f"🔁 {self.site_name} 브라우저 폴백: {url}")
+
+        return self._get_browser(url, expect, loader)
+
+    def close(self):
+        if not self.pooled:
+            self._release_driver(force=True)
+            self.session.close()
+        print(f"📡 {self.site_name} 수집 통계: HTTP {self.http_count}건, "
+              f"브라우저 {self.browser_count}건 (폴백 {self.fallback_count}건)")
+
+        if self.page_metrics:
+            ready = [m['dom_ready_ms'] for m in self.page_metrics if m.get('dom_ready_ms') is not None]
+            total_kb = sum(m.get('transfer_bytes') or 0 for m in self.page_metrics) / 1024
+            avg_ready = f"{sum(ready) / len(ready):.0f}ms" if ready else "-"
+            print(f"   브라우저 페이지당 평균 DOM 준비 {avg_ready}, "
+                  f"평균 전송량 {total_kb / len(self.page_metrics):.1f}KB")
+
+        if self.wait_times:
+            print(f"   브라우저 대기 시간: 평균 {sum(self.wait_times) / len(self.wait_times):.2f}초, "
+                  f"최대 {max(self.wait_times):.2f}초 ({len(self.wait_times)}페이지)")
+
+        if self.pooled:
+            # 통계는 실행 단위로 다시 집계
+            self.http_count = self.browser_count = self.fallback_count = 0
+            self.page_metrics = []
+            self.wait_times = []
+
+    def shutdown(self):
+        """풀에서 빠질 때 브라우저/세션까지 정리"""
+        self.pooled = False
+        self._release_driver(force=True)
+        self.session.close()
+
+    def _get_http(self, url, expect):
+        from bs4 import BeautifulSoup
+
+        # 요청 간 최소 간격 유지 (출구가 여러 개면 출구 수만큼 줄임)
+        elapsed = time.time() - self.last_request_at
+        min_interval = self.min_interval / egress_scale()
+        if elapsed < min_interval:
+            time.sleep(min_interval - elapsed)
+        self.last_request_at = time.time()
+
+        try:
+            response = self.session.get(url, timeout=30)
+        except requests.RequestException as e:
+            print(f"⚠️ {self.site_name} HTTP 요청 실패: {e}")
+            return None
+
+        if is_challenge_page(response.status_code, response.text):
+            print(f"🛡️ {self.site_name} 챌린지 감지 ({response.status_code}): {url}")
+            return None
+
+        if response.status_code != 200:
+            print(f"⚠️ {self.site_name} HTTP {response.status_code}: {url}")
+            return None
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        if expect and soup.select_one(expect) is None:
+            print(f"🛡️ {self.site_name} 예상 요소({expect}) 없음, 챌린지로 간주: {url}")
+            return None
+
+        self.http_count += 1
+        return soup
+
+    def _get_browser(self, url, expect, loader):
+        from bs4 import BeautifulSoup
+
+        try:
+            driver = self._ensure_driver()
+            # loader는 driver.get 이후 실제 대기한 시간(초)을 반환
+            if loader:
+                waited = loader(driver, url)
+            else:
+                driver.get(url)
+                waited = wait_for_page(driver, expect, timeout=10)
+            self.wait_times.append(waited or 0.0)
+
+            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            self.browser_count += 1
+
+            try:
+                self.page_metrics.append(measure_page_load(driver))
+            except Exception:
+                pass
+
+            # 브라우저가 통과한 최신 쿠키로 HTTP 세션 갱신
+            if self.mode == 'hybrid':
+                self._export_browser_state()
+            return soup
+
+        except Exception as e:
+            print(f"⚠️ {self.site_name} 브라우저 로드 실패: {e}")
+            return None
+
+        finally:
+            self._release_driver()
+
+    def _ensure_driver(self):
+        if self.driver is not None and self.pooled:
+            # 재사용 중인 브라우저가 죽었으면 새로 띄움
+            try:
+                self.driver.current_url
+            except Exception:
+                print(f"♻️ {self.site_name} 브라우저 응답 없음, 재시작")
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+                self.driver = None
+
+        egress = get_egress_pool()
+        if self.driver is not None and self.endpoint is not None and not self.endpoint.available():
+            # 브라우저가 쓰던 출구가 차단되면 다른 출구로 새로 띄움
+            print(f"🌐 {self.site_name} 출구 {self.endpoint.name} 휴식 중, 브라우저 재시작")
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+        if self.driver is None:
+            self.endpoint = egress.pin(browser=True) if egress is not None else None
+            if egress is not None and self.endpoint is None:
+                print(f"⚠️ {self.site_name} 브라우저로 쓸 수 있는 출구가 없어 직접 연결합니다 (인증 프록시 미지원)")
+            self.driver = setup_driver(proxy=self.endpoint.url if self.endpoint is not None else None)
+        return self.driver
+
+    def _release_driver(self, force=False):
+        if self.driver is None or self.pooled or (self.keep_driver and not force):
+            return
+        try:
+            self.driver.quit()
+        except:
+            pass
+        self.driver = None
+
+    def _export_browser_state(self):
+        user_agent = self.driver.execute_script("return navigator.userAgent;")
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+
+        # 챌린지 쿠키는 통과한 IP에 묶이므로 HTTP 요청도 브라우저와 같은 출구로 보냄
+        if isinstance(self.session, EgressSession):
+            self.session.pinned = self.endpoint
+
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain'),
+                path=cookie.get('path', '/'),
+            )
+
+class GitHubReleaseClient:
+    """GitHub Releases API 클라이언트 (업로드/목록 조회/에셋 다운로드 공용)
+
+    api_url을 바꾸면 로컬 목 서버에 대해 그대로 동작한다.
+    """
+
+    def __init__(self, token=None, repo_owner=None, repo_name=None, api_url=None, pool_size=10):
+        self.token = token or os.environ.get('G_TOKEN')
+        self.repo_owner = repo_owner or os.environ.get('REPO_OWNER')
+        self.repo_name = repo_name or os.environ.get('REPO_NAME')
+        self.api_url = (api_url or os.environ.get('GITHUB_API_URL') or 'https://api.github.com').rstrip('/')
+
+        # 환경변수 확인
+        if not self.token:
+            raise ValueError("GITHUB_TOKEN 환경변수가 필요합니다")
+        if not self.repo_owner:
+            raise ValueError("REPO_OWNER 환경변수가 필요합니다")
+        if not self.repo_name:
+            raise ValueError("REPO_NAME 환경변수가 필요합니다")
+
+        self.session = create_http_session(pool_size=pool_size, egress=False)
+        self.session.headers.update({
+            'Authorization': f'token {self.token}',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+
+    @property
+    def repo_url(self):
+        return f"{self.api_url}/repos/{self.repo_owner}/{self.repo_name}"
+
+    def get_release_by_tag(self, tag_name):
+        """태그로 릴리즈 조회 (없으면 None)"""
+        response = self.session.get(f"{self.repo_url}/releases/tags/{tag_name}", timeout=30)
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+    def create_release(self, tag_name, name, body):
+        response = self.session.post(f"{self.repo_url}/releases", json={
+            "tag_name": tag_name,
+            "name": name,
+            "body": body,
+            "draft": False,
+            "prerelease": False
+        }, timeout=30)
+        if response.status_code != 201:
+            raise Exception(f"릴리즈 생성 실패: {response.status_code} - {response.text}")
+        return response.json()
+
+    def upload_asset(self, release, filename, data, content_type='text/csv'):
+        upload_url = release['upload_url'].replace('{?name,label}', '')
+        response = self.session.post(
+            upload_url,
+            params={'name': filename},
+            headers={'Content-Type': content_type},
+            data=data,
+            timeout=120
+        )
+        if response.status_code != 201:
+            raise Exception(f"파일 업로드 실패: {response.status_code} - {response.text}")
+        return response.json()
+
+    def delete_asset(self, asset_id):
+        response = self.session.delete(f"{self.repo_url}/releases/assets/{asset_id}", timeout=30)
+        if response.status_code != 204:
+            raise Exception(f"에셋 삭제 실패: {response.status_code} - {response.text}")
+
+    def iter_releases(self, per_page=100):
+        """모든 릴리즈를 페이지네이션(Link 헤더)을 따라가며 순회"""
+        url = f"{self.repo_url}/releases"
+        params = {'per_page': per_page}
+        while url:
+            response = self.session.get(url, params=params, timeout=30)
+            if response.status_code != 200:
+                raise Exception(f"릴리즈 목록 조회 실패: {response.status_code} - {response.text}")
+            yield from response.json()
+
+            # 다음 페이지 URL에는 쿼리가 이미 포함되어 있음
+            url = response.links.get('next', {}).get('url')
+            params = None
+
+    def download_asset(self, asset, dest_path):
+        """릴리즈 에셋을 dest_path로 다운로드 (임시 파일에 쓴 뒤 이름 변경)"""
+        tmp_path = f"{dest_path}.part"
+        with self.session.get(
+            asset['url'],
+            headers={'Accept': 'application/octet-stream'},
+            stream=True,
+            timeout=120
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"에셋 다운로드 실패: {response.status_code} - {asset['name']}")
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+        os.replace(tmp_path, dest_path)
+        return dest_path
+
+def _daily_release(client, post_count):
+    """오늘 날짜 릴리즈(data-YYYYMMDD)를 찾거나 새로 생성"""
+    # 오늘 날짜로 릴리즈 태그 생성
+    today = datetime.now().strftime('%Y%m%d')
+    tag_name = f"data-{today}"
+    release_name = f"크롤링 데이터 {today}"
+
+    # 기존 릴리즈 확인
+    release_data = client.get_release_by_tag(tag_name)
+
+    if release_data:
+        # 기존 릴리즈 사용
+        logger.info(f"기존 릴리즈 사용: {tag_name}")
+    else:
+        # 새 릴리즈 생성
+        logger.info(f"새 릴리즈 생성: {tag_name}")
+        try:
+            release_data = client.create_release(
+                tag_name,
+                release_name,
+                f"자동 크롤링 데이터\\n\\n생성시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\\n게시글 수: {post_count}개"
+            )
+        except Exception:
+            # 사이트별 러너가 동시에 만들려 한 경우 먼저 만든 릴리즈 사용
+            release_data = client.get_release_by_tag(tag_name)
+            if not release_data:
+                raise
+    return release_data
+
+def upload_to_github_release(df, filename):
+    """GitHub Release에 CSV 파일 업로드"""
+    try:
+        client = GitHubReleaseClient()
+        logger.info(f"GitHub Release 업로드: {client.repo_owner}/{client.repo_name}")
+
+        release_data = _daily_release(client, len(df))
+
+        # CSV 데이터 준비
+        csv_data = df.to_csv(index=False, encoding='utf-8-sig')
+
+        # 파일 업로드
+        logger.info(f"파일 업로드 중: {filename}")
+        file_data = client.upload_asset(release_data, filename, csv_data.encode('utf-8-sig'))
+        download_url = file_data['browser_download_url']
+
+        logger.info(f"✅ GitHub Release 업로드 성공: {filename}")
+        logger.info(f"🔗 다운로드 링크: {download_url}")
+
+        return {
+            'success': True,
+            'download_url': download_url,
+            'release_url': release_data['html_url'],
+            'file_size': len(csv_data.encode('utf-8-sig'))
+        }
+
+    except Exception as e:
+        logger.error(f"❌ GitHub Release 업로드 실패: {e}")
+
+        # 백업: 로컬에 파일 저장 (GitHub Actions artifact)
+        logger.info("백업: 로컬에 파일 저장")
+        df.to_csv(filename, index=False, encoding='utf-8-sig')
+
+        return {
+            'success': False,
+            'error': str(e),
+            'local_file': filename
+        }
+
+def upload_highlights_to_release(highlights, filename, crawl_date=None):
+    """상위 게시물 요약(JSON)을 오늘 날짜 릴리즈에 업로드 (실패 시 로컬 저장)"""
+    payload = highlights.to_json(crawl_date).encode('utf-8')
+    try:
+        client = GitHubReleaseClient()
+        release_data = _daily_release(client, highlights.summary()['count'])
+
+        logger.info(f"파일 업로드 중: {filename}")
+        file_data = client.upload_asset(release_data, filename, payload, content_type='application/json')
+        logger.info(f"✅ 하이라이트 업로드 성공: {filename}")
+
+        return {
+            'success': True,
+            'download_url': file_data['browser_download_url'],
+            'release_url': release_data['html_url'],
+            'file_size': len(payload)
+        }
+
+    except Exception as e:
+        logger.error(f"❌ 하이라이트 업로드 실패: {e}")
+
+        logger.info("백업: 로컬에 파일 저장")
+        with open(filename, 'wb') as f:
+            f.write(payload)
+
+        return {
+            'success': False,
+            'error': str(e),
+            'local_file': filename
+        }
+
+def publish_shard(csv_path, client=None):
+    """사이트 샤드(CSV + 통계 JSON)를 오늘 날짜 릴리즈에 바로 업로드 (같은 이름 에셋은 교체)
+
+    통계 JSON을 CSV 다음에 올리므로, 소비자는 JSON이 보이면 해당 사이트 샤드가 완성된 것으로 보면 된다.
+    """
+    json_path = csv_path[:-len('.csv')] + '.json'
+    try:
+        client = client or GitHubReleaseClient()
+        with open(json_path, encoding='utf-8') as f:
+            meta = json.load(f)
+
+        release_data = _daily_release(client, meta['stats']['count'])
+        existing = {asset['name']: asset for asset in release_data.get('assets', [])}
+
+        uploaded = []
+        for path, content_type in ((csv_path, 'text/csv'), (json_path, 'application/json')):
+            name = os.path.basename(path)
+            # 재실행이면 이전 샤드를 지우고 다시 올림
+            if name in existing:
+                client.delete_asset(existing[name]['id'])
+            with open(path, 'rb') as f:
+                client.upload_asset(release_data, name, f.read(), content_type=content_type)
+            uploaded.append(name)
+
+        logger.info(f"📤 샤드 공개: {meta['source']} {meta['stats']['count']}건 → {release_data['tag_name']}")
+        return {'success': True, 'assets': uploaded, 'release_url': release_data['html_url']}
+
+    except Exception as e:
+        logger.error(f"❌ 샤드 업로드 실패 ({os.path.basename(csv_path)}): {e}")
+        return {'success': False, 'error': str(e)}
+
+def incremental_publishing():
+    """PUBLISH_MODE=incremental이면 사이트가 끝날 때마다 샤드를 릴리즈에 공개"""
+    return os.environ.get('PUBLISH_MODE', 'final') == 'incremental'
+
+# 릴리즈 CSV를 병합할 때 사용할 컬럼 타입
+RELEASE_DTYPES = {
+    'title': 'string',
+    'url': 'string',
+    'source': 'category',
+    # RecordBuffer/apply_record_dtypes와 같은 폭 (병합/아카이브 프레임의 타입이 바뀌지 않도록)
+    'views': 'int32',
+    'comments': 'int32',
+    'hot_score': 'float32',
+    'date': 'string',
+    'views_estimated': 'boolean',
+}
+
+def _crawl_date_from_asset(tag_name, asset_name):
+    """릴리즈 태그(data-YYYYMMDD)와 파일명(community_crawling_MMDD_...)으로 수집 대상 날짜 계산"""
+    release_day = datetime.strptime(tag_name.replace('data-', ''), '%Y%m%d').date()
+    m = re.search(r'community_crawling_(\d{4})_', asset_name)
+    if not m:
+        return release_day
+
+    month, day = int(m.group(1)[:2]), int(m.group(1)[2:])
+    year = release_day.year
+    # 1월 1일 릴리즈의 1231 데이터처럼 연도가 넘어가는 경우
+    if (month, day) > (release_day.month, release_day.day):
+        year -= 1
+    return datetime(year, month, day).date()
+
+def sync_release_archive(cache_dir='data/releases', max_workers=8, client=None):
+    """data-* 릴리즈의 CSV 에셋을 동시에 내려받아 에셋 ID 기준으로 로컬 캐시
+
+    이미 받은 에셋은 건너뛰므로 다시 실행하면 새로 생긴 날짜만 받는다.
+    반환값은 캐시 매니페스트 (asset_id → 메타데이터).
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    client = client or GitHubReleaseClient(pool_size=max_workers)
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    pending = []
+    release_count = 0
+    for release in client.iter_releases():
+        tag_name = release.get('tag_name', '')
+        if not tag_name.startswith('data-'):
+            continue
+        release_count += 1
+
+        for asset in release.get('assets', []):
+            # 점진 공개된 사이트 샤드(shard_*)는 최종 CSV와 중복이므로 제외
+            if not (asset['name'].startswith('community_crawling_') and asset['name'].endswith('.csv')):
+                continue
+
+            asset_id = str(asset['id'])
+            path = os.path.join(cache_dir, f"{asset_id}_{asset['name']}")
+            if asset_id in manifest and os.path.exists(path):
+                continue
+
+            pending.append((asset, path, {
+                'tag_name': tag_name,
+                'name': asset['name'],
+                'size': asset.get('size'),
+                'crawl_date': _crawl_date_from_asset(tag_name, asset['name']).isoformat(),
+                'path': os.path.basename(path),
+            }))
+
+    print(f"📦 릴리즈 {release_count}개, 새 에셋 {len(pending)}개 (캐시 {len(manifest)}개)")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(client.download_asset, asset, path): (asset, meta)
+            for asset, path, meta in pending
+        }
+        for future in as_completed(futures):
+            asset, meta = futures[future]
+            try:
+                future.result()
+                manifest[str(asset['id'])] = meta
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ {asset['name']} 다운로드 실패: {e}")
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 동기화 완료: 새로 받음 {len(pending) - failed}개, 실패 {failed}개")
+    return manifest
+
+def load_release_archive(cache_dir='data/releases'):
+    """캐시된 릴리즈 CSV를 하나의 타입 지정 DataFrame으로 병합
+
+    같은 수집 날짜에 파일이 여러 개면 (재실행) 가장 최근 에셋의 행을 사용한다.
+    """
+    import pandas as pd
+
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return pd.DataFrame(columns=['crawl_date'] + list(RELEASE_DTYPES))
+
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    frames = []
+    for asset_id, meta in sorted(manifest.items(), key=lambda item: int(item[0])):
+        df = pd.read_csv(os.path.join(cache_dir, meta['path']), encoding='utf-8-sig')
+        df['crawl_date'] = meta['crawl_date']
+        df['asset_id'] = int(asset_id)
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=['crawl_date'] + list(RELEASE_DTYPES))
+
+    merged = pd.concat(frames, ignore_index=True)
+
+    # 날짜별 최신 에셋만 유지
+    latest = merged.groupby('crawl_date')['asset_id'].transform('max')
+    merged = merged[merged['asset_id'] == latest].drop(columns='asset_id')
+    merged = merged.drop_duplicates(subset=['crawl_date', 'url'], keep='last')
+
+    for column, dtype in RELEASE_DTYPES.items():
+        if column not in merged.columns:
+            continue
+        if dtype.startswith('int'):
+            merged[column] = pd.to_numeric(merged[column], errors='coerce').fillna(0).astype(dtype)
+        elif dtype.startswith('float'):
+            merged[column] = pd.to_numeric(merged[column], errors='coerce').astype(dtype)
+        else:
+            merged[column] = merged[column].astype(dtype)
+
+    merged['crawl_date'] = pd.to_datetime(merged['crawl_date'])
+    return merged.reset_index(drop=True)
+
+def backfill_archive_from_releases(archive, cache_dir='data/releases'):
+    """캐시된 릴리즈 데이터를 날짜별로 아카이브에 적재"""
+    merged = load_release_archive(cache_dir)
+    total = 0
+    for crawl_date, day_df in merged.groupby('crawl_date'):
+        total += archive.append(day_df, crawl_date)
+    return total
+
+# 사이트별 예상 소요 비중 (시간 예산 분배용)
+SITE_BUDGET_WEIGHTS = {
+    'instiz': 1,
+    'dcinside': 1,
+    'fmkorea': 3,
+    'theqoo': 3,
+}
+
+class CrawlBudget:
+    """실행 전체 시간 예산을 사이트별 마감 시간으로 나눠 관리하는 스케줄러
+
+    사이트를 시작할 때 남은 시간(업로드용 예비 시간 제외)을 아직 시작하지 않은
+    사이트들의 비중대로 나눠 마감을 정하고, 앞 사이트가 남긴 시간은 뒤로 넘어간다.
+    사이트 예산이 줄어들수록 단계적으로 수집 품질을 낮춘다.
+
+    - 0단계: 정상
+    - 1단계 (사이트 예산 50% 미만): 요청 간격을 안전 하한값으로 고정
+    - 2단계 (25% 미만): FM코리아 상세 조회수 수집 생략
+    - 3단계 (마감 도달): 페이지네이션 중단, 수집분만 반환
+    """
+
+    LEVEL_MESSAGES = {
+        1: "요청 간격을 하한값으로 축소",
+        2: "상세 페이지 보강 생략",
+        3: "마감 도달, 페이지네이션 중단",
+    }
+
+    def __init__(self, total_seconds, reserve_seconds=600, weights=None):
+        self.started_at = time.time()
+        self.deadline = self.started_at + total_seconds
+        self.reserve_seconds = reserve_seconds
+        self.weights = dict(weights or SITE_BUDGET_WEIGHTS)
+        self.site_windows = {}
+        self.site_levels = {}
+        self.pending = []
+
+    @classmethod
+    def from_env(cls, sites):
+        budget = cls(
+            total_seconds=float(os.environ.get('RUN_BUDGET_MINUTES', 100)) * 60,
+            reserve_seconds=float(os.environ.get('RUN_RESERVE_MINUTES', 10)) * 60,
+        )
+        budget.pending = list(sites)
+        return budget
+
+    def start_site(self, site):
+        """사이트 시작 시 마감 시간 배정"""
+        now = time.time()
+        available = max(self.deadline - self.reserve_seconds - now, 0)
+
+        if site in self.pending:
+            self.pending.remove(site)
+        remaining_sites = [site] + self.pending
+        total_weight = sum(self.weights.get(s, 1) for s in remaining_sites)
+        share = available * self.weights.get(site, 1) / total_weight
+
+        self.site_windows[site] = (now, now + share)
+        self.site_levels[site] = 0
+        print(f"⏱️ {site} 시간 예산: {share / 60:.1f}분 (전체 잔여 {available / 60:.1f}분)")
+
+    def remaining(self, site=None):
+        """남은 시간(초). site를 주면 해당 사이트 마감 기준"""
+        if site in self.site_windows:
+            return max(self.site_windows[site][1] - time.time(), 0)
+        return max(self.deadline - self.reserve_seconds - time.time(), 0)
+
+    def level(self, site):
+        """현재 성능 저하 단계 (0~3)"""
+        if site not in self.site_windows:
+            return 0
+
+        started, deadline = self.site_windows[site]
+        window = max(deadline - started, 1e-6)
+        left = max(deadline - time.time(), 0) / window
+
+        if left <= 0:
+            level = 3
+        elif left < 0.25:
+            level = 2
+        elif left < 0.5:
+            level = 1
+        else:
+            level = 0
+
+        if level > self.site_levels.get(site, 0):
+            self.site_levels[site] = level
+            print(f"⏳ {site} 예산 부족 ({self.remaining(site) / 60:.1f}분 남음) → {self.LEVEL_MESSAGES[level]}")
+        return level
+
+    def should_stop(self, site):
+        return self.level(site) >= 3
+
+    def skip_enrichment(self, site):
+        return self.level(site) >= 2
+
+    def polite_delay(self, site, low, high):
+        """요청 간 대기 시간: 여유가 있으면 low~high 랜덤, 부족하면 하한값 low"""
+        if self.level(site) >= 1:
+            return low
+        return random.uniform(low, high)
+
+def polite_sleep(low, high, budget=None, site=None):
+    """요청 간격 대기 (예산이 부족하면 하한값만 대기)"""
+    delay = budget.polite_delay(site, low, high) if budget else random.uniform(low, high)
+    # 출구가 여러 개면 출구별 요청 간격은 EgressPool이 지키므로 전체 간격은 나눠서 줄임
+    time.sleep(delay / egress_scale())
+
+def post_id_from_url(url):
+    """게시물 URL에서 사이트 내 고유 ID 추출 (목록 정렬/쿼리 문자열이 달라도 같은 값)
+
+    - 디시인사이드: 'id=갤러리&no=번호' → '갤러리:번호'
+    - FM코리아 document_srl, 그 외 경로의 마지막 숫자 (더쿠 /hot/123, 인스티즈 /pt/123, FM코리아 /123)
+    - 숫자가 없으면 쿼리를 뺀 URL
+    """
+    from urllib.parse import urlparse, parse_qs
+
+    parsed = urlparse(url or '')
+    query = parse_qs(parsed.query)
+    for key in ('no', 'document_srl'):
+        if key in query:
+            board = query.get('id', [None])[0]
+            return f"{board}:{query[key][0]}" if board else query[key][0]
+
+    numbers = re.findall(r'\d{3,}', parsed.path)
+    if numbers:
+        return numbers[-1]
+    return f"{parsed.netloc}{parsed.path}"
+
+class SeenPosts:
+    """실행 중 사이트별로 이미 수집한 게시물 ID 집합
+
+    수집이 느린 동안 새 글이 올라오면 목록이 밀려 같은 글이 다음 페이지에 다시 나타난다.
+    레코드 생성/상세 보강 전에 add()로 확인해 중복을 건너뛰고, 건너뛴 수를 보고한다.
+    """
+
+    def __init__(self, site_name):
+        import threading
+
+        self.site_name = site_name
+        self.ids = set()
+        self.duplicates = 0
+        self.lock = threading.Lock()
+
+    def add(self, url):
+        """처음 보는 게시물이면 True, 이미 수집한 게시물이면 False"""
+        post_id = post_id_from_url(url)
+        with self.lock:
+            if post_id in self.ids:
+                self.duplicates += 1
+                return False
+            self.ids.add(post_id)
+            return True
+
+    def report(self):
+        if self.duplicates:
+            print(f"🔁 {self.site_name} 페이지 밀림 중복 {self.duplicates}건 제외")
+
+def source_dtype():
+    """사이트명 categorical 타입 (모든 사이트 프레임이 같은 타입이어야 concat 후에도 category 유지)"""
+    import pandas as pd
+
+    return pd.CategoricalDtype([name for name, _ in SITE_CRAWLERS.values()])
+
+def apply_record_dtypes(df):
+    """CSV 등에서 읽은 수집 결과를 RecordBuffer와 같은 컬럼 타입으로 변환"""
+    import pandas as pd
+
+    if len(df) == 0:
+        return df
+    df = df.copy()
+    for column in ('views', 'comments'):
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype('int32')
+    if 'source' in df.columns:
+        dtype = source_dtype()
+        if df['source'].isin(dtype.categories).all():
+            df['source'] = df['source'].astype(dtype)
+    return df
+
+class RecordBuffer:
+    """사이트 하나의 수집 결과를 컬럼별로 쌓는 버퍼 (레코드 dict 리스트 대신 사용)
+
+    - source는 버퍼당 한 번만 저장하고 프레임에서는 categorical 코드(int8)로 만든다.
+    - views/comments는 정수 배열(array 'i')에 쌓고 프레임에서는 int32로 만든다.
+    - title/url/date는 문자열 리스트, 사이트별 추가 컬럼(디시 board 등)은 extra에 쌓는다.
+
+    to_frame()은 정수 배열을 int32 numpy 배열로 한 번 복사한다. 배열을 빌려주는 뷰(np.frombuffer)는
+    프레임이 살아 있는 동안 버퍼를 잠가 이후 append/extend/merge가 BufferError로 실패한다.
+    """
+
+    __slots__ = ('source', 'titles', 'urls', 'dates', 'views', 'comments', 'extra')
+
+    CORE_COLUMNS = ('title', 'url', 'source', 'views', 'comments', 'date')
+
+    def __init__(self, source):
+        from array import array
+
+        self.source = sys.intern(source)
+        self.titles = []
+        self.urls = []
+        self.dates = []
+        self.views = array('i')
+        self.comments = array('i')
+        self.extra = {}
+
+    def __len__(self):
+        return len(self.urls)
+
+    def append(self, record):
+        size = len(self.urls)
+        self.titles.append(record.get('title'))
+        self.urls.append(record.get('url'))
+        date = record.get('date')
+        # 작성일 문자열은 같은 값이 반복되므로 하나의 객체를 공유
+        self.dates.append(sys.intern(date) if isinstance(date, str) else date)
+        self.views.append(int(record.get('views') or 0))
+        self.comments.append(int(record.get('comments') or 0))
+
+        for key, value in record.items():
+            if key in self.CORE_COLUMNS:
+                continue
+            if key not in self.extra:
+                self.extra[key] = [None] * size
+            self.extra[key].append(value)
+        # 이 레코드에 없는 추가 컬럼은 None으로 길이 맞춤
+        for values in self.extra.values():
+            if len(values) == size:
+                values.append(None)
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def merge(self, other):
+        """다른 버퍼(같은 사이트)의 내용을 뒤에 붙임"""
+        size = len(self)
+        self.titles += other.titles
+        self.urls += other.urls
+        self.dates += other.dates
+        self.views.extend(other.views)
+        self.comments.extend(other.comments)
+        for key in set(self.extra) | set(other.extra):
+            self.extra.setdefault(key, [None] * size)
+            self.extra[key] += other.extra.get(key, [None] * len(other))
+
+    def to_frame(self):
+        import numpy as np
+        import pandas as pd
+
+        if not self.urls:
+            return pd.DataFrame()
+
+        dtype = source_dtype()
+        if self.source in dtype.categories:
+            codes = np.full(len(self), dtype.categories.get_loc(self.source), dtype=np.int8)
+            source = pd.Categorical.from_codes(codes, dtype=dtype)
+        else:
+            source = pd.Categorical([self.source] * len(self))
+
+        columns = {
+            'title': self.titles,
+            'url': self.urls,
+            'source': source,
+            'views': np.array(self.views, dtype=np.int32),
+            'comments': np.array(self.comments, dtype=np.int32),
+            'date': self.dates,
+        }
+        columns.update(self.extra)
+        return pd.DataFrame(columns, copy=False)
+
+def benchmark_record_storage(n_posts=365 * 1000, repeat=3):
+    """레코드 dict 리스트 vs RecordBuffer: 게시물당 메모리와 concat+정렬 시간 비교 (아카이브 1년 규모)"""
+    import tracemalloc
+    import numpy as np
+    import pandas as pd
+
+    sites = [name for name, _ in SITE_CRAWLERS.values()]
+    rng = np.random.default_rng(0)
+    views = rng.integers(0, 200000, n_posts)
+    comments = rng.integers(0, 2000, n_posts)
+    scores = rng.random(n_posts) * 11
+
+    def make_record(i):
+        return {
+            'title': f"벤치마크 게시물 제목 {i}",
+            'url': f"https://example.com/{i}",
+            'source': sites[i % len(sites)],
+            'views': int(views[i]),
+            'comments': int(comments[i]),
+            'date': '08.01',
+        }
+
+    def build_dicts():
+        results = {site: [] for site in sites}
+        for i in range(n_posts):
+            results[sites[i % len(sites)]].append(make_record(i))
+        return {site: pd.DataFrame(rows) for site, rows in results.items()}
+
+    def build_buffers():
+        results = {site: RecordBuffer(site) for site in sites}
+        for i in range(n_posts):
+            results[sites[i % len(sites)]].append(make_record(i))
+        return {site: buffer.to_frame() for site, buffer in results.items()}
+
+    report = {}
+    for name, build in (('dict', build_dicts), ('buffer', build_buffers)):
+        tracemalloc.start()
+        frames = build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            final_df = pd.concat(list(frames.values()), ignore_index=True)
+            final_df['hot_score'] = scores
+            final_df = final_df.sort_values('hot_score', ascending=False)
+            timings.append(time.perf_counter() - started)
+
+        report[name] = {
+            'peak_bytes_per_post': peak / n_posts,
+            'frame_bytes_per_post': final_df.memory_usage(deep=True).sum() / n_posts,
+            'concat_sort_ms': min(timings) * 1000,
+            'source_dtype': str(final_df['source'].dtype),
+        }
+        print(f"📏 {name}: 수집 중 최대 {report[name]['peak_bytes_per_post']:.0f}B/건, "
+              f"최종 프레임 {report[name]['frame_bytes_per_post']:.0f}B/건, "
+              f"concat+정렬 {report[name]['concat_sort_ms']:.1f}ms")
+    return report
+
+DCINSIDE_LIST_URL = "https://gall.dcinside.com/board/lists/?id={board}&page={page}&list_num=100"
+
+# 수집할 갤러리 ID 목록 (쉼표 구분)
+DEFAULT_DCINSIDE_BOARDS = [b.strip() for b in os.environ.get('DCINSIDE_BOARDS', 'dcbest').split(',') if b.strip()]
+
+class RateLimiter:
+    """여러 스레드가 공유하는 호스트 단위 요청 간격 제한기
+
+    wait()를 호출한 순서대로 다음 요청 시각을 예약하므로, 스레드 수와 관계없이
+    호스트에 대한 요청 간격은 low~high초 (예산 부족 시 low초)로 유지된다.
+    """
+
+    def __init__(self, low, high, budget=None, site=None):
+        import threading
+
+        self.low = low
+        self.high = high
+        self.budget = budget
+        self.site = site
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        delay = self.budget.polite_delay(self.site, self.low, self.high) if self.budget else random.uniform(self.low, self.high)
+        delay /= egress_scale()
+        with self.lock:
+            now = time.time()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + delay
+        if slot > now:
+            time.sleep(slot - now)
+
+class FetchError(Exception):
+    """페이지 요청 실패 (retryable이면 재시도 대상)"""
+
+    def __init__(self, message, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+class RetryPolicy:
+    """일시적 오류를 지수 백오프 + 지터로 재시도하는 정책
+
+    연결 오류, 타임아웃, 429/5xx, 브라우저 페이지 로드 실패만 재시도한다 (404 등은 바로 실패).
+    n번째 재시도 전에는 0~min(cap, base * 2^n)초 사이에서 무작위로 기다리고 (full jitter),
+    429의 Retry-After가 있으면 그보다 짧게 기다리지 않는다.
+    목록 페이지 GET처럼 다시 보내도 결과가 같은 요청에만 쓴다 (레코드는 성공한 응답에서만 만든다).
+
+    FETCH_RETRIES: 총 시도 횟수 (기본 3), FETCH_BACKOFF_BASE (기본 1초), FETCH_BACKOFF_MAX (기본 30초)
+    """
+
+    RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, attempts=None, base=None, cap=None):
+        self.attempts = attempts or int(os.environ.get('FETCH_RETRIES', 3))
+        self.base = base if base is not None else float(os.environ.get('FETCH_BACKOFF_BASE', 1.0))
+        self.cap = cap if cap is not None else float(os.environ.get('FETCH_BACKOFF_MAX', 30.0))
+        self.retries = 0
+
+    def backoff(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.cap))
+        return delay
+
+    def is_retryable(self, exc):
+        if isinstance(exc, FetchError):
+            return exc.retryable
+        return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                                requests.exceptions.ChunkedEncodingError))
+
+    def check_response(self, response):
+        """200이 아니면 FetchError (429/5xx는 재시도 대상)"""
+        if response.status_code == 200:
+            return response
+        retry_after = response.headers.get('Retry-After', '')
+        raise FetchError(
+            f"HTTP {response.status_code}",
+            retryable=response.status_code in self.RETRYABLE_STATUS,
+            retry_after=float(retry_after) if retry_after.isdigit() else None,
+        )
+
+    def call(self, fn, label='', should_stop=None):
+        """fn()을 최대 attempts번 실행 (마지막 실패나 재시도 대상이 아닌 오류는 그대로 발생)"""
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.attempts - 1 or not self.is_retryable(e) or (should_stop and should_stop()):
+                    raise
+                delay = self.backoff(attempt, getattr(e, 'retry_after', None))
+                self.retries += 1
+                print(f"🔁 {label} 재시도 {attempt + 1}/{self.attempts - 1} ({e}), {delay:.1f}초 후")
+                time.sleep(delay)
+
+class CircuitBreaker:
+    """사이트 단위 회로 차단기
+
+    재시도 후에도 실패한 페이지가 연속 threshold번(CIRCUIT_BREAKER_THRESHOLD, 기본 5) 나오면 열린다.
+    열리면 그 사이트는 더 요청하지 않고 그때까지 모은 결과로 끝내 남은 시간 예산을 아낀다.
+    갤러리 여러 개를 동시에 수집해도 사이트 전체가 하나를 공유한다.
+    """
+
+    def __init__(self, site_name, threshold=None):
+        import threading
+
+        self.site_name = site_name
+        self.threshold = threshold or int(os.environ.get('CIRCUIT_BREAKER_THRESHOLD', 5))
+        self.consecutive = 0
+        self.failures = 0
+        self.is_open = False
+        self.lock = threading.Lock()
+
+    def record_success(self):
+        with self.lock:
+            self.consecutive = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive += 1
+            self.failures += 1
+            if not self.is_open and self.consecutive >= self.threshold:
+                self.is_open = True
+                print(f"🔌 {self.site_name} 연속 {self.consecutive}페이지 실패 → 회로 차단, 수집분만 사용")
+
+    def report(self, retry=None):
+        retries = retry.retries if retry else 0
+        if self.failures or retries:
+            print(f"🩹 {self.site_name} 재시도 {retries}건, 실패 페이지 {self.failures}건"
+                  f"{' (회로 차단)' if self.is_open else ''}")
+
+class SkipRow(Exception):
+    """목록 행이 게시물이 아님 (필수 요소 없음)"""
+
+class ListField:
+    """목록 행에서 값 하나를 뽑는 선언적 규칙
+
+    - selector: 행 안의 요소 (None이면 행 자체), attr: 속성값 (없으면 텍스트)
+    - html_pattern: 요소 HTML에서 먼저 찾을 정규식 (주석에 숨은 시간 등), pattern: 텍스트에서 찾을 정규식
+    - subs: 차례로 적용할 (정규식, 치환) 목록, base_url: 상대 경로를 절대 URL로
+    - number: 쉼표를 뺀 정수로 변환, required: 요소가 없거나 비어 있으면 행을 버림
+    """
+
+    def __init__(self, selector=None, attr=None, pattern=None, html_pattern=None, subs=(),
+                 separator='', number=False, base_url=None, default=None, required=False):
+        self.selector = selector
+        self.attr = attr
+        self.pattern = pattern
+        self.html_pattern = html_pattern
+        self.subs = subs
+        self.separator = separator
+        self.number = number
+        self.base_url = base_url
+        self.default = default if default is not None else (0 if number else '')
+        self.required = required
+
+    def _default(self):
+        return self.default() if callable(self.default) else self.default
+
+    def extract(self, row):
+        elem = row.select_one(self.selector) if self.selector else row
+        if elem is None:
+            if self.required:
+                raise SkipRow(self.selector)
+            return self._default()
+
+        value = None
+        if self.attr:
+            value = elem.get(self.attr) or ''
+        elif self.html_pattern:
+            m = re.search(self.html_pattern, elem.decode_contents())
+            value = m.group(1).strip() if m else None
+        if value is None:
+            value = elem.get_text(self.separator, strip=True)
+
+        if self.required and not value:
+            raise SkipRow(self.selector)
+
+        if self.pattern:
+            m = re.search(self.pattern, value)
+            if not m:
+                return self._default()
+            value = m.group(m.lastindex or 0)
+
+        for pattern, replacement in self.subs:
+            value = re.sub(pattern, replacement, value, flags=re.S).strip()
+
+        if self.base_url and value and not value.startswith('http'):
+            value = f"{self.base_url.rstrip('/')}/{value.lstrip('/')}"
+
+        if self.number:
+            digits = value.replace(',', '').strip()
+            return int(digits) if digits.isdigit() else self._default()
+        return value
+
+_date_format_patterns = {}
+
+def list_date_mmdd(text, formats, time_rolls_back=False, now=None):
+    """목록 작성일 텍스트 → MMDD (formats 순서대로 시도, 시간만 있으면 KST 오늘)
+
+    formats는 strftime 형식 (%Y %y %m %d %H %M). 구분자 '.'은 '-', '/'도 허용한다.
+    time_rolls_back이면 현재보다 늦은 시각은 어제 글로 본다.
+    """
+    text = str(text or '')
+    for fmt in formats:
+        if fmt not in _date_format_patterns:
+            pattern = re.escape(fmt).replace(r'\.', r'[.\-/]')
+            for code, group in (('%Y', r'(\d{4})'), ('%y', r'(\d{2})'), ('%m', r'(\d{1,2})'),
+                                ('%d', r'(\d{1,2})'), ('%H', r'(\d{1,2})'), ('%M', r'(\d{2})')):
+                pattern = pattern.replace(code, group)
+            _date_format_patterns[fmt] = (re.compile(pattern), re.findall(r'%([YymdHM])', fmt))
+
+        regex, codes = _date_format_patterns[fmt]
+        m = regex.search(text)
+        if not m:
+            continue
+
+        parts = {code: int(value) for code, value in zip(codes, m.groups())}
+        if 'm' in parts:
+            return f"{parts['m']:02d}{parts['d']:02d}"
+
+        if parts['H'] > 23 or parts['M'] > 59:
+            continue
+        now = now or datetime.now(KST)
+        if time_rolls_back and now.replace(hour=parts['H'], minute=parts['M'], second=0, microsecond=0) > now:
+            return (now - timedelta(days=1)).strftime("%m%d")
+        return now.strftime("%m%d")
+    return None
+
+class SiteSpec:
+    """사이트 목록 크롤링을 선언적으로 기술하는 스펙 (crawl_site_spec이 실행)
+
+    - url_template: 'page'와 파티션 값(board 등)으로 채우는 목록 URL (문자열 또는 함수)
+    - rows / fields: 행 선택자와 필드별 ListField (title, url, date, views, comments)
+    - date_formats: 작성일 형식 목록 (list_date_mmdd)
+    - stop_rule: 'no_target' (목표 날짜가 없는 페이지에서 종료), 'date_passed' (수집 시작 후 모든 글이
+      목표 날짜 이전이면 종료), 'empty_streak' (수집 0건 페이지가 empty_streak번 이어지면 종료),
+      'page_range' (max_pages까지 모두)
+    - fetch: 'http' (requests 세션) 또는 'browser' (HybridFetcher, FETCH_MODE에 따라 HTTP 우선/브라우저)
+    - delay: 목록 페이지 요청 간격 (low, high)초. 파티션(갤러리)이 여러 개여도 사이트 전체가 공유한다.
+    """
+
+    def __init__(self, key, source, url_template, rows, fields, date_formats, stop_rule='no_target',
+                 fetch='http', delay=(0.5, 1.0), row_filter=None, partition_field=None, partitions=None,
+                 max_pages=None, empty_streak=3, max_records=None, start_search_page=None,
+                 expect=None, wait=None, keep_driver=True, time_rolls_back=False, require_title=False,
+                 timeout=60, user_agent=None, post_process=None):
+        if stop_rule not in ('no_target', 'date_passed', 'empty_streak', 'page_range'):
+            raise ValueError(f"알 수 없는 종료 규칙: {stop_rule}")
+        if fetch not in ('http', 'browser'):
+            raise ValueError(f"알 수 없는 수집 방식: {fetch}")
+
+        self.key = key
+        self.source = source
+        self.url_template = url_template
+        self.rows = rows
+        self.fields = fields
+        self.date_formats = date_formats
+        self.stop_rule = stop_rule
+        self.fetch = fetch
+        self.delay = delay
+        self.row_filter = row_filter
+        self.partition_field = partition_field
+        self.partitions = partitions
+        self.max_pages = max_pages
+        self.empty_streak = empty_streak
+        self.max_records = max_records
+        self.start_search_page = start_search_page
+        self.expect = expect
+        self.wait = wait
+        self.keep_driver = keep_driver
+        self.time_rolls_back = time_rolls_back
+        self.require_title = require_title
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.post_process = post_process
+
+    def partition_values(self, values=None):
+        """파티션 값 목록 (디시 갤러리 등). 파티션이 없는 사이트는 [None]"""
+        if not self.partition_field:
+            return [None]
+        values = values or (self.partitions() if callable(self.partitions) else self.partitions)
+        return list(values or [])
+
+    def list_url(self, page, partition=None):
+        params = {self.partition_field: partition} if self.partition_field else {}
+        if callable(self.url_template):
+            return self.url_template(page=page, **params)
+        return self.url_template.format(page=page, **params)
+
+    def parse(self, soup, partition=None, page=1):
+        """목록 페이지의 모든 행 → 게시물 dict 목록 (필수 요소가 없는 행은 제외)"""
+        rows = soup.select(self.rows)
+        if self.row_filter:
+            rows = self.row_filter(rows, partition, page)
+
+        posts = []
+        for row in rows:
+            try:
+                post = {name: field.extract(row) for name, field in self.fields.items()}
+            except Exception:
+                continue
+            if self.partition_field:
+                post[self.partition_field] = partition
+            posts.append(post)
+        return posts
+
+    def mmdd(self, date_text):
+        return list_date_mmdd(date_text, self.date_formats, self.time_rolls_back)
+
+    def record(self, post):
+        record = {
+            'title': post.get('title', ''),
+            'url': post.get('url', ''),
+            'source': self.source,
+            'views': post.get('views', 0),
+            'comments': post.get('comments', 0),
+            'date': post.get('date', ''),
+        }
+        if self.partition_field:
+            record[self.partition_field] = post[self.partition_field]
+        return record
+
+def _find_start_page(spec, fetch_page, target_date, first_page, budget=None, max_probes=30, should_stop=None):
+    """목록 마지막 글의 작성일을 보며 목표 날짜가 시작되는 페이지 탐색 (FM코리아처럼 앞쪽이 당일 글인 목록)
+
+    "마지막 글이 목표 날짜 당일/이전인 첫 페이지"를 찾는다. first_page에서 간격을 두 배씩 늘려
+    경계를 감싼 뒤 이진 탐색하므로, 앞쪽 최신 글이 수백 페이지여도 probe 수는 로그 규모다.
+    probe 요청이 실패하거나 should_stop()이 참이면 (회로 차단) 탐색을 그만두고 first_page를 반환한다.
+    """
+    probed = {}
+    failed = []
+
+    def reached(page):
+        if page not in probed:
+            soup = fetch_page(page)
+            if soup is None:
+                failed.append(page)
+                return False
+            dates = [d for d in (spec.mmdd(post['date']) for post in spec.parse(soup, page=page)) if d]
+            # 글이 없는 페이지는 목록 끝
+            probed[page] = not dates or dates[-1] <= target_date
+        return probed[page]
+
+    def aborted():
+        return bool(failed) or bool(should_stop and should_stop())
+
+    def exhausted():
+        return aborted() or len(probed) >= max_probes or bool(budget and budget.should_stop(spec.key))
+
+    # reached(lo)는 False, reached(hi)는 True가 되도록 구간 확장 (lo=0은 1페이지 앞)
+    if reached(first_page):
+        lo, hi, step = first_page - 1, first_page, 1
+        while lo >= 1 and not exhausted() and reached(lo):
+            hi, step = lo, step * 2
+            lo = max(hi - step, 0)
+    else:
+        lo, hi, step = first_page, first_page + 1, 1
+        while not exhausted() and not reached(hi):
+            lo, step = hi, step * 2
+            hi = lo + step
+
+    while hi - lo > 1 and not exhausted():
+        mid = (lo + hi) // 2
+        if reached(mid):
+            hi = mid
+        else:
+            lo = mid
+
+    if aborted():
+        print(f"⚠️ 시작 페이지 탐색 중단 (실패 probe: {failed or '회로 차단'}), p{first_page}부터 수집")
+        return first_page
+
+    print(f"시작 페이지 확정: p{hi} (probe {len(probed)}회)")
+    return hi
+
+def crawl_site_spec(spec, target_date, fetch_mode=None, on_record=None, start_page=None, end_page=None,
+                    budget=None, on_page=None, partitions=None):
+    """SiteSpec으로 사이트를 크롤링 → DataFrame
+
+    파티션마다 스레드 하나가 페이지를 순서대로 넘기며 (브라우저 수집은 파티션 하나씩),
+    모든 목록 요청은 사이트 단위 RateLimiter를 공유한다. 실행 중 이미 본 게시물은 SeenPosts로 건너뛴다.
+    spec.post_process가 있으면 목록 수집이 끝난 뒤 레코드를 넘겨 보강하고 (FM코리아 조회수),
+    그 결과로 on_record를 호출한다.
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from bs4 import BeautifulSoup
+
+    partitions = spec.partition_values(partitions)
+    limiter = RateLimiter(spec.delay[0], spec.delay[1], budget, spec.key)
+    retry = RetryPolicy()
+    breaker = CircuitBreaker(spec.source)
+    record_lock = threading.Lock()
+    seen = SeenPosts(spec.source)
+
+    session = fetcher = None
+    if spec.fetch == 'http':
+        session = create_http_session(
+            user_agent=spec.user_agent,
+            pool_size=max(len(partitions), 1),
+            pool_key=spec.key,
+        )
+    else:
+        fetcher = HybridFetcher.acquire(
+            spec.source,
+            spec.list_url(1, partitions[0] if partitions else None),
+            mode=fetch_mode,
+            min_interval=spec.delay[0],
+            keep_driver=spec.keep_driver,
+        )
+
+    def load_list_page(driver, url):
+        driver.get(url)
+        selector, timeout, settle = spec.wait
+        # 목록 행 개수가 안정될 때까지 대기
+        return wait_for_page(driver, selector, timeout=timeout, settle=settle)
+
+    def fetch_page(page, partition=None):
+        """목록 페이지 soup (재시도 후에도 실패하면 None, 결과는 회로 차단기에 기록)"""
+        url = spec.list_url(page, partition)
+
+        def attempt():
+            limiter.wait()
+            if fetcher is not None:
+                soup = fetcher.get_soup(url, expect=spec.expect, loader=load_list_page if spec.wait else None)
+                if soup is None:
+                    raise FetchError("페이지 로드 실패", retryable=True)
+                return soup
+
+            response = retry.check_response(session.get(url, timeout=spec.timeout))
+            return BeautifulSoup(response.content, 'html.parser')
+
+        try:
+            soup = retry.call(attempt, f"{spec.source} {partition or ''} p{page}",
+                              should_stop=lambda: breaker.is_open or (budget and budget.should_stop(spec.key)))
+        except Exception as e:
+            print(f"❌ {spec.source} {page}페이지 요청 실패: {e}")
+            breaker.record_failure()
+            return None
+        breaker.record_success()
+        return soup
+
+    def emit(record):
+        if on_record and not spec.post_process:
+            # 점수 계산기의 러닝 통계는 스레드 안전하지 않음
+            with record_lock:
+                on_record(record)
+
+    def crawl_partition(partition):
+        results = RecordBuffer(spec.source)
+        prefix = f"[{partition}] " if partition else ''
+        page = start_page or 1
+        if spec.start_search_page:
+            # 샤드 범위가 주어지면 목표 날짜 시작 페이지와 샤드 시작 중 뒤쪽부터
+            page = max(_find_start_page(spec, fetch_page, target_date, spec.start_search_page, budget,
+                                        should_stop=lambda: breaker.is_open), page)
+        last_page = end_page or spec.max_pages
+        started = False
+        misses = 0
+
+        while True:
+            if last_page and page > last_page:
+                print(f"🔚 {prefix}{page - 1}페이지(끝) 도달, 크롤링 종료")
+                break
+
+            if budget and budget.should_stop(spec.key):
+                print(f"⏳ {prefix}시간 예산 소진, {page}페이지에서 중단 (수집 {len(results)}건)")
+                break
+
+            soup = fetch_page(page, partition)
+            if breaker.is_open:
+                print(f"🔌 {prefix}{page}페이지에서 중단 (수집 {len(results)}건)")
+                break
+
+            if soup is None:
+                # 실패한 페이지는 건너뜀 (연속으로 실패하면 회로 차단기가 끊음)
+                page += 1
+                continue
+
+            posts = spec.parse(soup, partition, page)
+            if not posts and spec.stop_rule in ('no_target', 'date_passed'):
+                print(f"📄 {prefix}{page}페이지: 게시물 없음, 크롤링 종료")
+                break
+
+            dates = [spec.mmdd(post['date']) for post in posts]
+            has_target = target_date in dates
+
+            if spec.stop_rule == 'date_passed' and started and all(
+                d is not None and d < target_date for d, post in zip(dates, posts) if post['date']
+            ):
+                print(f"{prefix}{page}페이지: 모든 게시물이 목표 날짜 이전. 크롤링 종료")
+                break
+            started = started or has_target
+
+            page_records = []
+            for post, mmdd in zip(posts, dates):
+                if mmdd != target_date or not post['url']:
+                    continue
+                if spec.require_title and not post['title']:
+                    continue
+                if not seen.add(post['url']):
+                    continue
+                record = spec.record(post)
+                page_records.append(record)
+                emit(record)
+
+            results.extend(page_records)
+            if on_page:
+                on_page(page, page_records)
+
+            if has_target:
+                print(f"✅ {prefix}p{page}: {len(page_records)}개 수집")
+            elif spec.stop_rule == 'no_target':
+                print(f"⭐ {prefix}p{page}: 목표 날짜 게시물 없음 → 수집 종료")
+                break
+            else:
+                print(f"⏭️ {prefix}p{page}: 목표 날짜 없음, 스킵")
+
+            if spec.stop_rule == 'empty_streak':
+                # 목표 날짜보다 최신 글만 있는 앞쪽 페이지는 세지 않음
+                newer_only = bool(dates) and all(d is not None and d > target_date for d in dates)
+                misses = 0 if page_records else misses + (0 if newer_only else 1)
+                if misses >= spec.empty_streak:
+                    break
+
+            if spec.max_records and len(results) > spec.max_records:
+                print(f"🔚 {prefix}결과 수 제한 ({spec.max_records}개) 도달, 크롤링 중단")
+                break
+            page += 1
+
+        if prefix:
+            print(f"   {prefix}{len(results)}건")
+        return results
+
+    try:
+        workers = max(len(partitions), 1) if fetcher is None else 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            partition_results = list(executor.map(crawl_partition, partitions))
+
+        # 파티션 순서대로 합침
+        results = RecordBuffer(spec.source)
+        for records in partition_results:
+            results.merge(records)
+
+        if spec.post_process:
+            records = spec.post_process(results.to_frame().to_dict('records') if len(results) else [],
+                                        fetcher or session, budget)
+            results = RecordBuffer(spec.source)
+            results.extend(records)
+            if on_record:
+                for record in records:
+                    on_record(record)
+        seen.report()
+        breaker.report(retry)
+        if breaker.is_open and not len(results):
+            raise FetchError(f"{spec.source} 회로 차단으로 수집 0건")
+    finally:
+        if fetcher is not None:
+            fetcher.close()
+        if session is not None:
+            release_http_session(session)
+
+    df = results.to_frame()
+    print(f"✅ {spec.source} 크롤링 완료 (총 {len(df)}건)")
+    return df
+
+def crawl_dcinside_requests(target_date, on_record=None, start_page=None, end_page=None, budget=None, boards=None):
+    """디시인사이드 갤러리 여러 개를 동시에 크롤링 (SITE_SPECS['dcinside'])
+
+    갤러리마다 스레드 하나가 페이지를 순서대로 넘기고(갤러리별 수집 시작/종료 판단 유지),
+    모든 요청은 하나의 커넥션 풀 세션과 호스트 단위 요청 간격 제한을 공유한다.
+    레코드에는 갤러리 ID가 'board'로 기록된다.
+    """
+    return crawl_site_spec(SITE_SPECS['dcinside'], target_date, on_record=on_record, start_page=start_page,
+                           end_page=end_page, budget=budget, partitions=boards)
+
+FMKOREA_BEST_URL = "https://www.fmkorea.com/index.php?mid=best&page={page}"
+THEQOO_HOT_URL = "https://theqoo.net/hot?page={page}"
+
+def parse_fmkorea_views(soup):
+    """FM코리아 상세 페이지에서 조회수 추출"""
+    # 보통 '조회 1,234' 형태. 여러 span 중 '조회' 포함 텍스트를 우선 파싱
+    spans = soup.select("div.side.fr span")
+    for s in spans:
+        m = re.search(r'조회\s*([\d,]+)', s.get_text(strip=True))
+        if m:
+            return int(m.group(1).replace(",", ""))
+
+    # 위 패턴이 없으면 첫 span에서 숫자만 추출(백업)
+    if spans:
+        m = re.search(r'([\d,]+)', spans[0].get_text(strip=True))
+        if m:
+            return int(m.group(1).replace(",", ""))
+    return 0
+
+# 고화제성 기준 점수 (요약 통계와 상세 보강 대상 선정에 공통 사용)
+HIGH_SCORE_THRESHOLD = 5.5
+
+class ViewEnrichmentPolicy:
+    """목록에서 얻은 댓글수만으로 먼저 점수를 매기고, 순위가 바뀔 수 있는 게시물만 상세 조회수 수집
+
+    조회수는 화제성 점수에서 최대 1점(조회수 / 최고 조회수)이라 댓글 점수가 s인 게시물의
+    최종 점수는 [s, s+1] 범위다. 보강은 두 단계로 진행한다.
+
+    1. 댓글 기준 상위 K개의 조회수를 수집해 댓글당 조회수 표본과 최고 조회수를 얻는다.
+    2. 나머지는 표본으로 추정한 조회수의 slack배를 조회수 점수 상한으로 보고,
+       그 상한으로 K위 점수에 닿거나 임계값(예: 5.5)을 넘을 수 있는 게시물만 추가 수집한다.
+
+    수집하지 않은 게시물은 표본의 댓글당 조회수 중앙값으로 조회수를 추정한다.
+    (점수는 당일 최고값 기준으로 계산하므로 rolling 정규화에서는 근사치)
+
+    mode: 'topk' (기본값), 'all' (모든 게시물 상세 수집, 기존 방식), 'none' (상세 수집 안 함)
+    """
+
+    def __init__(self, mode=None, top_k=None, thresholds=(HIGH_SCORE_THRESHOLD,), slack=2.0):
+        self.mode = mode or os.environ.get('FMKOREA_VIEW_ENRICHMENT', 'topk')
+        if self.mode not in ('topk', 'all', 'none'):
+            raise ValueError(f"알 수 없는 상세 보강 방식: {self.mode}")
+
+        self.top_k = top_k if top_k is not None else int(os.environ.get('FMKOREA_ENRICH_TOP_K', 30))
+        self.thresholds = thresholds
+        self.slack = slack
+
+        self.fetched = 0
+        self.estimated = 0
+        self.failed = 0
+        self.fetch_seconds = 0.0
+
+    @staticmethod
+    def _comment_order(posts):
+        return sorted(range(len(posts)), key=lambda i: posts[i]['comments'], reverse=True)
+
+    @staticmethod
+    def _comment_scores(posts):
+        max_comments = max([p['comments'] for p in posts] + [1])
+        return [min(p['comments'] / max_comments * 10, 10.0) for p in posts]
+
+    def initial_targets(self, posts):
+        """1단계 보강 대상 인덱스 (댓글 많은 순)"""
+        order = self._comment_order(posts)
+        if self.mode == 'all':
+            return order
+        if self.mode == 'none':
+            return []
+        return order[:self.top_k]
+
+    def extra_targets(self, posts, fetched_views):
+        """2단계 보강 대상: 추정 조회수 상한으로 상위 K위/임계값 경계를 넘을 수 있는 게시물"""
+        if self.mode != 'topk' or len(posts) <= self.top_k or self.top_k <= 0:
+            return []
+
+        samples = self.samples(posts, fetched_views)
+        max_views = max([views for views, _ in samples] + [1])
+        scores = self._comment_scores(posts)
+        order = self._comment_order(posts)
+        kth_score = scores[order[self.top_k - 1]]
+
+        targets = []
+        for i in order[self.top_k:]:
+            if i in fetched_views:
+                continue
+
+            if samples:
+                estimate = self.estimate_views(posts[i]['comments'], samples)
+                view_bound = min(self.slack * estimate / max_views, 1.0)
+            else:
+                view_bound = 1.0
+
+            if scores[i] + view_bound >= kth_score:
+                targets.append(i)
+            elif any(scores[i] < t <= scores[i] + view_bound for t in self.thresholds):
+                targets.append(i)
+        return targets
+
+    @staticmethod
+    def samples(posts, fetched_views):
+        return [(views, posts[i]['comments']) for i, views in fetched_views.items() if views > 0]
+
+    def estimate_views(self, comments, samples):
+        """수집한 (조회수, 댓글수) 표본의 댓글당 조회수 중앙값으로 추정 (표본 최대 조회수를 넘지 않음)"""
+        if not samples:
+            return 0
+
+        ratios = sorted(views / (c + 1) for views, c in samples)
+        ratio = ratios[len(ratios) // 2]
+        max_views = max(views for views, _ in samples)
+        return int(min(ratio * (comments + 1), max_views))
+
+    def record_fetch(self, seconds):
+        self.fetched += 1
+        self.fetch_seconds += seconds
+
+    def report(self, source):
+        total = self.fetched + self.estimated
+        if total == 0:
+            return
+        avg = self.fetch_seconds / self.fetched if self.fetched else 0.0
+        print(f"🔎 {source} 상세 조회수 보강({self.mode}): {self.fetched}/{total}건 수집, "
+              f"{self.estimated}건 추정 ({self.estimated / total:.0%} 생략, 약 {avg * self.estimated:.0f}초 절약)"
+              + (f", 상세 실패 {self.failed}건" if self.failed else ''))
+
+def crawl_fmkorea_selenium_simple(target_date, fetch_mode=None, on_record=None, start_page=None, end_page=None, budget=None, on_page=None):
+    """FM코리아 베스트 크롤링 (SITE_SPECS['fmkorea']: 시작 페이지 탐색 → 목록 수집 → 조회수 보강)"""
+    return crawl_site_spec(SITE_SPECS['fmkorea'], target_date, fetch_mode=fetch_mode, on_record=on_record,
+                           start_page=start_page, end_page=end_page, budget=budget, on_page=on_page)
+
+def crawl_theqoo_selenium(target_date, fetch_mode=None, on_record=None, start_page=None, end_page=None, budget=None, on_page=None):
+    """더쿠 핫게시판 크롤링 (SITE_SPECS['theqoo']: 수집 0건 페이지가 3번 이어지면 종료)"""
+    return crawl_site_spec(SITE_SPECS['theqoo'], target_date, fetch_mode=fetch_mode, on_record=on_record,
+                           start_page=start_page, end_page=end_page, budget=budget, on_page=on_page)
+
+INSTIZ_LIST_URL = "https://www.instiz.net/pt?page={page}&srt=3&srd=4"
+
+def crawl_instiz_requests(target_date, on_record=None, start_page=None, end_page=None, budget=None):
+    """인스티즈 이슈 크롤링 (SITE_SPECS['instiz']: 기본 30페이지까지)"""
+    return crawl_site_spec(SITE_SPECS['instiz'], target_date, on_record=on_record, start_page=start_page,
+                           end_page=end_page, budget=budget)
+
+def _dcinside_list_url(page, board):
+    url = DCINSIDE_LIST_URL.format(board=board, page=page)
+    if board == 'dcbest':
+        url += "&_dcbest=9"
+    return url
+
+def _dcinside_rows(rows, board, page):
+    if board == 'dcbest':
+        # 실시간 베스트는 상단 고정글 개수가 정해져 있음
+        return rows[2:] if page == 1 else rows[1:]
+    # 일반 갤러리는 번호가 숫자가 아닌 행(공지/설문/AD) 제외
+    return [
+        row for row in rows
+        if (row.select_one('td.gall_num') and row.select_one('td.gall_num').get_text(strip=True).isdigit())
+    ]
+
+def _theqoo_rows(rows, partition, page):
+    # 공지/고정글 제외
+    return [
+        row for row in rows
+        if not ('notice' in ' '.join(row.get('class', [])).lower()
+                or 'sticky' in ' '.join(row.get('class', [])).lower()
+                or (row.get('data-permanent-notice') or '') == 'Y')
+    ]
+
+def _instiz_rows(rows, partition, page):
+    return [row for row in rows if any(cls.startswith('r') for cls in row.get('class', []))]
+
+def enrich_fmkorea_views(records, fetcher, budget=None):
+    """FM코리아 목록 레코드에 조회수 보강 (ViewEnrichmentPolicy가 고른 게시물만 상세 수집, 나머지는 추정)"""
+    policy = ViewEnrichmentPolicy()
+
+    def load_detail_page(driver, url):
+        driver.get(url)
+        # 상세 페이지 로드 대기: side 영역 등장
+        return wait_for_page(driver, "div.side.fr span", timeout=10)
+
+    views_by_index = {}
+
+    def enrich(indices):
+        for i in indices:
+            # 예산이 부족하면 남은 게시물은 추정값 사용
+            if budget and budget.skip_enrichment('fmkorea'):
+                return
+            try:
+                started = time.time()
+                soup = fetcher.get_soup(records[i]['url'], expect="div.side.fr span", loader=load_detail_page)
+            except Exception:
+                soup = None
+            if soup is None:
+                # 실패한 게시물은 수집하지 않은 것과 같이 추정
+                policy.failed += 1
+                continue
+            views_by_index[i] = parse_fmkorea_views(soup)
+            policy.record_fetch(time.time() - started)
+
+    # 순위가 바뀔 수 있는 게시물만 상세 조회수 수집 (댓글 많은 순)
+    enrich(policy.initial_targets(records))
+    enrich(policy.extra_targets(records, views_by_index))
+
+    samples = policy.samples(records, views_by_index)
+    for i, record in enumerate(records):
+        # 추정값은 views_estimated로 표시해 실측 조회수와 구분
+        record['views_estimated'] = i not in views_by_index
+        if i in views_by_index:
+            record['views'] = views_by_index[i]
+        else:
+            record['views'] = policy.estimate_views(record['comments'], samples)
+            policy.estimated += 1
+
+    policy.report('FM코리아')
+    return records
+
+# 사이트별 목록 크롤링 스펙 (crawl_site_spec으로 실행, VelocityPoller도 같은 파싱 규칙 사용)
+SITE_SPECS = {
+    'dcinside': SiteSpec(
+        key='dcinside',
+        source='디시인사이드',
+        url_template=_dcinside_list_url,
+        rows='tr.ub-content',
+        row_filter=_dcinside_rows,
+        fields={
+            'title': ListField('td.gall_tit.ub-word a', subs=[(r'^[\[\(][^\]\)]{1,3}[\]\)]\s*', '')]),
+            'url': ListField('td.gall_tit.ub-word a', attr='href', base_url='https://gall.dcinside.com'),
+            'date': ListField('td.gall_date'),
+            'views': ListField('td.gall_count', number=True),
+            'comments': ListField('a.reply_numbox span.reply_num', pattern=r'\[(\d+)', number=True),
+        },
+        date_formats=('%y.%m.%d', '%m.%d', '%H:%M'),
+        stop_rule='date_passed',
+        partition_field='board',
+        partitions=lambda: DEFAULT_DCINSIDE_BOARDS,
+        max_records=300,
+        delay=(0.5, 1.0),
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    ),
+    'fmkorea': SiteSpec(
+        key='fmkorea',
+        source='FM코리아',
+        url_template=FMKOREA_BEST_URL,
+        rows='div.li',
+        fields={
+            # 제목 끝의 [댓글수]는 제목에서 빼고 댓글수로
+            'title': ListField('h3.title a', separator=' ', subs=[(r'\s*\[\d+\]$', '')]),
+            'url': ListField('h3.title a', attr='href', base_url='https://www.fmkorea.com'),
+            # 시간은 주석(<!-- HH:MM -->)으로 들어있는 경우가 있음
+            'date': ListField('span.regdate', html_pattern=r'<!--\s*(\d{1,2}:\d{2})\s*-->', required=True),
+            'comments': ListField('h3.title a', separator=' ', pattern=r'\[(\d+)\]', number=True),
+        },
+        date_formats=('%Y.%m.%d', '%H:%M'),
+        time_rolls_back=True,
+        stop_rule='no_target',
+        start_search_page=5,
+        fetch='browser',
+        expect='div.li',
+        wait=('div.li', 8, 0.3),
+        delay=(0.5, 0.5),
+        post_process=enrich_fmkorea_views,
+    ),
+    'theqoo': SiteSpec(
+        key='theqoo',
+        source='더쿠',
+        url_template=THEQOO_HOT_URL,
+        rows='table.theqoo_board_table tbody tr:not(.notice):not(.notice_expand)',
+        row_filter=_theqoo_rows,
+        fields={
+            'title': ListField('td.title a[href]'),
+            'url': ListField('td.title a[href]', attr='href', base_url='https://theqoo.net'),
+            'date': ListField('td.time', required=True),
+            'views': ListField('td.m_no', number=True),
+            'comments': ListField('td.title a.replyNum', pattern=r'(\d+)', number=True),
+        },
+        date_formats=('%y.%m.%d', '%m.%d', '%H:%M'),
+        stop_rule='empty_streak',
+        empty_streak=3,
+        require_title=True,
+        fetch='browser',
+        expect='table.theqoo_board_table',
+        wait=('table.theqoo_board_table tbody tr', 15, 0.5),
+        # 브라우저 폴백 시에는 페이지마다 새 세션 사용
+        keep_driver=False,
+        delay=(5, 10),
+    ),
+    'instiz': SiteSpec(
+        key='instiz',
+        source='인스티즈',
+        url_template=INSTIZ_LIST_URL,
+        rows='td.listsubject',
+        row_filter=_instiz_rows,
+        fields={
+            'title': ListField('a div.sbj', separator=' ', required=True,
+                               subs=[(r'\(.*$', ''), (r'\s*\[\d+\]$', '')]),
+            'url': ListField('a', attr='href', base_url='https://www.instiz.net'),
+            # 시간만 있으면 오늘 날짜 MM.DD
+            'date': ListField('div.listno.regdate', separator=' ', pattern=r'\d{2}\.\d{2}', required=True,
+                              default=lambda: datetime.today().strftime('%m.%d')),
+            'views': ListField('div.listno.regdate', separator=' ', pattern=r'조회\s([\d,]+)', number=True),
+            'comments': ListField('a div.sbj span.cmt2', number=True),
+        },
+        date_formats=('%m.%d',),
+        stop_rule='page_range',
+        max_pages=30,
+        delay=(5.0, 10.0),
+        timeout=120,
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    ),
+}
+
+# 브라우저 크롤러 감독(watchdog) 설정
+CRAWLER_ISOLATION = os.environ.get('CRAWLER_ISOLATION', 'process')   # 'process' 또는 'inline'
+CRAWLER_RSS_LIMIT_MB = float(os.environ.get('CRAWLER_RSS_LIMIT_MB', 1536))
+CRAWLER_HEARTBEAT_TIMEOUT = float(os.environ.get('CRAWLER_HEARTBEAT_TIMEOUT', 180))
+CRAWLER_MAX_RESTARTS = int(os.environ.get('CRAWLER_MAX_RESTARTS', 3))
+
+BROWSER_PROCESS_NAMES = ('chrome', 'chromedriver', 'chromium', 'chromium-browser', 'google-chrome')
+
+def _read_proc_table():
+    """/proc에서 {pid: (ppid, 이름, RSS 바이트)} 테이블 생성 (리눅스 외에는 빈 dict)"""
+    table = {}
+    if not os.path.isdir('/proc'):
+        return table
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+            # 프로세스 이름에 공백/괄호가 들어갈 수 있어 마지막 ')' 기준으로 분리
+            name = stat[stat.index('(') + 1:stat.rindex(')')]
+            fields = stat[stat.rindex(')') + 2:].split()
+            with open(f'/proc/{entry}/statm') as f:
+                rss_pages = int(f.read().split()[1])
+            table[int(entry)] = (int(fields[1]), name, rss_pages * page_size)
+        except (OSError, ValueError, IndexError):
+            continue
+    return table
+
+def _process_tree(pid, table=None):
+    """pid와 모든 자손 프로세스 목록"""
+    table = table if table is not None else _read_proc_table()
+    children = {}
+    for child, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(child)
+
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+def _tree_rss_mb(pid):
+    table = _read_proc_table()
+    return sum(table[p][2] for p in _process_tree(pid, table) if p in table) / (1024 * 1024)
+
+def _kill_tree(pid):
+    """자손(chromedriver/chrome)까지 먼저 목록을 잡은 뒤 모두 SIGKILL"""
+    import signal
+
+    for p in reversed(_process_tree(pid)):
+        try:
+            os.kill(p, signal.SIGKILL)
+        except OSError:
+            continue
+
+def cleanup_orphan_browsers():
+    """부모가 사라져 init(1)에 입양된 headless chrome/chromedriver 프로세스 정리"""
+    import signal
+
+    killed = 0
+    for pid, (ppid, name, _) in _read_proc_table().items():
+        if ppid != 1 or name not in BROWSER_PROCESS_NAMES:
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read()
+            # 사용자가 띄운 일반 브라우저는 건드리지 않음
+            if name != 'chromedriver' and b'--headless' not in cmdline:
+                continue
+            os.kill(pid, signal.SIGKILL)
+            killed += 1
+        except OSError:
+            continue
+
+    if killed:
+        print(f"🧹 고아 브라우저 프로세스 {killed}개 정리")
+    return killed
+
+def _supervised_worker(crawler, target_date, kwargs, queue):
+    """자식 프로세스 진입점: 페이지 단위 결과와 heartbeat를 큐로 전송"""
+    global _progress_hook
+    _progress_hook = lambda event: queue.put(('heartbeat', event))
+
+    def on_page(page, records):
+        queue.put(('page', page, records))
+
+    try:
+        df = crawler(target_date, on_page=on_page, **kwargs)
+        queue.put(('done', df.to_dict('records')))
+    except FetchError as e:
+        # 사이트가 응답하지 않는 경우라 재시작해도 소용없음
+        queue.put(('failed', str(e)))
+    except Exception as e:
+        queue.put(('error', f"{type(e).__name__}: {e}"))
+
+class SupervisedCrawler:
+    """브라우저 크롤러를 감독되는 자식 프로세스에서 실행하는 래퍼 (크롤러와 같은 호출 형식)
+
+    - 자식 프로세스는 페이지를 끝낼 때마다 결과를 큐로 보내므로, 죽더라도 잃는 것은 진행 중이던 페이지뿐이다.
+    - heartbeat가 heartbeat_timeout초 동안 없거나 (driver.get 멈춤 등) 프로세스 트리 RSS가
+      rss_limit_mb를 넘으면 트리 전체를 종료하고 마지막으로 끝난 페이지 다음부터 다시 시작한다.
+    - 시작/종료/재시작 때마다 고아 chrome/chromedriver 프로세스를 정리한다.
+
+    FM코리아는 조회수 보강(spec.post_process)이 목록 수집 뒤에 일어나므로, 보강 전에 죽은 실행에서 받아둔
+    페이지는 부모 프로세스에서 따로 보강한다 (보강이 실패하면 조회수 추정값으로 표시).
+    """
+
+    def __init__(self, site_key, crawler, rss_limit_mb=None, heartbeat_timeout=None, max_restarts=None):
+        self.site_key = site_key
+        self.crawler = crawler
+        self.rss_limit_mb = rss_limit_mb or CRAWLER_RSS_LIMIT_MB
+        self.heartbeat_timeout = heartbeat_timeout or CRAWLER_HEARTBEAT_TIMEOUT
+        self.max_restarts = CRAWLER_MAX_RESTARTS if max_restarts is None else max_restarts
+
+    def __call__(self, target_date, on_record=None, start_page=None, end_page=None, budget=None, **kwargs):
+        # 데몬(WarmPool)에서는 브라우저를 살려 두기 위해 같은 프로세스에서 실행
+        if CRAWLER_ISOLATION != 'process' or _warm_pool is not None:
+            return self.crawler(target_date, on_record=on_record, start_page=start_page,
+                                end_page=end_page, budget=budget, **kwargs)
+
+        import pandas as pd
+
+        carried = []        # 비정상 종료된 실행에서 받아둔 페이지 결과
+        last_page = None
+        restarts = 0
+        final = None
+
+        while True:
+            resume_page = last_page + 1 if last_page else start_page
+            outcome, pages, records, last_page = self._run_child(
+                target_date, resume_page, end_page, budget, kwargs, last_page
+            )
+
+            if outcome == 'done':
+                final = records
+                break
+
+            carried.extend(r for _, page_records in sorted(pages.items()) for r in page_records)
+            if outcome == 'failed':
+                break
+            restarts += 1
+            if restarts > self.max_restarts:
+                print(f"❌ {self.site_key} 재시작 한도({self.max_restarts}회) 초과, 수집분만 사용")
+                break
+            if budget and budget.should_stop(self.site_key):
+                print(f"⏳ {self.site_key} 시간 예산 소진, 재시작하지 않음")
+                break
+            if end_page and last_page and last_page >= end_page:
+                break
+            print(f"🔄 {self.site_key} 재시작 ({restarts}/{self.max_restarts}): p{(last_page or 0) + 1}부터")
+
+        carried = self._post_process_carried(carried, final or [], kwargs.get('fetch_mode'), budget)
+
+        # 재시작 경계에서 밀려 다시 나타난 글 제외
+        seen = SeenPosts(self.site_key)
+        results = [record for record in carried + (final or []) if seen.add(record['url'])]
+        seen.report()
+        if final is None and not results:
+            raise RuntimeError(f"{self.site_key} 자식 프로세스가 한 번도 끝나지 못함 ({outcome})")
+        if on_record:
+            for record in results:
+                on_record(record)
+
+        if not results:
+            return pd.DataFrame()
+        buffer = RecordBuffer(results[0]['source'])
+        buffer.extend(results)
+        return buffer.to_frame()
+
+    def _post_process_carried(self, carried, final, fetch_mode, budget):
+        """비정상 종료된 실행의 레코드에 spec.post_process 적용 (자식에서 끝난 실행의 레코드는 이미 적용됨)"""
+        spec = SITE_SPECS.get(self.site_key)
+        if not carried or spec is None or not spec.post_process:
+            return carried
+
+        # 실행 간 밀려 다시 나타난 글과, 끝까지 돈 마지막 실행 결과(보강 완료)와 겹치는 글은 한 번만/보강하지 않음
+        seen_ids = {post_id_from_url(record['url']) for record in final}
+        unique = []
+        for record in carried:
+            post_id = post_id_from_url(record['url'])
+            if post_id not in seen_ids:
+                seen_ids.add(post_id)
+                unique.append(record)
+        carried = unique
+        if not carried:
+            return carried
+
+        print(f"🩹 {spec.source} 중단된 실행의 {len(carried)}건 보강")
+        fetcher = session = None
+        try:
+            if spec.fetch == 'browser':
+                fetcher = HybridFetcher.acquire(spec.source, spec.list_url(1, spec.partition_values()[0]),
+                                                mode=fetch_mode, min_interval=spec.delay[0], keep_driver=False)
+            else:
+                session = create_http_session(user_agent=spec.user_agent)
+            return spec.post_process(carried, fetcher or session, budget)
+        except Exception as e:
+            print(f"⚠️ {spec.source} 중단된 실행 보강 실패, 조회수를 추정값으로 표시: {e}")
+            for record in carried:
+                record['views_estimated'] = True
+            return carried
+        finally:
+            if fetcher is not None:
+                fetcher.close()
+            if session is not None:
+                release_http_session(session)
+
+    def _run_child(self, target_date, start_page, end_page, budget, kwargs, last_page):
+        """자식 프로세스 1회 실행 → (결과, {페이지: 레코드}, 최종 레코드, 마지막 완료 페이지)"""
+        import queue as queue_module
+
+        cleanup_orphan_browsers()
+
+        # spawn: 부모의 세션/스레드/락을 물려받지 않는 깨끗한 프로세스
+        ctx = mp.get_context('spawn')
+        queue = ctx.Queue()
+        child_kwargs = dict(kwargs, start_page=start_page, end_page=end_page, budget=budget)
+        process = ctx.Process(
+            target=_supervised_worker,
+            args=(self.crawler, target_date, child_kwargs, queue),
+            daemon=True,
+        )
+        process.start()
+
+        pages = {}
+        outcome, records = None, None
+        last_beat = time.time()
+
+        try:
+            while outcome is None:
+                try:
+                    message = queue.get(timeout=2.0)
+                except queue_module.Empty:
+                    message = None
+
+                if message is not None:
+                    last_beat = time.time()
+                    kind = message[0]
+                    if kind == 'page':
+                        pages[message[1]] = message[2]
+                        last_page = max(last_page or 0, message[1])
+                    elif kind == 'done':
+                        outcome, records = 'done', message[1]
+                    elif kind == 'error':
+                        print(f"⚠️ {self.site_key} 자식 프로세스 오류: {message[1]}")
+                        outcome = 'error'
+                    elif kind == 'failed':
+                        print(f"❌ {self.site_key} 수집 실패: {message[1]}")
+                        outcome = 'failed'
+                    continue
+
+                # 큐가 비어 있을 때만 상태 점검
+                if not process.is_alive():
+                    print(f"⚠️ {self.site_key} 자식 프로세스 비정상 종료 (exit {process.exitcode})")
+                    outcome = 'crashed'
+                elif time.time() - last_beat > self.heartbeat_timeout:
+                    print(f"⚠️ {self.site_key} {self.heartbeat_timeout:.0f}초 동안 응답 없음 → 강제 종료")
+                    outcome = 'hung'
+                else:
+                    rss_mb = _tree_rss_mb(process.pid)
+                    if rss_mb > self.rss_limit_mb:
+                        print(f"⚠️ {self.site_key} 메모리 {rss_mb:.0f}MB > 한도 {self.rss_limit_mb:.0f}MB → 강제 종료")
+                        outcome = 'oom'
+        finally:
+            if process.is_alive():
+                if outcome == 'done':
+                    process.join(timeout=10)
+                if process.is_alive():
+                    _kill_tree(process.pid)
+            process.join(timeout=5)
+            cleanup_orphan_browsers()
+
+        return outcome, pages, records, last_page
+
+def calculate_hot_scores(data, hot_calc, crawl_date=None, highlights=None):
+    """화제성 점수 계산 (필터링 없이 전체, highlights가 있으면 점수를 매긴 사이트부터 상위 게시물 갱신)"""
+    print("\n🔥 화제성 점수 계산 중...")
+    
+    # 1️⃣ 먼저 모든 사이트의 최고값 수집 (수집 중 잠정 통계를 정확한 값으로 대체)
+    hot_calc.collect_stats(data, crawl_date=crawl_date)
+    
+    # 2️⃣ 각 사이트별로 화제성 점수 계산 (필터링 없음)
+    for site_name, df in data.items():
+        if len(df) > 0:
+            print(f"📊 {site_name} 화제성 점수 계산 중...")
+            df['hot_score'] = hot_calc.score_frame(df)
+
+            # 점수를 매긴 사이트부터 바로 상위 게시물 힙에 반영
+            if highlights is not None:
+                highlights.observe_frame(df)
+
+            # 전체 게시물 유지 (필터링 제거)
+            print(f"   전체: {len(df)}개 게시물")
+            if len(df) > 0:
+                print(f"   평균 화제성: {df['hot_score'].mean():.2f}")
+                print(f"   최고 화제성: {df['hot_score'].max():.2f}")
+                print(f"   최저 화제성: {df['hot_score'].min():.2f}")
+    
+    print("✅ 화제성 점수 계산 완료!")
+    return data
+
+class Highlights:
+    """점수가 매겨지는 대로 전체 상위 top_n개와 사이트별 상위 per_site개를 유지 (전체 정렬 없음)
+
+    크기가 K로 제한된 최소 힙을 전체/사이트별로 두고, 힙의 최솟값보다 높은 게시물만 넣는다.
+    게시물당 비용은 비교 한 번(+ 드물게 O(log K))이고 메모리는 K개뿐이라 아카이브 전체를
+    다시 점수 매길 때도 그대로 쓸 수 있다. 임계값 이상 건수와 사이트별 요약 통계도 함께 누적한다.
+    """
+
+    COLUMNS = ('title', 'url', 'source', 'views', 'views_estimated', 'comments', 'hot_score', 'date', 'board',
+               'crawl_date')
+
+    def __init__(self, top_n=None, per_site=None, threshold=HIGH_SCORE_THRESHOLD):
+        self.top_n = top_n if top_n is not None else int(os.environ.get('HIGHLIGHTS_TOP_N', 50))
+        self.per_site = per_site if per_site is not None else int(os.environ.get('HIGHLIGHTS_PER_SITE', 10))
+        self.threshold = threshold
+        self.overall = []
+        self.sites = {}
+        self.stats = {}
+        self.seq = 0
+
+    def _push(self, heap, size, item):
+        import heapq
+
+        if len(heap) < size:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+
+    def _floor(self, heap, size):
+        return heap[0][0] if size and len(heap) >= size else float('-inf')
+
+    def observe_frame(self, df):
+        """점수가 매겨진 DataFrame(사이트 하나 또는 여러 사이트)을 반영"""
+        import numpy as np
+        import pandas as pd
+
+        if len(df) == 0 or 'hot_score' not in df.columns:
+            return
+
+        scores = df['hot_score'].to_numpy(dtype=float)
+        # 사이트 문자열 비교 대신 정수 코드로 묶음
+        codes, site_names = pd.factorize(df['source'].astype(str))
+        site_rows = {source: np.flatnonzero(codes == code) for code, source in enumerate(site_names)}
+        columns = {c: df[c].to_numpy() for c in self.COLUMNS if c in df.columns}
+
+        # 요약 통계는 벡터 연산으로
+        for source, rows in site_rows.items():
+            site_scores = scores[rows]
+            stats = self.stats.setdefault(source, {'count': 0, 'score_sum': 0.0, 'max_score': float('-inf'),
+                                                   'high_score_count': 0})
+            stats['count'] += len(site_scores)
+            stats['score_sum'] += float(site_scores.sum())
+            stats['max_score'] = max(stats['max_score'], float(site_scores.max()))
+            stats['high_score_count'] += int((site_scores >= self.threshold).sum())
+
+        # 전체/사이트별 상위 후보만 argpartition으로 골라 힙에 넣음 (나머지 행은 레코드를 만들지 않음)
+        candidates = [self._candidates(scores, np.arange(len(scores)), self.top_n,
+                                       self._floor(self.overall, self.top_n))]
+        for source, rows in site_rows.items():
+            candidates.append(self._candidates(scores, rows, self.per_site,
+                                               self._floor(self.sites.get(source, []), self.per_site)))
+
+        # 원래 순서대로 넣어 점수가 같으면 먼저 들어온 게시물 유지
+        for i in np.unique(np.concatenate(candidates)):
+            self.seq += 1
+            record = {c: (v[i].item() if hasattr(v[i], 'item') else v[i]) for c, v in columns.items()}
+            item = (float(scores[i]), -self.seq, record)
+            self._push(self.overall, self.top_n, item)
+            self._push(self.sites.setdefault(site_names[codes[i]], []), self.per_site, item)
+
+    @staticmethod
+    def _candidates(scores, index, size, floor):
+        """index 중 점수 상위 size개 (동점은 모두 포함) 가운데 floor보다 높은 행"""
+        import numpy as np
+
+        if size <= 0 or len(index) == 0:
+            return np.array([], dtype=int)
+        subset = scores[index]
+        if len(index) > size:
+            cutoff = np.partition(subset, len(subset) - size)[len(subset) - size]
+            index, subset = index[subset >= cutoff], subset[subset >= cutoff]
+        return index[subset > floor]
+
+    @staticmethod
+    def _ranked(heap):
+        return [record for _, _, record in sorted(heap, key=lambda item: item[:2], reverse=True)]
+
+    def top(self):
+        return self._ranked(self.overall)
+
+    def top_by_site(self):
+        return {source: self._ranked(heap) for source, heap in sorted(self.sites.items())}
+
+    def summary(self):
+        """전체/사이트별 건수, 평균/최고 점수, 임계값 이상 건수"""
+        by_site = {
+            source: {
+                'count': s['count'],
+                'mean_score': round(s['score_sum'] / s['count'], 4) if s['count'] else None,
+                'max_score': s['max_score'],
+                'high_score_count': s['high_score_count'],
+            }
+            for source, s in sorted(self.stats.items())
+        }
+        count = sum(s['count'] for s in self.stats.values())
+        return {
+            'count': count,
+            'mean_score': round(sum(s['score_sum'] for s in self.stats.values()) / count, 4) if count else None,
+            'max_score': max((s['max_score'] for s in self.stats.values()), default=None),
+            'threshold': self.threshold,
+            'high_score_count': sum(s['high_score_count'] for s in self.stats.values()),
+            'by_site': by_site,
+        }
+
+    def to_dict(self, crawl_date=None):
+        return {
+            'crawl_date': _to_iso_date(crawl_date),
+            'generated_at': datetime.now(KST).isoformat(timespec='seconds'),
+            'summary': self.summary(),
+            'top': self.top(),
+            'top_by_site': self.top_by_site(),
+        }
+
+    def to_json(self, crawl_date=None):
+        return json.dumps(self.to_dict(crawl_date), ensure_ascii=False, indent=2)
+
+def normalize_title(title):
+    """중복 비교용 제목 정규화 (말머리/공백/특수문자 제거, 소문자화)"""
+    title = str(title).lower()
+    title = re.sub(r'^[\[\(][^\]\)]{1,6}[\]\)]\s*', '', title)
+    title = re.sub(r'\[\d+\]$', '', title)
+    return re.sub(r'[^0-9a-z가-힣ㄱ-ㅎ]', '', title)
+
+def title_shingles(title, k=2):
+    """정규화된 제목의 문자 k-gram 집합 (형태소 분석 없이 한국어에 사용)"""
+    text = normalize_title(title)
+    if len(text) < k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+class MinHashLSH:
+    """MinHash 시그니처 + 밴딩 LSH로 유사 제목 후보를 찾는 인덱스
+
+    num_perm = bands × rows 이며, 자카드 유사도 약 (1/bands)^(1/rows) 이상이
+    같은 버킷에 들어갈 확률이 높다 (기본 16×4 → 약 0.5).
+    """
+
+    PRIME = (1 << 31) - 1
+
+    def __init__(self, num_perm=64, bands=16, seed=42):
+        import numpy as np
+
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, self.PRIME, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, self.PRIME, size=num_perm).astype(np.uint64)
+
+    def signatures(self, shingle_sets, batch_size=4096):
+        """shingle 집합 목록 → (len, num_perm) 시그니처 행렬 (빈 집합은 최대값으로 채움)"""
+        import numpy as np
+
+        result = np.full((len(shingle_sets), self.num_perm), self.PRIME, dtype=np.uint64)
+
+        for start in range(0, len(shingle_sets), batch_size):
+            batch = shingle_sets[start:start + batch_size]
+            owners = [i for i, shingles in enumerate(batch) if shingles]
+            if not owners:
+                continue
+
+            hashes = []
+            offsets = []
+            for i in owners:
+                offsets.append(len(hashes))
+                hashes.extend(zlib.crc32(g.encode('utf-8')) for g in batch[i])
+
+            x = np.array(hashes, dtype=np.uint64) % np.uint64(self.PRIME)
+            permuted = (self.a[:, None] * x[None, :] + self.b[:, None]) % np.uint64(self.PRIME)
+            mins = np.minimum.reduceat(permuted, offsets, axis=1)
+            result[[start + i for i in owners]] = mins.T
+
+        return result
+
+    def buckets(self, signatures):
+        """밴드별로 시그니처 구간이 같은 행 번호 묶음 목록 (2개 이상인 버킷만)"""
+        import numpy as np
+
+        n = len(signatures)
+        banded = signatures.reshape(n, self.bands, self.rows)
+        key_dtype = np.dtype((np.void, banded.itemsize * self.rows))
+        buckets = []
+
+        for band in range(self.bands):
+            keys = np.ascontiguousarray(banded[:, band, :]).view(key_dtype).ravel()
+            _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            inverse = inverse.ravel()
+
+            shared = np.flatnonzero(counts[inverse] > 1)
+            if not len(shared):
+                continue
+
+            # 같은 키끼리 모이도록 정렬한 뒤 경계에서 자름
+            shared = shared[np.argsort(inverse[shared], kind='stable')]
+            boundaries = np.flatnonzero(np.diff(inverse[shared])) + 1
+            buckets.extend(group.tolist() for group in np.split(shared, boundaries))
+
+        return buckets
+
+def cluster_near_duplicates(df, threshold=0.5, k=2, num_perm=64, bands=16, min_shingles=3, full_check=64):
+    """사이트를 넘나드는 유사 제목 게시물을 MinHash/LSH로 묶어 클러스터 정보를 추가
+
+    추가 컬럼:
+    - cluster_id: 클러스터 번호 (cross_site_score 내림차순)
+    - cluster_size: 클러스터 게시물 수
+    - cluster_sites: 클러스터에 포함된 사이트 수
+    - cross_site_score: 사이트별 최고 hot_score의 합 (여러 사이트에서 뜬 이슈일수록 큼)
+
+    LSH 버킷 안에서는 같은 제목(shingle 집합)을 바로 묶고, 서로 다른 제목이 full_check개 이하면 모든 쌍을,
+    그보다 큰 버킷은 정렬된 순서로 각 제목을 버킷의 클러스터 대표들과 비교한다.
+    어느 쪽이든 입력 행 순서와 관계없이 같은 클러스터가 나온다.
+    """
+    from itertools import combinations
+    import numpy as np
+    import pandas as pd
+
+    df = df.reset_index(drop=True)
+    n = len(df)
+    if n == 0:
+        return df.assign(cluster_id=[], cluster_size=[], cluster_sites=[], cross_site_score=[])
+
+    shingle_sets = [title_shingles(t, k) for t in df['title'].fillna('')]
+    shingle_sets = [s if len(s) >= min_shingles else set() for s in shingle_sets]
+
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    checked = {}
+
+    def similar(i, j):
+        key = (i, j) if i < j else (j, i)
+        if key not in checked:
+            a, b = shingle_sets[i], shingle_sets[j]
+            checked[key] = len(a & b) / len(a | b) >= threshold
+        return checked[key]
+
+    # 같은 shingle 집합은 검증 없이 묶고 집합마다 대표 한 행만 LSH에 넣음
+    # (비교할 shingle이 없는 너무 짧은 제목은 단독 클러스터)
+    distinct = {}
+    for i, shingles in enumerate(shingle_sets):
+        if not shingles:
+            continue
+        key = frozenset(shingles)
+        if key in distinct:
+            union(distinct[key], i)
+        else:
+            distinct[key] = i
+    valid_rows = np.array(list(distinct.values()), dtype=np.int64)
+    # 행 순서가 아니라 제목 내용으로 비교 순서를 정함
+    content_rank = {i: rank for rank, i in enumerate(sorted(distinct.values(), key=lambda i: sorted(shingle_sets[i])))}
+
+    lsh = MinHashLSH(num_perm=num_perm, bands=bands)
+    signatures = lsh.signatures([shingle_sets[i] for i in valid_rows])
+
+    for bucket in lsh.buckets(signatures):
+        reps = sorted(valid_rows[bucket].tolist(), key=content_rank.__getitem__)
+
+        if len(reps) <= full_check:
+            for i, j in combinations(reps, 2):
+                if find(i) != find(j) and similar(i, j):
+                    union(i, j)
+            continue
+
+        # 큰 버킷: 각 제목을 지금까지의 클러스터 대표들과 비교 (닮은 대표가 여럿이면 모두 묶음)
+        heads = []
+        for i in reps:
+            matched = [h for h in heads if similar(i, h)]
+            for h in matched:
+                union(i, h)
+            if not matched:
+                heads.append(i)
+
+    roots = [find(i) for i in range(n)]
+    scores = df['hot_score'] if 'hot_score' in df.columns else pd.Series(0.0, index=df.index)
+
+    grouped = pd.DataFrame({'root': roots, 'source': df['source'], 'hot_score': scores})
+    per_site_best = grouped.groupby(['root', 'source'], observed=True)['hot_score'].max()
+    cluster_score = per_site_best.groupby(level='root').sum()
+    cluster_sites = per_site_best.groupby(level='root').size()
+    cluster_size = grouped.groupby('root').size()
+
+    order = cluster_score.sort_values(ascending=False, kind='stable').index
+    cluster_ids = pd.Series(range(len(order)), index=order)
+
+    root_series = pd.Series(roots)
+    result = df.copy()
+    result['cluster_id'] = root_series.map(cluster_ids).to_numpy()
+    result['cluster_size'] = root_series.map(cluster_size).to_numpy()
+    result['cluster_sites'] = root_series.map(cluster_sites).to_numpy()
+    result['cross_site_score'] = root_series.map(cluster_score).round(2).to_numpy()
+
+    multi = (cluster_size > 1).sum()
+    cross = (cluster_sites > 1).sum()
+    print(f"🔗 유사 게시물 클러스터: {multi}개 (여러 사이트 {cross}개), 전체 {n}건")
+    return result
+
+def _encode_postings(doc_ids):
+    """정렬된 문서 번호 목록 → 델타 + varint 바이트열"""
+    out = bytearray()
+    previous = 0
+    for doc_id in doc_ids:
+        value = doc_id - previous
+        previous = doc_id
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+def _decode_postings(data):
+    doc_ids = []
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        doc_ids.append(previous)
+        value = shift = 0
+    return doc_ids
+
+class TitleIndex:
+    """게시글 제목 문자 n-gram 역색인 (형태소 분석기 없이 한국어 검색)
+
+    실행(날짜)마다 세그먼트 파일을 하나씩 추가하고, merge_segments()로 여러 세그먼트를
+    하나로 합친다. 포스팅 리스트는 델타 + varint로 압축해 저장한다.
+    같은 날짜가 여러 세그먼트에 있으면 가장 나중에 쓴 세그먼트의 것만 사용한다.
+    """
+
+    def __init__(self, index_dir=None, k=2):
+        self.index_dir = index_dir or os.environ.get('TITLE_INDEX_DIR', 'data/title_index')
+        self.k = k
+        self._cache = {}
+        os.makedirs(self.index_dir, exist_ok=True)
+
+    def add_segment(self, df, crawl_date):
+        """한 번의 실행 결과를 날짜 세그먼트로 색인"""
+        crawl_date = _to_iso_date(crawl_date)
+        docs = {
+            'title': df['title'].fillna('').astype(str).tolist(),
+            'url': df['url'].fillna('').astype(str).tolist(),
+            'source': df['source'].astype(str).tolist(),
+            'hot_score': [float(v) for v in df['hot_score'].fillna(0)] if 'hot_score' in df.columns else [0.0] * len(df),
+            'crawl_date': [crawl_date] * len(df),
+        }
+        name = f"day-{crawl_date}.seg"
+        self._write_segment(name, docs)
+        print(f"🔎 제목 색인: {crawl_date} {len(df)}건 → {name}")
+        return name
+
+    def merge_segments(self, names=None):
+        """세그먼트들을 하나로 병합 (기본: 전체). 병합 후 원본 세그먼트는 삭제"""
+        segments = self._load_all()
+        names = sorted(names or segments)
+        if len(names) < 2:
+            return None
+
+        owners = self._day_owners(segments)
+        merged = {'title': [], 'url': [], 'source': [], 'hot_score': [], 'crawl_date': []}
+        for name in names:
+            docs = segments[name]['docs']
+            for i, day in enumerate(docs['crawl_date']):
+                if owners.get(day) != name:
+                    continue  # 더 최신 세그먼트에 덮어쓰인 날짜
+                for column in merged:
+                    merged[column].append(docs[column][i])
+
+        days = sorted(set(merged['crawl_date']))
+        merged_name = f"merged-{days[0]}_{days[-1]}.seg" if days else "merged-empty.seg"
+        self._write_segment(merged_name, merged)
+
+        for name in names:
+            if name != merged_name:
+                os.remove(os.path.join(self.index_dir, name))
+                self._cache.pop(name, None)
+
+        print(f"🧩 세그먼트 {len(names)}개 병합 → {merged_name} ({len(merged['title'])}건)")
+        return merged_name
+
+    def search(self, query, start=None, end=None, days=None, top_n=20, min_match=0.6, score_weight=0.3):
+        """n-gram 일치도와 hot_score를 함께 반영한 제목 검색
+
+        match = 일치한 n-gram의 IDF 합 / 질의 n-gram의 IDF 합 (0~1)
+        score = (1 - score_weight) × match + score_weight × hot_score / 11
+        """
+        import pandas as pd
+
+        grams = sorted(title_shingles(query, self.k))
+        if not grams:
+            return pd.DataFrame(columns=['crawl_date', 'source', 'title', 'url', 'hot_score', 'match', 'score'])
+
+        if days:
+            end = end or datetime.now(KST).date()
+            start = _to_iso_date(datetime.strptime(_to_iso_date(end), '%Y-%m-%d') - timedelta(days=days))
+        start = _to_iso_date(start) if start else None
+        end = _to_iso_date(end) if end else None
+
+        segments = self._load_all()
+        owners = self._day_owners(segments)
+
+        # 전체 세그먼트 기준 문서 빈도 → IDF
+        total_docs = sum(len(seg['docs']['title']) for seg in segments.values()) or 1
+        doc_freq = {g: sum(seg['counts'].get(g, 0) for seg in segments.values()) for g in grams}
+        idf = {g: math.log(1 + total_docs / (1 + doc_freq[g])) for g in grams}
+        idf_total = sum(idf.values())
+
+        hits = []
+        for name, seg in segments.items():
+            if (start and seg['end'] < start) or (end and seg['start'] > end):
+                continue
+
+            matched = {}
+            for g in grams:
+                data = seg['postings'].get(g)
+                if data:
+                    for doc_id in _decode_postings(data):
+                        matched[doc_id] = matched.get(doc_id, 0.0) + idf[g]
+
+            docs = seg['docs']
+            for doc_id, weight in matched.items():
+                match = weight / idf_total
+                day = docs['crawl_date'][doc_id]
+                if match < min_match or owners.get(day) != name:
+                    continue
+                if (start and day < start) or (end and day > end):
+                    continue
+                hot_score = docs['hot_score'][doc_id]
+                hits.append({
+                    'crawl_date': day,
+                    'source': docs['source'][doc_id],
+                    'title': docs['title'][doc_id],
+                    'url': docs['url'][doc_id],
+                    'hot_score': hot_score,
+                    'match': round(match, 3),
+                    'score': round((1 - score_weight) * match + score_weight * hot_score / 11, 4),
+                })
+
+        hits.sort(key=lambda h: h['score'], reverse=True)
+        return pd.DataFrame(hits[:top_n], columns=['crawl_date', 'source', 'title', 'url', 'hot_score', 'match', 'score'])
+
+    def _write_segment(self, name, docs):
+        postings = {}
+        for doc_id, title in enumerate(docs['title']):
+            for gram in title_shingles(title, self.k):
+                postings.setdefault(gram, []).append(doc_id)
+
+        days = sorted(set(docs['crawl_date']))
+        segment = {
+            'k': self.k,
+            'created': time.time(),
+            'start': days[0] if days else '',
+            'end': days[-1] if days else '',
+            'days': days,
+            'docs': docs,
+            'counts': {g: len(ids) for g, ids in postings.items()},
+            'postings': {g: _encode_postings(ids) for g, ids in postings.items()},
+        }
+
+        path = os.path.join(self.index_dir, name)
+        with open(f"{path}.tmp", 'wb') as f:
+            pickle.dump(segment, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+        self._cache.pop(name, None)
+
+    def _load_all(self):
+        segments = {}
+        for name in sorted(os.listdir(self.index_dir)):
+            if not name.endswith('.seg'):
+                continue
+            path = os.path.join(self.index_dir, name)
+            mtime = os.path.getmtime(path)
+            cached = self._cache.get(name)
+            if not cached or cached[0] != mtime:
+                with open(path, 'rb') as f:
+                    cached = (mtime, pickle.load(f))
+                self._cache[name] = cached
+            segments[name] = cached[1]
+        return segments
+
+    @staticmethod
+    def _day_owners(segments):
+        """날짜별로 가장 최근에 쓴 세그먼트 이름"""
+        owners = {}
+        for name, seg in sorted(segments.items(), key=lambda item: item[1]['created']):
+            for day in seg['days']:
+                owners[day] = name
+        return owners
+
+# 아카이브 컬럼 정의 (컬럼명 → SQLite 타입)
+ARCHIVE_COLUMNS = {
+    'title': 'TEXT NOT NULL',
+    'url': 'TEXT NOT NULL',
+    'views': 'INTEGER',
+    'comments': 'INTEGER',
+    'hot_score': 'REAL',
+    'date': 'TEXT',
+    'board': 'TEXT',
+    'views_estimated': 'INTEGER',
+}
+
+def _to_iso_date(value):
+    """date/datetime/'YYYYMMDD'/'YYYY-MM-DD'를 'YYYY-MM-DD' 문자열로 변환"""
+    if value is None:
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    digits = re.sub(r'[^\d]', '', str(value))
+    if len(digits) != 8:
+        raise ValueError(f"날짜 형식 오류: {value}")
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+
+class CrawlArchive:
+    """일별 크롤링 결과를 누적하는 로컬 SQLite 아카이브
+
+    (crawl_date, source) 순으로 클러스터링된 테이블이라 날짜/사이트 단위로
+    파티션처럼 저장되고, hot_score 인덱스로 기간/사이트별 상위 N개를 바로 조회한다.
+    같은 날짜·사이트를 다시 넣으면 해당 파티션을 교체한다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('ARCHIVE_PATH', 'data/archive.sqlite')
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        columns = ',\n'.join(f"{name} {sql_type}" for name, sql_type in ARCHIVE_COLUMNS.items())
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS posts (
+                crawl_date TEXT NOT NULL,
+                source TEXT NOT NULL,
+                {columns},
+                PRIMARY KEY (crawl_date, source, url)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_posts_date_score ON posts (crawl_date, hot_score DESC);
+            CREATE INDEX IF NOT EXISTS idx_posts_site_date_score ON posts (source, crawl_date, hot_score DESC);
+            CREATE INDEX IF NOT EXISTS idx_posts_score ON posts (hot_score DESC);
+        """)
+
+        # 나중에 추가된 컬럼은 기존 DB에 ALTER로 보충
+        existing = {row['name'] for row in self.conn.execute("PRAGMA table_info(posts)")}
+        for name, sql_type in ARCHIVE_COLUMNS.items():
+            if name not in existing:
+                self.conn.execute(f"ALTER TABLE posts ADD COLUMN {name} {sql_type.replace(' NOT NULL', '')}")
+        self.conn.commit()
+
+    def append(self, df, crawl_date):
+        """한 번의 실행 결과(final_df)를 crawl_date 파티션에 저장하고 저장 건수를 반환"""
+        if df is None or len(df) == 0:
+            return 0
+
+        crawl_date = _to_iso_date(crawl_date)
+        columns = [name for name in ARCHIVE_COLUMNS if name in df.columns]
+        rows = df[['source'] + columns].itertuples(index=False, name=None)
+        placeholders = ', '.join('?' * (len(columns) + 2))
+
+        with self.conn:
+            for source in df['source'].unique():
+                self.conn.execute(
+                    "DELETE FROM posts WHERE crawl_date = ? AND source = ?",
+                    (crawl_date, source)
+                )
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO posts (crawl_date, source, {', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                ((crawl_date,) + tuple(_to_sql_value(v) for v in row) for row in rows)
+            )
+
+        print(f"🗄️ 아카이브 저장: {crawl_date} {len(df)}건 → {self.path}")
+        return len(df)
+
+    def top_posts(self, n=10, start=None, end=None, site=None, title=None):
+        """hot_score 기준 상위 N개 조회 (기간/사이트/제목 부분일치 필터)"""
+        import pandas as pd
+
+        conditions = []
+        params = []
+
+        if site:
+            conditions.append("source = ?")
+            params.append(site)
+        if start:
+            conditions.append("crawl_date >= ?")
+            params.append(_to_iso_date(start))
+        if end:
+            conditions.append("crawl_date <= ?")
+            params.append(_to_iso_date(end))
+        if title:
+            conditions.append("title LIKE ? ESCAPE '\\'")
+            escaped = title.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        query = f"""
+            SELECT crawl_date, source, {', '.join(ARCHIVE_COLUMNS)}
+            FROM posts {where}
+            ORDER BY hot_score DESC
+            LIMIT ?
+        """
+        rows = self.conn.execute(query, params + [int(n)]).fetchall()
+        return pd.DataFrame([dict(row) for row in rows],
+                            columns=['crawl_date', 'source'] + list(ARCHIVE_COLUMNS))
+
+    def highlights(self, top_n=50, per_site=10, start=None, end=None, rescore=False):
+        """아카이브 기간 전체의 상위 게시물을 날짜 단위로 읽으며 Highlights로 집계 (메모리는 하루치 + K개)
+
+        rescore=True면 저장된 hot_score 대신 날짜별로 다시 계산한 점수를 사용한다 (당일 최고값 기준).
+        """
+        import pandas as pd
+
+        conditions, params = [], []
+        if start:
+            conditions.append("crawl_date >= ?")
+            params.append(_to_iso_date(start))
+        if end:
+            conditions.append("crawl_date <= ?")
+            params.append(_to_iso_date(end))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        highlights = Highlights(top_n, per_site)
+        days = [row[0] for row in self.conn.execute(
+            f"SELECT DISTINCT crawl_date FROM posts {where} ORDER BY crawl_date", params
+        )]
+        for day in days:
+            day_df = pd.read_sql(
+                f"SELECT crawl_date, source, {', '.join(ARCHIVE_COLUMNS)} FROM posts WHERE crawl_date = ?",
+                self.conn, params=(day,)
+            )
+            if rescore:
+                data = {source: group.copy() for source, group in day_df.groupby('source')}
+                calculate_hot_scores(data, HotScoreCalculator(), crawl_date=day, highlights=highlights)
+            else:
+                highlights.observe_frame(day_df)
+        return highlights
+
+    def partitions(self):
+        """저장된 (날짜, 사이트)별 게시글 수"""
+        rows = self.conn.execute("""
+            SELECT crawl_date, source, COUNT(*) AS count
+            FROM posts GROUP BY crawl_date, source
+            ORDER BY crawl_date, source
+        """).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+def _to_sql_value(value):
+    """numpy 스칼라/NaN을 sqlite3가 받을 수 있는 값으로 변환"""
+    import pandas as pd
+
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+# 사이트별 본문 영역 선택자 (앞에서부터 먼저 찾은 것 사용)
+BODY_SELECTORS = {
+    '디시인사이드': ['div.write_div', 'div.writing_view_box'],
+    'FM코리아': ['div.rd_body article div.xe_content', 'article div.xe_content'],
+    '더쿠': ['div.rd_body article div.xe_content', 'article div.xe_content', 'div.xe_content'],
+    '인스티즈': ['div#memo_content_1', 'div.memo_content'],
+}
+
+def extract_post_body(source, soup):
+    """상세 페이지에서 본문 텍스트 추출 (선택자가 없으면 가장 긴 article/본문 블록)"""
+    for selector in BODY_SELECTORS.get(source, []):
+        elem = soup.select_one(selector)
+        if elem is not None:
+            return elem.get_text("\n", strip=True)
+
+    candidates = soup.select('article, div[class*=content], div[class*=body]')
+    if not candidates:
+        return ''
+    return max((c.get_text("\n", strip=True) for c in candidates), key=len)
+
+class BodyStore:
+    """게시물 본문을 게시물 ID 기준으로 압축 저장하는 SQLite 저장소
+
+    짧은 한국어 본문은 파일마다 gzip으로 압축하면 헤더와 빈 사전 때문에 거의 줄지 않는다.
+    사이트별로 본문 표본에서 학습한 사전(zstd)을 두고 모든 본문을 그 사전으로 압축한다.
+    zstandard가 설치되어 있지 않으면 표본을 이어 붙인 zlib 사전(zdict)으로 대신한다.
+
+    - dictionaries: (source, dict_id) → 코덱, 사전 데이터
+    - bodies: (source, post_id) → 수집 날짜, 사전 ID, 원문 크기, 압축 본문
+    이미 저장된 post_id는 다음 실행에서 상세 페이지를 다시 받지 않는다.
+    """
+
+    def __init__(self, path=None, dict_size=16 * 1024, min_samples=32):
+        self.path = path or os.path.join(os.environ.get('BODY_STORE_DIR', 'data/bodies'), 'bodies.sqlite')
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.dict_size = dict_size
+        self.min_samples = min_samples
+        self.codecs = {}
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS dictionaries (
+                source TEXT NOT NULL,
+                dict_id INTEGER NOT NULL,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (source, dict_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS bodies (
+                source TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                crawl_date TEXT,
+                dict_id INTEGER NOT NULL,
+                raw_size INTEGER NOT NULL,
+                body BLOB NOT NULL,
+                PRIMARY KEY (source, post_id)
+            ) WITHOUT ROWID;
+        """)
+
+    @staticmethod
+    def default_codec():
+        import importlib.util
+
+        return 'zstd' if importlib.util.find_spec('zstandard') else 'zlib'
+
+    def known_ids(self, source):
+        """이미 본문이 저장된 게시물 ID 집합 (실행 간 중복 수집 방지)"""
+        return {row[0] for row in self.conn.execute("SELECT post_id FROM bodies WHERE source = ?", (source,))}
+
+    def _latest_dictionary(self, source):
+        return self.conn.execute(
+            "SELECT dict_id, codec, data FROM dictionaries WHERE source = ? ORDER BY dict_id DESC LIMIT 1",
+            (source,)
+        ).fetchone()
+
+    def train_dictionary(self, source, samples):
+        """본문 표본으로 사이트 사전을 새로 만들고 dict_id 반환 (표본이 부족하면 None)"""
+        samples = [text.encode('utf-8') for text in samples if text]
+        if len(samples) < self.min_samples:
+            return None
+
+        codec = self.default_codec()
+        if codec == 'zstd':
+            import zstandard
+
+            data = zstandard.train_dictionary(self.dict_size, samples).as_bytes()
+        else:
+            # zlib 사전은 창(32KB) 앞부분을 채우는 용도이므로 표본 끝부분을 이어 붙임
+            data = b'\n'.join(samples)[-min(self.dict_size, 32 * 1024):]
+
+        latest = self._latest_dictionary(source)
+        dict_id = (latest[0] if latest else 0) + 1
+        with self.conn:
+            self.conn.execute("INSERT INTO dictionaries VALUES (?, ?, ?, ?)", (source, dict_id, codec, data))
+        print(f"📚 {source} 본문 사전 학습: {codec}, 표본 {len(samples)}개, {len(data) / 1024:.1f}KB (dict {dict_id})")
+        return dict_id
+
+    def _codec(self, source, dict_id):
+        """(compress, decompress) 함수 쌍 (dict_id 0은 사전 없음)"""
+        key = (source, dict_id)
+        if key in self.codecs:
+            return self.codecs[key]
+
+        if dict_id == 0:
+            codec, data = self.default_codec(), None
+        else:
+            codec, data = self.conn.execute(
+                "SELECT codec, data FROM dictionaries WHERE source = ? AND dict_id = ?", (source, dict_id)
+            ).fetchone()
+
+        if codec == 'zstd':
+            import zstandard
+
+            zdict = zstandard.ZstdCompressionDict(data) if data else None
+            compressor = zstandard.ZstdCompressor(level=19, dict_data=zdict)
+            decompressor = zstandard.ZstdDecompressor(dict_data=zdict)
+            pair = (compressor.compress, decompressor.decompress)
         else:
-            consecutive_empty_pages += 1
-            
-            if consecutive_empty_pages >= 3:
-                break
-                
-            target_page += 1
-    
-    df = pd.DataFrame(results)
-    print(f"\n더쿠 크롤링 완료 총 {len(df)}개 수집")
-    return df
+            def compress(raw):
+                c = zlib.compressobj(9, zdict=data) if data else zlib.compressobj(9)
+                return c.compress(raw) + c.flush()
+
+            def decompress(blob):
+                d = zlib.decompressobj(zdict=data) if data else zlib.decompressobj()
+                return d.decompress(blob) + d.flush()
+
+            pair = (compress, decompress)
+
+        self.codecs[key] = pair
+        return pair
+
+    def put_many(self, source, items):
+        """[(post_id, crawl_date, text)] 저장. 사이트 사전이 없으면 이번 본문으로 먼저 학습"""
+        items = [(post_id, crawl_date, text) for post_id, crawl_date, text in items if text]
+        if not items:
+            return {'count': 0, 'raw_bytes': 0, 'stored_bytes': 0, 'gzip_bytes': 0}
+
+        latest = self._latest_dictionary(source)
+        dict_id = latest[0] if latest else self.train_dictionary(source, [text for _, _, text in items])
+        dict_id = dict_id or 0
+        compress, _ = self._codec(source, dict_id)
+
+        rows = []
+        raw_bytes = stored_bytes = gzip_bytes = 0
+        for post_id, crawl_date, text in items:
+            raw = text.encode('utf-8')
+            blob = compress(raw)
+            rows.append((source, post_id, str(crawl_date), dict_id, len(raw), blob))
+            raw_bytes += len(raw)
+            stored_bytes += len(blob)
+            # 비교용: 게시물마다 gzip으로 따로 압축했을 때 크기
+            gzip_bytes += len(zlib.compress(raw, 9)) + 18
+
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO bodies VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return {'count': len(rows), 'raw_bytes': raw_bytes, 'stored_bytes': stored_bytes, 'gzip_bytes': gzip_bytes}
+
+    def get(self, source, post_id):
+        row = self.conn.execute(
+            "SELECT dict_id, body FROM bodies WHERE source = ? AND post_id = ?", (source, post_id)
+        ).fetchone()
+        if row is None:
+            return None
+        _, decompress = self._codec(source, row[0])
+        return decompress(row[1]).decode('utf-8')
+
+    def stats(self):
+        """사이트별 저장 건수/원문 크기/저장 크기"""
+        return {
+            source: {'count': count, 'raw_bytes': raw, 'stored_bytes': stored}
+            for source, count, raw, stored in self.conn.execute(
+                "SELECT source, COUNT(*), SUM(raw_size), SUM(LENGTH(body)) FROM bodies GROUP BY source"
+            )
+        }
+
+    def close(self):
+        self.conn.close()
+
+def fetch_post_bodies(df, crawl_date, store=None, max_workers=None, max_posts=None):
+    """수집된 게시물의 상세 페이지에서 본문을 받아 BodyStore에 저장
+
+    - 화제성 점수 상위 max_posts개(BODY_MAX_POSTS, 기본 300)만 대상으로 한다.
+    - 이미 저장된 게시물 ID는 건너뛴다.
+    - max_workers개(BODY_WORKERS, 기본 4) 스레드가 동시에 받되, 호스트마다 요청 간격을 제한한다.
+    - 챌린지 페이지는 브라우저로 폴백하지 않고 실패로 센다.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import urlparse
+    from bs4 import BeautifulSoup
+
+    own_store = store is None
+    store = store or BodyStore()
+    max_workers = max_workers or int(os.environ.get('BODY_WORKERS', 4))
+    max_posts = max_posts or int(os.environ.get('BODY_MAX_POSTS', 300))
+
+    if 'hot_score' in df.columns:
+        df = df.sort_values('hot_score', ascending=False)
+
+    known = {}
+    targets = []
+    skipped = 0
+    for source, url in zip(df['source'].astype(str), df['url'].astype(str)):
+        if source not in known:
+            known[source] = store.known_ids(source)
+        post_id = post_id_from_url(url)
+        if post_id in known[source]:
+            skipped += 1
+            continue
+        known[source].add(post_id)
+        targets.append((source, post_id, url))
+        if len(targets) >= max_posts:
+            break
+
+    session = create_http_session(pool_size=max_workers, pool_key='bodies')
+    retry = RetryPolicy()
+    limiters = {}
+    for _, _, url in targets:
+        host = urlparse(url).netloc
+        if host not in limiters:
+            limiters[host] = RateLimiter(0.3, 0.6)
+
+    def fetch(target):
+        source, post_id, url = target
+
+        def attempt():
+            limiters[urlparse(url).netloc].wait()
+            return retry.check_response(session.get(url, timeout=30))
 
-def crawl_instiz_requests(target_date):
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
-    
-    results = []
-    today_str = datetime.today().strftime('%m.%d')
-    
-    for page in range(1, 31):  # 30페이지까지
         try:
-            url = f"https://www.instiz.net/pt?page={page}&srt=3&srd=4"
-            response = session.get(url, timeout=120)
-            
-            if response.status_code != 200:
-                print(f"{page}페이지 요청 실패: {response.status_code}")
+            response = retry.call(attempt, f"{source} 본문 {post_id}")
+        except Exception:
+            return source, post_id, None
+        if is_challenge_page(response.status_code, response.text):
+            return source, post_id, None
+        return source, post_id, extract_post_body(source, BeautifulSoup(response.content, 'html.parser'))
+
+    bodies = {}
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for source, post_id, text in executor.map(fetch, targets):
+            if text:
+                bodies.setdefault(source, []).append((post_id, crawl_date, text))
+            else:
+                failed += 1
+    release_http_session(session)
+
+    totals = {'count': 0, 'raw_bytes': 0, 'stored_bytes': 0, 'gzip_bytes': 0}
+    for source, items in bodies.items():
+        result = store.put_many(source, items)
+        for key in totals:
+            totals[key] += result[key]
+
+    if totals['count']:
+        print(f"📝 본문 저장 {totals['count']}건 (기존 {skipped}건 건너뜀, 실패 {failed}건): "
+              f"원문 {totals['raw_bytes'] / 1024:.1f}KB → {totals['stored_bytes'] / 1024:.1f}KB "
+              f"(게시물별 gzip이면 {totals['gzip_bytes'] / 1024:.1f}KB)")
+    else:
+        print(f"📝 새로 저장한 본문 없음 (기존 {skipped}건 건너뜀, 실패 {failed}건)")
+
+    if own_store:
+        store.close()
+    return dict(totals, skipped=skipped, failed=failed)
+
+class VelocityPoller:
+    """사이트별 목록 앞쪽 K페이지만 주기적으로 다시 읽어 조회수/댓글수 증가 속도를 기록
+
+    한 번의 폴링은 사이트당 목록 K페이지 요청뿐이다 (상세 페이지 없음, 세션/쿠키 재사용).
+    직전 스냅샷과 게시물 ID로 비교해 값이 바뀐 게시물만 (증가량, 경과 분) 행으로 저장한다.
+
+    - latest: 게시물별 마지막 관측값
+    - deltas: (source, post_id, ts) → 조회수/댓글 증가량과 직전 변화 이후 경과 분
+
+    velocity()는 최근 window분 동안의 분당 증가율을 사이트별 최고값으로 정규화해
+    화제성 점수와 같은 0~11점 척도(velocity_score)로 돌려준다.
+    FM코리아는 목록에 조회수가 없어 댓글 증가량만 반영된다.
+    """
+
+    def __init__(self, sites=None, pages=2, db_path=None):
+        self.sites = list(sites or ('dcinside', 'instiz', 'fmkorea', 'theqoo'))
+        self.pages = pages
+        self.path = db_path or os.environ.get('VELOCITY_DB', 'data/velocity.sqlite')
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS latest (
+                source TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                title TEXT,
+                url TEXT,
+                first_seen INTEGER NOT NULL,
+                last_changed INTEGER NOT NULL,
+                views INTEGER,
+                comments INTEGER,
+                PRIMARY KEY (source, post_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS deltas (
+                source TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                d_views INTEGER NOT NULL,
+                d_comments INTEGER NOT NULL,
+                minutes REAL NOT NULL,
+                PRIMARY KEY (source, post_id, ts)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_deltas_ts ON deltas (ts);
+        """)
+
+        self.session = create_http_session(pool_size=4)
+        self.fetchers = {}
+
+    def _get_soup(self, key, url):
+        from bs4 import BeautifulSoup
+
+        spec = SITE_SPECS[key]
+        if spec.fetch == 'browser':
+            # 쿠키는 첫 폴링에서 한 번만 받아 두고 이후 폴링은 HTTP로만
+            if key not in self.fetchers:
+                self.fetchers[key] = HybridFetcher(spec.source, spec.list_url(1), keep_driver=False)
+            return self.fetchers[key].get_soup(url)
+
+        response = self.session.get(url, timeout=30)
+        if response.status_code != 200:
+            print(f"⚠️ {key} 목록 요청 실패: {response.status_code}")
+            return None
+        return BeautifulSoup(response.content, 'html.parser')
+
+    def fetch_site(self, key):
+        """사이트 목록 앞쪽 K페이지의 게시물 → [(source, post_id, title, url, views, comments)]"""
+        spec = SITE_SPECS[key]
+        posts = []
+        for page in range(1, self.pages + 1):
+            for partition in spec.partition_values():
+                soup = self._get_soup(key, spec.list_url(page, partition))
+                if soup is not None:
+                    posts += [(spec.source, p) for p in spec.parse(soup, partition, page)]
+
+            if page < self.pages:
+                polite_sleep(0.5, 1.0)
+
+        return [
+            (source, post_id_from_url(p['url']), p['title'], p['url'], p.get('views') or 0, p.get('comments') or 0)
+            for source, p in posts if p.get('url')
+        ]
+
+    def poll_once(self):
+        """모든 사이트를 한 번 폴링하고 {사이트: (새 게시물 수, 변화한 게시물 수)} 반환"""
+        now = int(time.time())
+        summary = {}
+
+        for key in self.sites:
+            try:
+                observed = self.fetch_site(key)
+            except Exception as e:
+                print(f"⚠️ {key} 폴링 실패: {e}")
                 continue
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            rows = soup.select('td.listsubject')
-            
-            page_results = []
-            target_date_found = False
-            
-            for row in rows:
-                try:
-                    if not any(cls.startswith('r') for cls in row.get('class', [])):
-                        continue
-
-                    title_link = row.select_one('a')
-                    if not title_link:
-                        continue
-
-                    # a 태그 안의 div.sbj에서 제목 추출
-                    title_raw = title_link.select_one('div.sbj')
-                    if not title_raw:
-                        continue
-
-                    # 날짜 먼저 확인
-                    info_elem = row.select_one('div.listno.regdate')
-                    if not info_elem:
-                        continue
-                        
-                    info_text = info_elem.get_text(" ", strip=True)
-                    if ':' in info_text and not re.search(r'\d{2}\.\d{2}', info_text):
-                        date = today_str
-                    else:
-                        date_match = re.search(r'\d{2}\.\d{2}', info_text)
-                        date = date_match.group() if date_match else today_str
-
-                    # 해당 날짜가 아니면 즉시 스킵
-                    if not is_today_post(date, target_date):
-                        continue
-
-                    target_date_found = True
-
-                    # URL은 이미 위에서 찾은 title_link에서 추출
-                    post_url = title_link.get('href', '')
-
-                    # 절대 경로 변환
-                    if post_url and not post_url.startswith('http'):
-                        if post_url.startswith('/'):
-                            post_url = f"https://www.instiz.net{post_url}"
-                        else:
-                            post_url = f"https://www.instiz.net/{post_url}"
-
-                    title_text = title_raw.get_text(" ", strip=True)
-                    comment_tag = title_raw.select_one('span.cmt2')
-                    comments = int(comment_tag.get_text(strip=True)) if comment_tag else 0
-                    title = re.sub(r'\s*\[\d+\]$', '', title_text.split('(', 1)[0].strip())
-
-                    views_match = re.search(r'조회\s([\d,]+)', info_text)
-                    views = int(views_match.group(1).replace(',', '')) if views_match else 0
-
-                    page_results.append({
-                        'title': title,
-                        'url': post_url,
-                        'source': '인스티즈',
-                        'views': views,
-                        'comments': comments,
-                        'date': date,
-                    })
-                    
-                except Exception:
+
+            # 여러 페이지에 걸쳐 같은 글이 보이면 마지막 관측값 하나만 사용
+            observed = {(source, post_id): row for source, post_id, *row in observed}
+            if not observed:
+                summary[key] = (0, 0)
+                continue
+
+            source = next(iter(observed))[0]
+            previous = {
+                row['post_id']: row
+                for row in self.conn.execute(
+                    "SELECT post_id, views, comments, last_changed FROM latest WHERE source = ?", (source,)
+                )
+            }
+
+            new_rows, delta_rows, changed_rows = [], [], []
+            for (source, post_id), (title, url, views, comments) in observed.items():
+                prev = previous.get(post_id)
+                if prev is None:
+                    new_rows.append((source, post_id, title, url, now, now, views, comments))
                     continue
-            
-            results.extend(page_results)
-            time.sleep(random.uniform(5.0, 10.0))  # 요청 간격
-                
+
+                d_views = views - (prev['views'] or 0)
+                d_comments = comments - (prev['comments'] or 0)
+                if d_views == 0 and d_comments == 0:
+                    continue
+
+                minutes = max((now - prev['last_changed']) / 60, 1e-3)
+                delta_rows.append((source, post_id, now, d_views, d_comments, minutes))
+                changed_rows.append((title, url, now, views, comments, source, post_id))
+
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO latest VALUES (?, ?, ?, ?, ?, ?, ?, ?)", new_rows)
+                self.conn.executemany("INSERT OR REPLACE INTO deltas VALUES (?, ?, ?, ?, ?, ?)", delta_rows)
+                self.conn.executemany(
+                    "UPDATE latest SET title = ?, url = ?, last_changed = ?, views = ?, comments = ? "
+                    "WHERE source = ? AND post_id = ?",
+                    changed_rows
+                )
+
+            summary[key] = (len(new_rows), len(delta_rows))
+            print(f"📡 {source}: {len(observed)}개 관측, 새 게시물 {len(new_rows)}개, 변화 {len(delta_rows)}개")
+
+        return summary
+
+    def velocity(self, window_minutes=60, top_n=20, now=None):
+        """최근 window분 동안 분당 증가율 기준 상위 게시물 (velocity_score 0~11점)"""
+        import pandas as pd
+
+        now = now or int(time.time())
+        df = pd.read_sql_query("""
+            SELECT d.source, d.post_id, l.title, l.url, l.views, l.comments, l.last_changed,
+                   SUM(d.d_views) AS d_views, SUM(d.d_comments) AS d_comments, SUM(d.minutes) AS minutes
+            FROM deltas d JOIN latest l ON l.source = d.source AND l.post_id = d.post_id
+            WHERE d.ts >= ?
+            GROUP BY d.source, d.post_id
+        """, self.conn, params=(now - window_minutes * 60,))
+
+        if df.empty:
+            return df.assign(views_per_min=[], comments_per_min=[], velocity_score=[])
+
+        # 마지막 변화 이후 조용했던 시간도 분모에 포함 (식은 글은 속도가 떨어짐)
+        elapsed = df['minutes'] + (now - df['last_changed']) / 60
+        df['views_per_min'] = (df['d_views'] / elapsed).clip(lower=0)
+        df['comments_per_min'] = (df['d_comments'] / elapsed).clip(lower=0)
+
+        max_rates = df.groupby('source')[['views_per_min', 'comments_per_min']].transform('max')
+        df['velocity_score'] = [
+            HotScoreCalculator._score(v, c, max(mv, 1e-9), max(mc, 1e-9))
+            for v, c, mv, mc in zip(df['views_per_min'], df['comments_per_min'],
+                                    max_rates['views_per_min'], max_rates['comments_per_min'])
+        ]
+
+        columns = ['source', 'title', 'url', 'views', 'comments',
+                   'views_per_min', 'comments_per_min', 'velocity_score']
+        return df.sort_values('velocity_score', ascending=False)[columns].head(top_n).reset_index(drop=True)
+
+    def run(self, interval_minutes=10, count=0, top_n=10):
+        """interval분마다 폴링 (count=0이면 무한 반복)"""
+        polls = 0
+        try:
+            while True:
+                started = time.time()
+                self.poll_once()
+                polls += 1
+
+                trending = self.velocity(window_minutes=max(interval_minutes * 6, 30), top_n=top_n)
+                for row in trending.itertuples():
+                    print(f"   🚀 {row.velocity_score:5.2f} [{row.source}] {row.title} "
+                          f"(댓글 +{row.comments_per_min:.2f}/분, 조회 +{row.views_per_min:.1f}/분)")
+
+                if count and polls >= count:
+                    break
+                time.sleep(max(interval_minutes * 60 - (time.time() - started), 0))
+        finally:
+            self.close()
+
+    def close(self):
+        for fetcher in self.fetchers.values():
+            fetcher.close()
+        self.session.close()
+        self.conn.close()
+
+# 사이트 키 → (사이트명, 크롤러). 실행 순서도 이 순서를 따른다
+SITE_CRAWLERS = {
+    'instiz': ('인스티즈', crawl_instiz_requests),
+    'fmkorea': ('FM코리아', SupervisedCrawler('fmkorea', crawl_fmkorea_selenium_simple)),
+    'dcinside': ('디시인사이드', crawl_dcinside_requests),
+    'theqoo': ('더쿠', SupervisedCrawler('theqoo', crawl_theqoo_selenium)),
+}
+
+def resolve_crawl_date(target_date=None):
+    """MMDD 문자열(없으면 KST 기준 어제)을 수집 대상 날짜(date)로 변환"""
+    today_kst = datetime.now(KST).date()
+    if not target_date:
+        return today_kst - timedelta(days=1)
+
+    crawl_date = datetime(today_kst.year, int(target_date[:2]), int(target_date[2:])).date()
+    # 1월 초에 12월 날짜를 지정한 경우 작년으로
+    if crawl_date > today_kst:
+        crawl_date = crawl_date.replace(year=today_kst.year - 1)
+    return crawl_date
+
+def create_hot_score_calculator():
+    return HotScoreCalculator(
+        normalization=os.environ.get('HOT_SCORE_NORMALIZATION', 'max'),
+        history_path=os.environ.get('HOT_SCORE_HISTORY', 'data/hot_score_history.json'),
+    )
+
+def crawl_sites(sites, target_date, hot_calc=None, start_page=None, end_page=None, budget=None, on_site=None):
+    """지정한 사이트들을 차례로 크롤링 → {사이트명: DataFrame}
+
+    budget이 있으면 사이트마다 마감 시간을 배정하고, 마감이 지나면 수집분만 반환한다.
+    on_site가 있으면 사이트 크롤링이 성공할 때마다 on_site(사이트 키, DataFrame)를 호출한다.
+    """
+    import pandas as pd
+
+    all_results = {}
+    for key in sites:
+        site_name, crawler = SITE_CRAWLERS[key]
+        logger.info(f"📊 {site_name} 크롤링...")
+        if budget:
+            budget.start_site(key)
+        try:
+            df = crawler(
+                target_date,
+                on_record=hot_calc.observe if hot_calc else None,
+                start_page=start_page,
+                end_page=end_page,
+                budget=budget,
+            )
+            all_results[site_name] = df
+            logger.info(f"✅ {site_name}: {len(df)}개")
+            if hot_calc:
+                hot_calc.report_provisional(site_name)
         except Exception as e:
-            print(f"인스티즈 {page}페이지 오류: {e}")
+            logger.error(f"❌ {site_name} 실패: {e}")
+            all_results[site_name] = pd.DataFrame()
+            continue
+
+        if on_site:
+            try:
+                on_site(key, df)
+            except Exception as e:
+                logger.error(f"❌ {site_name} 샤드 공개 실패: {e}")
+
+    return all_results
+
+def shard_stats(df):
+    """샤드 원본 통계 (점수 계산 전)"""
+    return {
+        'count': len(df),
+        'max_views': int(df['views'].max()) if len(df) and 'views' in df.columns else 0,
+        'max_comments': int(df['comments'].max()) if len(df) and 'comments' in df.columns else 0,
+        'total_views': int(df['views'].sum()) if len(df) and 'views' in df.columns else 0,
+        'total_comments': int(df['comments'].sum()) if len(df) and 'comments' in df.columns else 0,
+    }
+
+def write_shard(out_dir, site_key, df, crawl_date, start_page=None, end_page=None):
+    """사이트(+페이지 범위) 단위 중간 결과를 CSV + 통계 JSON으로 저장"""
+    os.makedirs(out_dir, exist_ok=True)
+    page_part = f"_p{start_page or 1}-{end_page or 'end'}" if (start_page or end_page) else ''
+    base = os.path.join(out_dir, f"shard_{site_key}_{crawl_date.strftime('%Y%m%d')}{page_part}")
+
+    df.to_csv(f"{base}.csv", index=False, encoding='utf-8-sig')
+
+    meta = {
+        'site': site_key,
+        'source': SITE_CRAWLERS[site_key][0],
+        'crawl_date': crawl_date.isoformat(),
+        'start_page': start_page,
+        'end_page': end_page,
+        'written_at': datetime.now(KST).isoformat(timespec='seconds'),
+        'stats': shard_stats(df),
+    }
+    with open(f"{base}.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    print(f"💾 샤드 저장: {base}.csv ({len(df)}건)")
+    return f"{base}.csv"
+
+def load_shards(in_dir):
+    """샤드 디렉터리를 읽어 ({사이트명: DataFrame}, 수집 날짜)로 합침"""
+    import pandas as pd
+
+    frames = {}
+    crawl_dates = set()
+    for name in sorted(os.listdir(in_dir)):
+        if not (name.startswith('shard_') and name.endswith('.json')):
+            continue
+        with open(os.path.join(in_dir, name), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        csv_path = os.path.join(in_dir, name[:-len('.json')] + '.csv')
+        try:
+            df = pd.read_csv(csv_path, encoding='utf-8-sig')
+        except pd.errors.EmptyDataError:
+            df = pd.DataFrame()
+
+        crawl_dates.add(meta['crawl_date'])
+        frames.setdefault(meta['source'], []).append(df)
+        print(f"📥 샤드 로드: {name} ({meta['stats']['count']}건)")
+
+    if len(crawl_dates) > 1:
+        raise ValueError(f"수집 날짜가 다른 샤드가 섞여 있습니다: {sorted(crawl_dates)}")
+    if not crawl_dates:
+        raise ValueError(f"샤드가 없습니다: {in_dir}")
+
+    all_results = {}
+    for source, dfs in frames.items():
+        dfs = [df for df in dfs if len(df) > 0]
+        if not dfs:
+            all_results[source] = pd.DataFrame()
             continue
+        # 페이지 샤드 경계에서 겹친 게시물 제거 (URL 쿼리가 달라도 같은 게시물 ID면 중복)
+        merged = apply_record_dtypes(pd.concat(dfs, ignore_index=True))
+        post_ids = merged['url'].astype(str).map(post_id_from_url)
+        all_results[source] = merged[~post_ids.duplicated()]
+
+    crawl_date = datetime.strptime(crawl_dates.pop(), '%Y-%m-%d').date()
+    return all_results, crawl_date
+
+def finalize_results(all_results, hot_calc, crawl_date):
+    """점수 계산 → 통합/클러스터링 → 색인/아카이브 → 릴리즈 업로드 → 요약"""
+    import pandas as pd
+
+    target_date = crawl_date.strftime("%m%d")
+    # OUTPUT_MODE=highlights면 전체 정렬/CSV 업로드 없이 상위 게시물 요약만 올림
+    output_mode = os.environ.get('OUTPUT_MODE', 'full')
+
+    # 화제성 점수 계산 (점수를 매기는 대로 상위 게시물 집계)
+    logger.info("🔥 화제성 점수 계산...")
+    highlights = Highlights()
+    calculate_hot_scores(all_results, hot_calc, crawl_date=crawl_date.isoformat(), highlights=highlights)
     
-    df = pd.DataFrame(results)
-    print(f"인스티즈 크롤링 완료 (총 {len(df)}건)")
-    return df
+    # 건수/사이트별 통계는 점수 계산 중 누적한 값 사용
+    summary = highlights.summary()
+    total_count = summary['count']
+    if not total_count:
+        logger.warning("⚠️ 크롤링된 데이터가 없습니다")
+        return {'success': False, 'error': 'No data crawled'}
+    site_stats = dict(sorted(((source, s['count']) for source, s in summary['by_site'].items() if s['count']),
+                             key=lambda item: item[1], reverse=True))
+    logger.info(f"📊 총 {total_count}개 게시글 수집")
 
-def calculate_hot_scores(data, hot_calc):
-    """화제성 점수 계산 (필터링 없이 전체)"""
-    print("\n🔥 화제성 점수 계산 중...")
+    # highlights 모드에서는 전체 행이 필요한 색인/아카이브/본문 저장이 설정된 경우에만 합침 (클러스터링 생략)
+    full_frame_sinks = ('TITLE_INDEX_DIR', 'ARCHIVE_PATH', 'BODY_STORE_DIR')
+    final_df = None
+    if output_mode != 'highlights' or any(os.environ.get(name) for name in full_frame_sinks):
+        final_df = pd.concat([df for df in all_results.values() if len(df) > 0], ignore_index=True)
+        # 상세 보강이 없는 사이트의 조회수는 모두 실측
+        final_df['views_estimated'] = (final_df['views_estimated'].eq(True) if 'views_estimated' in final_df.columns
+                                       else False)
+
+    if output_mode != 'highlights':
+        # 사이트 간 유사 게시물 클러스터링
+        try:
+            final_df = cluster_near_duplicates(final_df)
+        except Exception as e:
+            logger.error(f"❌ 유사 게시물 클러스터링 실패: {e}")
+        final_df = final_df.sort_values('hot_score', ascending=False)
+
+    # 제목 역색인 세그먼트 추가 (TITLE_INDEX_DIR 설정 시)
+    if os.environ.get('TITLE_INDEX_DIR'):
+        try:
+            TitleIndex().add_segment(final_df, crawl_date)
+        except Exception as e:
+            logger.error(f"❌ 제목 색인 실패: {e}")
+
+    # 로컬 아카이브 누적 (ARCHIVE_PATH 설정 시)
+    if os.environ.get('ARCHIVE_PATH'):
+        try:
+            archive = CrawlArchive()
+            archive.append(final_df, crawl_date)
+            archive.close()
+        except Exception as e:
+            logger.error(f"❌ 아카이브 저장 실패: {e}")
+
+    # 게시물 본문 수집 (BODY_STORE_DIR 설정 시)
+    if os.environ.get('BODY_STORE_DIR'):
+        try:
+            fetch_post_bodies(final_df, crawl_date)
+        except Exception as e:
+            logger.error(f"❌ 본문 수집 실패: {e}")
+            
+    # 파일명 생성
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+    filename = f"community_crawling_{target_date}_{timestamp}.csv"
+    highlights_filename = f"community_highlights_{target_date}_{timestamp}.json"
+
+    highlights_result = upload_highlights_to_release(highlights, highlights_filename, crawl_date)
+    if output_mode == 'highlights':
+        # 전체 CSV 없이 하이라이트가 이번 실행의 대표 결과물
+        filename, upload_result = highlights_filename, highlights_result
+    else:
+        upload_result = upload_to_github_release(final_df, filename)
     
-    # 1️⃣ 먼저 모든 사이트의 최고값 수집
-    hot_calc.collect_stats(data)
+    # 결과 요약
+    logger.info("🎉 크롤링 완료!")
+    logger.info(f"📁 파일명: {filename}")
+    logger.info(f"🏆 하이라이트: {highlights_filename}")
+    logger.info(f"📊 총 게시글: {total_count}개")
     
-    # 2️⃣ 각 사이트별로 화제성 점수 계산 (필터링 없음)
-    for site_name, df in data.items():
-        if len(df) > 0:
-            print(f"📊 {site_name} 화제성 점수 계산 중...")
-            df['hot_score'] = df.apply(
-                lambda row: hot_calc.calculate_hot_score(
-                    row.get('views', 0), 
-                    row.get('comments', 0), 
-                    row['source']
-                ), axis=1
-            )
-            
-            # 전체 게시물 유지 (필터링 제거)
-            print(f"   전체: {len(df)}개 게시물")
-            if len(df) > 0:
-                print(f"   평균 화제성: {df['hot_score'].mean():.2f}")
-                print(f"   최고 화제성: {df['hot_score'].max():.2f}")
-                print(f"   최저 화제성: {df['hot_score'].min():.2f}")
+    # 사이트별 통계
+    for site, count in site_stats.items():
+        logger.info(f"   - {site}: {count}개")
     
-    print("✅ 화제성 점수 계산 완료!")
-    return data
+    # 화제성 통계 (점수 계산 중 누적한 값)
+    logger.info(f"🔥 화제성 통계:")
+    logger.info(f"   - 평균 점수: {summary['mean_score']:.2f}")
+    logger.info(f"   - 최고 점수: {summary['max_score']:.2f}")
+    logger.info(f"   - 고화제성({HIGH_SCORE_THRESHOLD}+): {summary['high_score_count']}개")
+    
+    return {
+        'success': True,
+        'filename': filename,
+        'upload_result': upload_result,
+        'highlights_filename': highlights_filename,
+        'highlights_result': highlights_result,
+        'total_count': total_count,
+        'date': target_date,
+        'site_stats': site_stats
+    }
 
-def main_github_actions():
+def main_github_actions(sites=None, target_date=None):
     """GitHub Actions용 메인 함수"""
     try:
         logger.info("🚀 GitHub Actions 크롤링 시작")
         
         # 타겟 날짜 설정
-        today_kst = datetime.now(KST).date()
-        yesterday = today_kst - timedelta(days=1)
-        target_date = yesterday.strftime("%m%d")
+        crawl_date = resolve_crawl_date(target_date)
+        target_date = crawl_date.strftime("%m%d")
         logger.info(f"📅 타겟 날짜: {target_date}")
                 
         # 각 사이트별 크롤링 실행
-        all_results = {}
-        hot_calc = HotScoreCalculator()
+        sites = sites or list(SITE_CRAWLERS)
+        budget = CrawlBudget.from_env(sites)
+        hot_calc = create_hot_score_calculator()
 
-        logger.info("📊 인스티즈 크롤링...")
-        try:
-            instiz_df = crawl_instiz_requests(target_date)
-            all_results['인스티즈'] = instiz_df
-            logger.info(f"✅ 인스티즈: {len(instiz_df)}개")
-        except Exception as e:
-            logger.error(f"❌ 인스티즈 실패: {e}")
-            all_results['인스티즈'] = pd.DataFrame()
-        
-        logger.info("📊 FM코리아 크롤링...")
-        try:
-            fm_df = crawl_fmkorea_selenium_simple(target_date)
-            all_results['FM코리아'] = fm_df
-            logger.info(f"✅ FM코리아: {len(fm_df)}개")
-        except Exception as e:
-            logger.error(f"❌ FM코리아 실패: {e}")
-            all_results['FM코리아'] = pd.DataFrame()
+        on_site = None
+        if incremental_publishing():
+            # 사이트가 끝나는 대로 원본 샤드 공개, 점수 계산된 통합 CSV는 마지막에 업로드
+            shard_dir = os.environ.get('PUBLISH_SHARD_DIR', 'data/shards')
+            on_site = lambda key, df: publish_shard(write_shard(shard_dir, key, df, crawl_date))
+        all_results = crawl_sites(sites, target_date, hot_calc, budget=budget, on_site=on_site)
 
-        logger.info("📊 디시인사이드 크롤링...")
-        try:
-            dc_df = crawl_dcinside_requests(target_date)
-            all_results['디시인사이드'] = dc_df
-            logger.info(f"✅ 디시인사이드: {len(dc_df)}개")
-        except Exception as e:
-            logger.error(f"❌ 디시인사이드 실패: {e}")
-            all_results['디시인사이드'] = pd.DataFrame()
+        return finalize_results(all_results, hot_calc, crawl_date)
         
-        logger.info("📊 더쿠 크롤링...")
+    except Exception as e:
+        logger.error(f"❌ 전체 프로세스 실패: {e}")
+        return {'success': False, 'error': str(e)}
+
+def main_crawl_shard(sites, out_dir, target_date=None, start_page=None, end_page=None):
+    """샤드 모드: 지정 사이트(+페이지 범위)만 크롤링해 중간 결과 저장 (PUBLISH_MODE=incremental이면 바로 릴리즈 공개)"""
+    crawl_date = resolve_crawl_date(target_date)
+    target_date = crawl_date.strftime("%m%d")
+    logger.info(f"🧩 샤드 크롤링: {', '.join(sites)} / 타겟 날짜 {target_date}"
+                + (f" / p{start_page or 1}-{end_page or 'end'}" if (start_page or end_page) else ''))
+
+    budget = CrawlBudget.from_env(sites)
+    written = set()
+
+    def on_site(key, df):
+        # 사이트가 끝나는 대로 저장 (이후 사이트가 실패하거나 시간 초과돼도 남도록)
+        path = write_shard(out_dir, key, df, crawl_date, start_page, end_page)
+        written.add(key)
+        if incremental_publishing():
+            publish_shard(path)
+
+    all_results = crawl_sites(sites, target_date, start_page=start_page, end_page=end_page, budget=budget,
+                              on_site=on_site)
+    # 실패한 사이트는 빈 샤드로 남김 (공개하지 않음)
+    failed = [key for key in sites if key not in written]
+    for key in failed:
+        write_shard(out_dir, key, all_results[SITE_CRAWLERS[key][0]], crawl_date, start_page, end_page)
+
+    result = {'success': not failed, 'failed': failed, 'total_count': sum(len(df) for df in all_results.values())}
+    if failed:
+        result['error'] = f"크롤링 실패 사이트: {', '.join(failed)}"
+    return result
+
+def main_merge(in_dir):
+    """샤드 결과를 합쳐 화제성 점수를 한 번에 계산하고 릴리즈에 한 번 업로드"""
+    try:
+        all_results, crawl_date = load_shards(in_dir)
+        return finalize_results(all_results, create_hot_score_calculator(), crawl_date)
+    except Exception as e:
+        logger.error(f"❌ 샤드 병합 실패: {e}")
+        return {'success': False, 'error': str(e)}
+
+# 데몬 기본 일정: 사이트=주기(분)
+DEFAULT_DAEMON_SCHEDULE = os.environ.get('DAEMON_SCHEDULE', 'dcinside=60,instiz=60,fmkorea=180,theqoo=180')
+
+def parse_schedule(value):
+    """'dcinside=60,theqoo=180' → {'dcinside': 60.0, 'theqoo': 180.0}"""
+    schedule = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        key, _, minutes = item.partition('=')
+        key = key.strip()
+        if key not in SITE_CRAWLERS:
+            raise ValueError(f"알 수 없는 사이트: {key}")
+        schedule[key] = float(minutes or 60)
+    return schedule
+
+class CrawlDaemon:
+    """사이트별 주기로 크롤링을 반복 실행하는 상주 프로세스
+
+    - 주기는 벽시계에 맞춰 정렬된다 (60분이면 매시 정각, 180분이면 0/3/6...시, UTC 기준).
+    - WarmPool로 HTTP 세션, 쿠키, 브라우저를 실행 간에 재사용한다 (pandas/Selenium import도 한 번).
+    - 사이트마다 잠금이 있어, 이전 실행이 끝나지 않았으면 이번 차례는 건너뛴다.
+    - 실행마다 오늘(KST) 게시물을 사이트 샤드(out_dir)에 덮어쓰고, ARCHIVE_PATH가 있으면 아카이브에도 반영한다.
+    - http://127.0.0.1:{status_port}/status 로 사이트별 상태를 JSON으로 제공한다.
+    """
+
+    def __init__(self, schedule=None, out_dir=None, status_port=None, run_on_start=True):
+        import threading
+
+        self.schedule = schedule or parse_schedule(DEFAULT_DAEMON_SCHEDULE)
+        self.out_dir = out_dir or os.environ.get('DAEMON_OUT_DIR', 'data/daemon')
+        self.status_port = int(status_port if status_port is not None else os.environ.get('DAEMON_STATUS_PORT', 8765))
+        self.run_on_start = run_on_start
+        self.started_at = time.time()
+        self.stop_event = threading.Event()
+        self.locks = {key: threading.Lock() for key in self.schedule}
+        self.state = {
+            key: {
+                'interval_minutes': minutes,
+                'running': False,
+                'runs': 0,
+                'skipped_overlaps': 0,
+                'last_started': None,
+                'last_finished': None,
+                'last_duration_sec': None,
+                'last_count': None,
+                'last_error': None,
+                'next_run': None,
+            }
+            for key, minutes in self.schedule.items()
+        }
+        self.server = None
+
+    def next_run_at(self, key, now=None):
+        interval = self.schedule[key] * 60
+        now = now or time.time()
+        return (math.floor(now / interval) + 1) * interval
+
+    def run_job(self, key):
+        """사이트 1회 크롤링 (같은 사이트가 실행 중이면 건너뜀)"""
+        lock = self.locks[key]
+        state = self.state[key]
+        if not lock.acquire(blocking=False):
+            state['skipped_overlaps'] += 1
+            print(f"⏭️ {key} 이전 실행이 아직 진행 중, 이번 차례 건너뜀")
+            return
+
+        started = time.time()
+        state.update(running=True, last_started=datetime.now(KST).isoformat(timespec='seconds'))
         try:
-            theqoo_df = crawl_theqoo_selenium(target_date)
-            all_results['더쿠'] = theqoo_df
-            logger.info(f"✅ 더쿠: {len(theqoo_df)}개")
-        except Exception as e:
-            logger.error(f"❌ 더쿠 실패: {e}")
-            all_results['더쿠'] = pd.DataFrame()
-        
-        # 화제성 점수 계산
-        logger.info("🔥 화제성 점수 계산...")
-        calculate_hot_scores(all_results, hot_calc)
-        
-        # 데이터 통합
-        combined_data = []
-        total_count = 0
-        
-        for site_name, df in all_results.items():
+            crawl_date = datetime.now(KST).date()
+            site_name = SITE_CRAWLERS[key][0]
+
+            # 한 번의 실행이 다음 차례를 넘기지 않도록 주기를 시간 예산으로 사용
+            budget = CrawlBudget(self.schedule[key] * 60, reserve_seconds=0)
+            budget.pending = [key]
+
+            df = crawl_sites([key], crawl_date.strftime('%m%d'), budget=budget)[site_name]
             if len(df) > 0:
-                combined_data.append(df)
-                total_count += len(df)
-        
-        if not combined_data:
-            logger.warning("⚠️ 크롤링된 데이터가 없습니다")
-            return {'success': False, 'error': 'No data crawled'}
-        
-        # 최종 DataFrame 생성
-        final_df = pd.concat(combined_data, ignore_index=True)
-        final_df = final_df.sort_values('hot_score', ascending=False)
-        
-        logger.info(f"📊 총 {total_count}개 게시글 수집")
-                
-        # 파일명 생성
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-        filename = f"community_crawling_{target_date}_{timestamp}.csv"
-        
-        upload_result = upload_to_github_release(final_df, filename)
-        
-        # 결과 요약
-        logger.info("🎉 크롤링 완료!")
-        logger.info(f"📁 파일명: {filename}")
-        logger.info(f"📊 총 게시글: {len(final_df)}개")
-        
-        # 사이트별 통계
-        site_stats = final_df['source'].value_counts()
-        for site, count in site_stats.items():
-            logger.info(f"   - {site}: {count}개")
-        
-        # 화제성 통계
-        if 'hot_score' in final_df.columns:
-            avg_score = final_df['hot_score'].mean()
-            max_score = final_df['hot_score'].max()
-            high_score_count = len(final_df[final_df['hot_score'] >= 5.5])
-            
-            logger.info(f"🔥 화제성 통계:")
-            logger.info(f"   - 평균 점수: {avg_score:.2f}")
-            logger.info(f"   - 최고 점수: {max_score:.2f}")
-            logger.info(f"   - 고화제성(5.5+): {high_score_count}개")
-        
+                # 당일 스냅샷이므로 이력(rolling)에 남기지 않는 당일 최고값 기준 점수
+                calculate_hot_scores({site_name: df}, HotScoreCalculator(), crawl_date=crawl_date.isoformat())
+            write_shard(self.out_dir, key, df, crawl_date)
+
+            if os.environ.get('ARCHIVE_PATH') and len(df) > 0:
+                archive = CrawlArchive()
+                try:
+                    archive.append(df, crawl_date)
+                finally:
+                    archive.close()
+
+            state.update(last_count=len(df), last_error=None)
+        except Exception as e:
+            logger.error(f"❌ {key} 데몬 실행 실패: {e}")
+            state['last_error'] = f"{type(e).__name__}: {e}"
+        finally:
+            state.update(
+                running=False,
+                runs=state['runs'] + 1,
+                last_finished=datetime.now(KST).isoformat(timespec='seconds'),
+                last_duration_sec=round(time.time() - started, 1),
+            )
+            lock.release()
+
+    def status(self):
         return {
-            'success': True,
-            'filename': filename,
-            'upload_result': upload_result,
-            'total_count': len(final_df),
-            'date': target_date,
-            'site_stats': site_stats.to_dict()
+            'uptime_sec': round(time.time() - self.started_at, 1),
+            'sites': self.state,
+            'pool': _warm_pool.status() if _warm_pool is not None else None,
+            'egress': _egress_pool.status() if _egress_pool is not None else None,
         }
-        
-    except Exception as e:
-        logger.error(f"❌ 전체 프로세스 실패: {e}")
-        return {'success': False, 'error': str(e)}
+
+    def serve_status(self):
+        """로컬 상태 엔드포인트를 백그라운드 스레드로 실행"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        daemon = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/status'):
+                    self.send_error(404)
+                    return
+                body = json.dumps(daemon.status(), ensure_ascii=False, indent=2).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', self.status_port), StatusHandler)
+        threading.Thread(target=self.server.serve_forever, name='status', daemon=True).start()
+        print(f"🩺 상태 확인: http://127.0.0.1:{self.server.server_address[1]}/status")
+
+    def run(self):
+        import threading
+
+        global _warm_pool
+        _warm_pool = WarmPool()
+        self.serve_status()
+
+        now = time.time()
+        next_runs = {key: now if self.run_on_start else self.next_run_at(key, now) for key in self.schedule}
+        print(f"🛰️ 데몬 시작: {', '.join(f'{k} {m:g}분' for k, m in self.schedule.items())}")
+
+        try:
+            while not self.stop_event.is_set():
+                now = time.time()
+                for key, due in next_runs.items():
+                    if due <= now:
+                        threading.Thread(target=self.run_job, args=(key,), name=f"crawl-{key}", daemon=True).start()
+                        next_runs[key] = self.next_run_at(key, now)
+                    self.state[key]['next_run'] = datetime.fromtimestamp(next_runs[key], KST).isoformat(timespec='seconds')
+
+                self.stop_event.wait(min(max(min(next_runs.values()) - time.time(), 0.5), 30))
+        except KeyboardInterrupt:
+            print("🛑 데몬 종료 요청")
+        finally:
+            self.stop()
+
+    def stop(self):
+        global _warm_pool
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
+
+        # 실행 중인 작업이 끝나길 잠시 기다린 뒤 풀 정리
+        for lock in self.locks.values():
+            if lock.acquire(timeout=60):
+                lock.release()
+        if _warm_pool is not None:
+            _warm_pool.close()
+            _warm_pool = None
+
+def main_daemon(schedule=None, out_dir=None, status_port=None):
+    """상주 모드: 사이트별 주기 크롤링 + 상태 엔드포인트"""
+    daemon = CrawlDaemon(parse_schedule(schedule) if schedule else None, out_dir, status_port)
+    daemon.run()
+    return daemon
+
+def parse_page_range(value):
+    """'3-10' / '5-' / '7' 형식 → (start_page, end_page)"""
+    if not value:
+        return None, None
+    start, separator, end = value.partition('-')
+    start_page = int(start) if start else None
+    end_page = int(end) if end else (None if separator else start_page)
+    return start_page, end_page
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="커뮤니티 크롤링")
+    subparsers = parser.add_subparsers(dest='command')
+
+    crawl = subparsers.add_parser('crawl', help="사이트(샤드)별 크롤링 후 중간 결과 저장")
+    crawl.add_argument('--sites', default=','.join(SITE_CRAWLERS),
+                       help=f"쉼표로 구분한 사이트 ({', '.join(SITE_CRAWLERS)})")
+    crawl.add_argument('--out', default='shards', help="중간 결과 저장 디렉터리")
+    crawl.add_argument('--pages', default=None, help="페이지 범위 (예: 1-10, 11-)")
+    crawl.add_argument('--date', default=None, help="타겟 날짜 MMDD (기본: 어제)")
+
+    merge = subparsers.add_parser('merge', help="샤드 병합 + 점수 계산 + 릴리즈 업로드")
+    merge.add_argument('--in', dest='in_dir', default='shards', help="샤드 디렉터리")
+
+    subparsers.add_parser('sync-releases', help="릴리즈 CSV 동기화 (+ 아카이브/색인 적재)")
+
+    daemon = subparsers.add_parser('daemon', help="사이트별 주기 크롤링 상주 실행 (상태 엔드포인트 포함)")
+    daemon.add_argument('--schedule', default=None, help="사이트=주기(분) 목록 (예: dcinside=60,theqoo=180)")
+    daemon.add_argument('--out', default=None, help="사이트별 스냅샷 저장 디렉터리 (기본 data/daemon)")
+    daemon.add_argument('--port', type=int, default=None, help="상태 엔드포인트 포트 (기본 8765)")
+
+    poll = subparsers.add_parser('poll', help="목록 앞쪽 페이지를 주기적으로 폴링해 화제 속도 기록")
+    poll.add_argument('--sites', default=','.join(SITE_CRAWLERS))
+    poll.add_argument('--pages', type=int, default=2, help="사이트별로 다시 읽을 목록 페이지 수")
+    poll.add_argument('--interval', type=float, default=10, help="폴링 간격 (분)")
+    poll.add_argument('--count', type=int, default=0, help="폴링 횟수 (0이면 계속)")
+
+    highlights = subparsers.add_parser('highlights', help="아카이브 기간 전체에서 상위 게시물 요약(JSON) 생성")
+    highlights.add_argument('--from', dest='start', default=None, help="시작 날짜 YYYY-MM-DD")
+    highlights.add_argument('--to', dest='end', default=None, help="끝 날짜 YYYY-MM-DD")
+    highlights.add_argument('--top', type=int, default=50, help="전체 상위 개수")
+    highlights.add_argument('--per-site', type=int, default=10, help="사이트별 상위 개수")
+    highlights.add_argument('--rescore', action='store_true', help="저장된 점수 대신 날짜별로 다시 계산")
+    highlights.add_argument('--out', default='highlights.json')
+
+    loadtest = subparsers.add_parser('loadtest', help="합성 커뮤니티로 규모별 전체 파이프라인 부하 테스트")
+    loadtest.add_argument('--scales', default='1,10,100', help="하루 약 1,000건 기준 배수 (쉼표 구분)")
+    loadtest.add_argument('--sites', default=','.join(SITE_CRAWLERS))
+    loadtest.add_argument('--boards', type=int, default=1, help="디시 갤러리 수")
+    loadtest.add_argument('--newer', type=float, default=0.2, help="목표 날짜 글 대비 앞쪽 최신 글 비율")
+    loadtest.add_argument('--older', type=float, default=0.5, help="목표 날짜 글 대비 뒤쪽 이전 글 비율")
+    loadtest.add_argument('--out', default='data/loadtest')
+
+    # 인자가 없으면 기존처럼 전체 실행
+    run = subparsers.add_parser('run', help="전체 사이트 크롤링 + 업로드 (기본)")
+    run.add_argument('--sites', default=','.join(SITE_CRAWLERS))
+    run.add_argument('--date', default=None)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(['run'])
+
+    if hasattr(args, 'sites'):
+        args.sites = [site.strip() for site in args.sites.split(',') if site.strip()]
+        unknown = [site for site in args.sites if site not in SITE_CRAWLERS]
+        if unknown:
+            parser.error(f"알 수 없는 사이트: {', '.join(unknown)}")
+    return args
 
 if __name__ == "__main__":
-    result = main_github_actions()
+    args = parse_args(sys.argv[1:])
+
+    if args.command == 'sync-releases':
+        # 릴리즈 CSV 동기화 (+ ARCHIVE_PATH/TITLE_INDEX_DIR 설정 시 아카이브/색인 적재)
+        sync_release_archive()
+        if os.environ.get('ARCHIVE_PATH'):
+            archive = CrawlArchive()
+            backfill_archive_from_releases(archive)
+            archive.close()
+        if os.environ.get('TITLE_INDEX_DIR'):
+            index = TitleIndex()
+            for crawl_date, day_df in load_release_archive().groupby('crawl_date'):
+                index.add_segment(day_df, crawl_date)
+        sys.exit(0)
+
+    if args.command == 'daemon':
+        main_daemon(args.schedule, args.out, args.port)
+        sys.exit(0)
+
+    if args.command == 'poll':
+        VelocityPoller(args.sites, pages=args.pages).run(args.interval, args.count)
+        sys.exit(0)
+
+    if args.command == 'highlights':
+        archive = CrawlArchive()
+        result = archive.highlights(args.top, args.per_site, args.start, args.end, rescore=args.rescore)
+        archive.close()
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(result.to_json())
+        print(f"🏆 하이라이트 저장: {args.out} ({result.summary()['count']}개 게시글 집계)")
+        sys.exit(0)
+
+    if args.command == 'loadtest':
+        from loadtest import run_load_test
+
+        scales = [float(scale) for scale in args.scales.split(',') if scale.strip()]
+        results = run_load_test(scales, args.sites, args.out, args.newer, args.older, args.boards)
+        sys.exit(1 if any('error' in r or r['missing'] for r in results) else 0)
+
+    if args.command == 'crawl':
+        start_page, end_page = parse_page_range(args.pages)
+        result = main_crawl_shard(args.sites, args.out, args.date, start_page, end_page)
+        if not result['success']:
+            print(f"❌ 샤드 크롤링 실패: {result['error']} (수집 {result['total_count']}개 게시글)")
+            sys.exit(1)
+        print(f"✅ 샤드 크롤링 완료: {result['total_count']}개 게시글")
+        sys.exit(0)
+
+    if args.command == 'merge':
+        result = main_merge(args.in_dir)
+    else:
+        result = main_github_actions(args.sites, args.date)
     
     if result['success']:
         print(f"✅ 크롤링 성공: {result['filename']}")
@@ -1067,4 +4811,4 @@ if __name__ == "__main__":
             print(f"🔗 다운로드: {result['upload_result']['download_url']}")
     else:
         print(f"❌ 크롤링 실패: {result['error']}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+'''
+테스트용 로컬 GitHub Releases API 목 서버
+GitHubReleaseClient(api_url=server.url)로 그대로 사용한다.
+'''
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class MockGitHub:
+    """릴리즈 목록(Link 헤더 페이지네이션), 태그 조회, 생성, 에셋 업로드/다운로드/삭제"""
+
+    def __init__(self, owner='owner', repo='repo'):
+        self.prefix = f"/repos/{owner}/{repo}"
+        self.releases = []
+        self.assets = {}
+        self.requests = []
+        self.downloads = []
+        self.server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def add_release(self, tag_name, assets=()):
+        """assets: [(이름, bytes)]"""
+        release = {
+            'id': len(self.releases) + 1,
+            'tag_name': tag_name,
+            'html_url': f"https://github.invalid/releases/{tag_name}",
+            'upload_url': f"{self.url}/uploads/{len(self.releases) + 1}/assets{{?name,label}}",
+            'assets': [],
+        }
+        self.releases.append(release)
+        for name, data in assets:
+            self._add_asset(release, name, data)
+        return release
+
+    def _add_asset(self, release, name, data):
+        asset_id = 1000 + len(self.assets)
+        asset = {
+            'id': asset_id,
+            'name': name,
+            'size': len(data),
+            'url': f"{self.url}{self.prefix}/releases/assets/{asset_id}",
+            'browser_download_url': f"https://github.invalid/download/{name}",
+        }
+        self.assets[asset_id] = data
+        release['assets'].append(asset)
+        return asset
+
+    def asset_names(self, tag_name):
+        release = next(r for r in self.releases if r['tag_name'] == tag_name)
+        return sorted(asset['name'] for asset in release['assets'])
+
+    def start(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _json(self, status, data, headers=None):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                mock.requests.append(('GET', self.path))
+                path = url.path[len(mock.prefix):] if url.path.startswith(mock.prefix) else None
+
+                if path == '/releases':
+                    # 최신 릴리즈가 앞에 오는 목록, per_page 단위 페이지
+                    per_page = int(query.get('per_page', ['30'])[0])
+                    page = int(query.get('page', ['1'])[0])
+                    ordered = list(reversed(mock.releases))
+                    chunk = ordered[(page - 1) * per_page:page * per_page]
+                    headers = {}
+                    if page * per_page < len(ordered):
+                        next_url = f"{mock.url}{mock.prefix}/releases?per_page={per_page}&page={page + 1}"
+                        headers['Link'] = f'<{next_url}>; rel="next"'
+                    self._json(200, chunk, headers)
+                elif path and path.startswith('/releases/tags/'):
+                    tag = path.rsplit('/', 1)[1]
+                    release = next((r for r in mock.releases if r['tag_name'] == tag), None)
+                    if release:
+                        self._json(200, release)
+                    else:
+                        self._json(404, {'message': 'Not Found'})
+                elif path and path.startswith('/releases/assets/'):
+                    asset_id = int(path.rsplit('/', 1)[1])
+                    mock.downloads.append(asset_id)
+                    data = mock.assets[asset_id]
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/octet-stream')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                else:
+                    self._json(404, {'message': 'Not Found'})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                mock.requests.append(('POST', self.path))
+
+                if url.path == f"{mock.prefix}/releases":
+                    tag = json.loads(body)['tag_name']
+                    if any(r['tag_name'] == tag for r in mock.releases):
+                        self._json(422, {'message': 'Validation Failed', 'errors': [{'code': 'already_exists'}]})
+                        return
+                    self._json(201, mock.add_release(tag))
+                elif url.path.startswith('/uploads/'):
+                    release_id = int(url.path.split('/')[2])
+                    release = next(r for r in mock.releases if r['id'] == release_id)
+                    name = parse_qs(url.query)['name'][0]
+                    # GitHub처럼 같은 이름 에셋이 있으면 422
+                    if any(asset['name'] == name for asset in release['assets']):
+                        self._json(422, {'message': 'Validation Failed', 'errors': [{'code': 'already_exists'}]})
+                        return
+                    self._json(201, mock._add_asset(release, name, body))
+                else:
+                    self._json(404, {'message': 'Not Found'})
+
+            def do_DELETE(self):
+                url = urlparse(self.path)
+                mock.requests.append(('DELETE', self.path))
+                asset_id = int(url.path.rsplit('/', 1)[1])
+                for release in mock.releases:
+                    release['assets'] = [a for a in release['assets'] if a['id'] != asset_id]
+                mock.assets.pop(asset_id, None)
+                self.send_response(204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
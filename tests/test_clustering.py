@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+'''
+cluster_near_duplicates 테스트: 행 순서를 섞어도 같은 클러스터가 나오는지
+실행: python -m pytest tests/test_clustering.py
+'''
+
+import io
+import random
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+import main
+
+
+def _frame():
+    rng = random.Random(7)
+    words = ['아이폰', '출시', '가격', '인상', '갤럭시', '공개', '월드컵', '예선', '결과', '한국',
+             '일본', '태풍', '북상', '주말', '날씨', '환율', '급등', '코스피', '하락', '마감']
+    base = [rng.sample(words, 4) for _ in range(12)]
+    rows = []
+    for i in range(120):
+        title = list(base[i % len(base)])
+        # 단어 하나씩 바꿔 체인처럼 이어지는 유사 제목을 만듦
+        if i % 3:
+            title[i % 4] = rng.choice(words)
+        rows.append({'title': ' '.join(title), 'url': f'https://example.com/{i}',
+                     'source': ['더쿠', '루리웹', '에펨코리아'][i % 3], 'hot_score': float(i % 7)})
+    return pd.DataFrame(rows)
+
+
+def _partition(df, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        result = main.cluster_near_duplicates(df, **kwargs)
+    groups = result.groupby('cluster_id')['url'].apply(frozenset)
+    return set(groups)
+
+
+@pytest.mark.parametrize('full_check', [64, 0])
+def test_clusters_do_not_depend_on_row_order(full_check):
+    df = _frame()
+    expected = _partition(df, full_check=full_check)
+    assert any(len(group) > 1 for group in expected)
+
+    for seed in range(10):
+        shuffled = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+        assert _partition(shuffled, full_check=full_check) == expected
+
+
+def test_identical_titles_share_cluster():
+    df = pd.DataFrame([
+        {'title': '오늘 코스피 하락 마감', 'url': 'a', 'source': '더쿠', 'hot_score': 1.0},
+        {'title': '태풍 북상 주말 날씨', 'url': 'b', 'source': '루리웹', 'hot_score': 1.0},
+        {'title': '오늘 코스피 하락 마감', 'url': 'c', 'source': '에펨코리아', 'hot_score': 1.0},
+    ])
+    assert frozenset({'a', 'c'}) in _partition(df)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+'''
+샤드 크롤링 결과/종료 코드 테스트
+실행: python -m pytest tests/test_crawl_shard.py
+'''
+
+import pandas as pd
+import pytest
+
+import main
+
+
+def _ok(source):
+    def crawler(target_date, on_record=None, **kwargs):
+        return pd.DataFrame([{'title': 't', 'url': f'https://example.com/{source}', 'source': source,
+                              'views': 1, 'comments': 0, 'date': '08.01'}])
+    return crawler
+
+
+def _broken(target_date, on_record=None, **kwargs):
+    raise main.FetchError("회로 차단으로 수집 0건")
+
+
+@pytest.fixture
+def crawlers(monkeypatch):
+    monkeypatch.delenv('PUBLISH_MODE', raising=False)
+    monkeypatch.delenv('RUN_BUDGET_MINUTES', raising=False)
+    table = {key: (name, _ok(name)) for key, (name, _) in main.SITE_CRAWLERS.items()}
+    monkeypatch.setattr(main, 'SITE_CRAWLERS', table)
+    return table
+
+
+def test_crawl_shard_succeeds_when_all_sites_finish(crawlers, tmp_path):
+    result = main.main_crawl_shard(['dcinside', 'instiz'], str(tmp_path), '0801')
+    assert result['success'] and result['failed'] == []
+    assert result['total_count'] == 2
+
+
+def test_crawl_shard_fails_when_a_site_raises(crawlers, tmp_path):
+    crawlers['theqoo'] = ('더쿠', _broken)
+    result = main.main_crawl_shard(['dcinside', 'theqoo'], str(tmp_path), '0801')
+    assert not result['success']
+    assert result['failed'] == ['theqoo']
+    # 실패한 사이트도 빈 샤드는 남김
+    assert sorted(p.name.split('_')[1] for p in tmp_path.glob('shard_*.json')) == ['dcinside', 'theqoo']
+
+
+def test_crawl_shard_fails_when_every_site_fails(crawlers, tmp_path):
+    for key in ('dcinside', 'instiz'):
+        crawlers[key] = (crawlers[key][0], _broken)
+    result = main.main_crawl_shard(['dcinside', 'instiz'], str(tmp_path), '0801')
+    assert not result['success']
+    assert result['failed'] == ['dcinside', 'instiz']
+    assert result['total_count'] == 0
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+'''
+화제성 점수 계산과 하이라이트(OUTPUT_MODE=highlights) 테스트
+실행: python -m pytest tests/test_highlights.py
+'''
+
+import json
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+
+def _site(source, n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'title': [f'{source} 글 {i}' for i in range(n)],
+        'url': [f'https://{seed}.example.com/{1000 + i}' for i in range(n)],
+        'source': source,
+        'views': rng.integers(0, 50000, n),
+        'comments': rng.integers(0, 800, n),
+        'date': '08.01',
+    })
+
+
+@pytest.fixture
+def results():
+    return {'디시인사이드': _site('디시인사이드', 400, 1), '더쿠': _site('더쿠', 300, 2), '인스티즈': _site('인스티즈', 0, 3)}
+
+
+def test_score_frame_matches_row_score(results):
+    calc = main.HotScoreCalculator()
+    calc.collect_stats(results)
+    for df in results.values():
+        expected = [calc.calculate_hot_score(v, c, s) for v, c, s in zip(df['views'], df['comments'], df['source'])]
+        assert calc.score_frame(df).tolist() == expected
+
+    # 샤드에서 읽은 프레임처럼 source가 category여도 같은 점수
+    df = results['더쿠'].astype({'source': 'category'})
+    assert calc.score_frame(df).tolist() == calc.score_frame(results['더쿠']).tolist()
+
+    # 통계가 없는 사이트는 0점
+    assert calc.score_frame(_site('FM코리아', 3, 4)).tolist() == [0.0, 0.0, 0.0]
+
+
+def test_highlights_mode_skips_full_frame(results, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('OUTPUT_MODE', 'highlights')
+    for name in ('G_TOKEN', 'TITLE_INDEX_DIR', 'ARCHIVE_PATH', 'BODY_STORE_DIR'):
+        monkeypatch.delenv(name, raising=False)
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("highlights 모드에서 전체 프레임을 만들면 안 됨")
+    monkeypatch.setattr(main, 'cluster_near_duplicates', unexpected)
+    monkeypatch.setattr(main, 'upload_to_github_release', unexpected)
+    monkeypatch.setattr(pd, 'concat', unexpected)
+
+    result = main.finalize_results(results, main.HotScoreCalculator(), date(2025, 8, 1))
+
+    assert result['success']
+    assert result['total_count'] == 700
+    assert result['site_stats'] == {'디시인사이드': 400, '더쿠': 300}
+
+    with open(result['upload_result']['local_file'], encoding='utf-8') as f:
+        payload = json.load(f)
+    monkeypatch.undo()
+    scored = pd.concat(list(results.values()), ignore_index=True)
+    top = scored.nlargest(50, 'hot_score', keep='first')
+    assert [post['hot_score'] for post in payload['top']] == top['hot_score'].tolist()
+    assert len(payload['top_by_site']['더쿠']) == 10
+
+
+def test_highlights_mode_archives_without_clustering(results, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('OUTPUT_MODE', 'highlights')
+    monkeypatch.setenv('ARCHIVE_PATH', str(tmp_path / 'archive.sqlite'))
+    for name in ('G_TOKEN', 'TITLE_INDEX_DIR', 'BODY_STORE_DIR'):
+        monkeypatch.delenv(name, raising=False)
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("highlights 모드에서는 클러스터링하지 않음")
+    monkeypatch.setattr(main, 'cluster_near_duplicates', unexpected)
+
+    main.finalize_results(results, main.HotScoreCalculator(), date(2025, 8, 1))
+
+    archive = main.CrawlArchive(str(tmp_path / 'archive.sqlite'))
+    stored = archive.top_posts(1000)
+    archive.close()
+    assert len(stored) == 700
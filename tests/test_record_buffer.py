@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+'''
+RecordBuffer 테스트: 프레임으로 꺼낸 뒤에도 계속 쌓을 수 있고, 컬럼 타입이 릴리즈/아카이브와 같은지
+실행: python -m pytest tests/test_record_buffer.py
+'''
+
+import pandas as pd
+
+import main
+
+
+def _record(i, **extra):
+    return dict({'title': f'글 {i}', 'url': f'https://theqoo.net/hot/{1000 + i}', 'source': '더쿠',
+                 'views': 100 * i, 'comments': i, 'date': '08.01'}, **extra)
+
+
+def test_buffer_grows_after_to_frame():
+    buffer = main.RecordBuffer('더쿠')
+    buffer.extend(_record(i) for i in range(3))
+    df = buffer.to_frame()
+
+    # 수집 도중 꺼낸 프레임이 버퍼를 잠그지 않음
+    buffer.append(_record(3))
+    other = main.RecordBuffer('더쿠')
+    other.append(_record(4, board='hot'))
+    buffer.merge(other)
+
+    assert len(df) == 3 and df['views'].tolist() == [0, 100, 200]
+    assert buffer.to_frame()['views'].tolist() == [0, 100, 200, 300, 400]
+    assert buffer.to_frame()['board'].tolist() == [None, None, None, None, 'hot']
+
+
+def test_views_dtype_matches_release_dtypes():
+    buffer = main.RecordBuffer('더쿠')
+    buffer.extend(_record(i) for i in range(3))
+    frame = buffer.to_frame()
+    from_csv = main.apply_record_dtypes(pd.DataFrame([_record(i) for i in range(3)]))
+
+    for column in ('views', 'comments'):
+        assert str(frame[column].dtype) == main.RELEASE_DTYPES[column] == str(from_csv[column].dtype)
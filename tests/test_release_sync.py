@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+'''
+릴리즈 동기화 테스트 (로컬 목 Releases API)
+실행: python -m pytest tests/test_release_sync.py
+'''
+
+from datetime import date, timedelta
+
+import pytest
+
+import main
+from mock_github import MockGitHub
+
+RELEASE_COUNT = 131
+FIRST_DAY = date(2025, 1, 1)
+
+
+def _csv(title, views):
+    return ("title,url,source,views,comments,hot_score,date\n"
+            f"{title},https://example.com/{title},더쿠,{views},1,3.5,01.01\n").encode('utf-8-sig')
+
+
+@pytest.fixture
+def github(monkeypatch):
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+    mock = MockGitHub().start()
+    for i in range(RELEASE_COUNT):
+        release_day = FIRST_DAY + timedelta(days=i + 1)
+        crawl_mmdd = (release_day - timedelta(days=1)).strftime('%m%d')
+        mock.add_release(f"data-{release_day:%Y%m%d}", [
+            (f"community_crawling_{crawl_mmdd}_{release_day:%Y%m%d}_0900.csv", _csv(f"day{i}", i)),
+            # 점진 공개 샤드는 동기화 대상이 아님
+            (f"shard_theqoo_{release_day:%Y%m%d}.csv", _csv('shard', 0)),
+        ])
+    mock.add_release('v1.0.0')
+
+    # 첫 날짜는 재실행으로 에셋이 하나 더 있음 (나중 에셋이 최신)
+    first = mock.releases[0]
+    mock._add_asset(first, "community_crawling_0101_20250102_1500.csv", _csv('rerun', 999))
+
+    yield mock
+    mock.stop()
+
+
+def _client(github):
+    return main.GitHubReleaseClient(token='test', repo_owner='owner', repo_name='repo', api_url=github.url)
+
+
+def test_sync_follows_link_pagination_and_caches_by_asset_id(github, tmp_path):
+    manifest = main.sync_release_archive(str(tmp_path), max_workers=4, client=_client(github))
+
+    list_requests = [path for method, path in github.requests if method == 'GET' and '/releases?' in path]
+    assert len(list_requests) == 2
+    assert len(manifest) == RELEASE_COUNT + 1
+    assert len(github.downloads) == RELEASE_COUNT + 1
+    assert not any(meta['name'].startswith('shard_') for meta in manifest.values())
+
+    # 다시 동기화하면 아무것도 받지 않음
+    github.downloads.clear()
+    again = main.sync_release_archive(str(tmp_path), max_workers=4, client=_client(github))
+    assert github.downloads == []
+    assert again == manifest
+
+
+def test_sync_downloads_only_new_assets(github, tmp_path):
+    main.sync_release_archive(str(tmp_path), client=_client(github))
+    github.downloads.clear()
+
+    github.add_release('data-20250601', [("community_crawling_0531_20250601_0900.csv", _csv('new', 1))])
+    manifest = main.sync_release_archive(str(tmp_path), client=_client(github))
+    assert len(github.downloads) == 1
+    assert len(manifest) == RELEASE_COUNT + 2
+
+
+def test_load_release_archive_keeps_latest_asset_per_date(github, tmp_path):
+    main.sync_release_archive(str(tmp_path), client=_client(github))
+    df = main.load_release_archive(str(tmp_path))
+
+    assert len(df) == RELEASE_COUNT
+    assert df['crawl_date'].nunique() == RELEASE_COUNT
+    first_day = df[df['crawl_date'] == '2025-01-01']
+    assert first_day['title'].tolist() == ['rerun']
+    assert first_day['views'].tolist() == [999]
+    assert str(df['views'].dtype) == 'int32'
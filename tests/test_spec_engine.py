@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+'''
+사이트 스펙 엔진(crawl_site_spec)의 페이지 넘김/종료 규칙 테스트
+실행: python -m pytest tests/test_spec_engine.py
+'''
+
+import pytest
+from bs4 import BeautifulSoup
+
+import main
+
+TARGET = '0801'
+NEWER, TODAY, OLDER = '08.02', '08.01', '07.31'
+
+
+def render(page, dates):
+    rows = ''.join(
+        f'<li class="post"><a href="/board/{page * 100 + i}">글 {page}-{i}</a><span class="date">{d}</span></li>'
+        for i, d in enumerate(dates)
+    )
+    return f'<html><body><ul>{rows}</ul></body></html>'
+
+
+class Site:
+    """페이지 번호 → 작성일 목록 (None이면 503, 목록에 없는 페이지는 빈 목록)"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def dates(self, page):
+        return self.pages(page) if callable(self.pages) else self.pages.get(page, [])
+
+    def soup(self, page):
+        self.requested.append(page)
+        dates = self.dates(page)
+        return None if dates is None else BeautifulSoup(render(page, dates), 'html.parser')
+
+
+class Response:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.content = text.encode('utf-8')
+        self.text = text
+        self.headers = {}
+
+
+class Session:
+    def __init__(self, site):
+        self.site = site
+
+    def get(self, url, timeout=None):
+        page = int(url.rsplit('=', 1)[1])
+        self.site.requested.append(page)
+        dates = self.site.dates(page)
+        return Response(503) if dates is None else Response(200, render(page, dates))
+
+    def close(self):
+        pass
+
+
+def make_spec(stop_rule, **kwargs):
+    return main.SiteSpec(
+        key='fake',
+        source='테스트',
+        url_template='https://board.test/list?page={page}',
+        rows='li.post',
+        fields={
+            'title': main.ListField('a'),
+            'url': main.ListField('a', attr='href', base_url='https://board.test'),
+            'date': main.ListField('span.date', required=True),
+        },
+        date_formats=('%m.%d',),
+        stop_rule=stop_rule,
+        delay=(0, 0),
+        **kwargs
+    )
+
+
+@pytest.fixture
+def crawl(monkeypatch):
+    monkeypatch.setenv('FETCH_RETRIES', '1')
+    monkeypatch.setenv('CIRCUIT_BREAKER_THRESHOLD', '3')
+
+    def run(spec, pages, **kwargs):
+        site = Site(pages)
+        monkeypatch.setattr(main, 'create_http_session', lambda **_: Session(site))
+        df = main.crawl_site_spec(spec, TARGET, **kwargs)
+        return df, site
+    return run
+
+
+def test_no_target_skips_failed_page(crawl):
+    pages = {1: [TODAY] * 3, 2: None, 3: [TODAY] * 3, 4: [OLDER] * 3}
+    df, site = crawl(make_spec('no_target'), pages)
+    assert len(df) == 6
+    assert site.requested == [1, 2, 3, 4]
+
+
+def test_empty_streak_ignores_leading_newer_pages(crawl):
+    # 앞쪽 최신 글 페이지가 empty_streak(3)보다 많아도 목표 날짜까지 넘어감
+    pages = {p: [NEWER] * 3 for p in range(1, 7)}
+    pages.update({7: [NEWER, TODAY, TODAY], 8: [TODAY, TODAY, OLDER]})
+    pages.update({p: [OLDER] * 3 for p in range(9, 20)})
+    df, site = crawl(make_spec('empty_streak', empty_streak=3), pages)
+    assert len(df) == 4
+    assert site.requested[-1] == 11
+
+
+def test_open_breaker_ends_crawl_without_records(crawl):
+    with pytest.raises(main.FetchError):
+        crawl(make_spec('date_passed'), lambda page: None)
+
+
+def test_start_page_search_then_collect(crawl):
+    # 최신 글 12페이지 뒤에 목표 날짜 글이 시작됨
+    pages = {p: [NEWER] * 3 for p in range(1, 13)}
+    pages.update({13: [NEWER, TODAY, TODAY], 14: [TODAY] * 3, 15: [TODAY, OLDER, OLDER], 16: [OLDER] * 3})
+    df, site = crawl(make_spec('no_target', start_search_page=5), pages)
+    assert len(df) == 6
+    assert site.requested[-4:] == [13, 14, 15, 16]
+
+
+def _boundary_site(start):
+    """start페이지부터 마지막 글이 목표 날짜 (그 앞은 최신 글만)"""
+    return Site(lambda page: [NEWER, NEWER, TODAY if page >= start else NEWER])
+
+
+@pytest.mark.parametrize('start', [1, 3, 5, 6, 40, 700])
+def test_find_start_page_locates_boundary(start):
+    site = _boundary_site(start)
+    spec = make_spec('no_target')
+    assert main._find_start_page(spec, site.soup, TARGET, 5) == start
+    # 앞쪽 최신 글이 많아도 probe 수는 로그 규모
+    assert len(site.requested) <= 25
+
+
+def test_find_start_page_stops_on_failed_probe():
+    spec = make_spec('no_target')
+
+    site = Site(lambda page: None)
+    assert main._find_start_page(spec, site.soup, TARGET, 5) == 5
+    assert site.requested == [5]
+
+    # 앞으로 넘기는 도중 실패해도 더 넘기지 않고 처음 페이지로
+    site = Site(lambda page: None if page >= 8 else [NEWER] * 3)
+    assert main._find_start_page(spec, site.soup, TARGET, 5) == 5
+    assert site.requested == [5, 6, 8]
+
+
+def test_find_start_page_stops_when_breaker_opens():
+    site = _boundary_site(700)
+    assert main._find_start_page(make_spec('no_target'), site.soup, TARGET, 5,
+                                 should_stop=lambda: len(site.requested) >= 2) == 5
+    assert len(site.requested) == 2
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+'''
+사이트 스펙(SITE_SPECS)과 기존 목록 파서의 동등성 테스트
+
+tests/fixtures의 저장된 목록 페이지를 기존 파서(parse_*_list)와 스펙으로 각각 파싱해
+행 단위 필드 값과 목표 날짜로 수집될 게시물 URL 집합을 비교한다.
+사이트 HTML이 바뀌면 새 목록 페이지를 fixtures에 저장하고 두 구현을 다시 비교한다.
+실행: python -m pytest tests/test_spec_parity.py
+'''
+
+import os
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from bs4 import BeautifulSoup
+
+import main
+from main import KST, SITE_SPECS
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+# 스펙 도입 전 크롤러의 목록 파서와 날짜 판정 (비교 기준)
+def is_today_post(date_str, target_date):
+    """당일 게시물인지 확인 (시간 형태는 당일로 간주)"""
+    try:
+        today = datetime.today()
+        
+        # 시간 형태 (HH:MM)면 당일로 간주
+        if ':' in date_str and not re.search(r'\d{2}\.\d{2}', date_str):
+            today_mmdd = today.strftime("%m%d")
+            return target_date == today_mmdd
+        
+        # 날짜 형태에서 MMDD 추출
+        date_digits = re.sub(r'[^\d]', '', date_str)[-4:]
+        return target_date == date_digits
+    except:
+        return False
+
+
+def parse_dcinside_list(soup, board='dcbest', page=1):
+    """디시인사이드 갤러리 목록 파싱 (공지 제외, 모든 행)"""
+    rows = soup.select('tr.ub-content')
+    if board == 'dcbest':
+        # 실시간 베스트는 상단 고정글 개수가 정해져 있음
+        rows = rows[2:] if page == 1 else rows[1:]
+    else:
+        # 일반 갤러리는 번호가 숫자가 아닌 행(공지/설문/AD) 제외
+        rows = [
+            row for row in rows
+            if (row.select_one('td.gall_num') and row.select_one('td.gall_num').get_text(strip=True).isdigit())
+        ]
+
+    posts = []
+    for row in rows:
+        try:
+            date_tag = row.select_one('td.gall_date')
+            date = date_tag.get_text(strip=True) if date_tag else ''
+
+            title_tag = row.select_one('td.gall_tit.ub-word a')
+            title_raw = title_tag.get_text(strip=True) if title_tag else ''
+            post_url = title_tag.get('href') if title_tag else ''
+
+            if post_url and not post_url.startswith('http'):
+                post_url = f"https://gall.dcinside.com{post_url}"
+
+            title = re.sub(r'^[\[\(][^\]\)]{1,3}[\]\)]\s*', '', title_raw)
+
+            view_tag = row.select_one('td.gall_count')
+            view = int(view_tag.text.replace(',', '').strip()) if view_tag and view_tag.text.strip().isdigit() else 0
+
+            comment_tag = row.select_one('a.reply_numbox span.reply_num')
+            comment = 0
+            if comment_tag:
+                match = re.search(r'\[(\d+)', comment_tag.text.strip())
+                if match:
+                    comment = int(match.group(1))
+
+            posts.append({
+                'title': title,
+                'url': post_url,
+                'views': view,
+                'comments': comment,
+                'date': date,
+                'board': board,
+            })
+        except Exception:
+            continue
+    return posts
+
+
+def extract_date_mmdd(date_text):
+    """FM코리아 작성일 텍스트를 MMDD로 변환 (HH:MM은 오늘/어제로 보정)"""
+    date_text = str(date_text).strip()
+    now = datetime.now(KST)
+
+    # HH:MM 형식 확인
+    if ':' in date_text and not re.search(r'\d{2,4}[.\-/]\d{2}[.\-/]\d{2}', date_text):
+        time_match = re.search(r'(\d{1,2}):(\d{2})', date_text)
+        if time_match:
+            hour, minute = int(time_match.group(1)), int(time_match.group(2))
+
+            if 0 <= hour <= 23 and 0 <= minute <= 59:
+                post_time_today = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+                if post_time_today > now:
+                    yesterday = now - timedelta(days=1)
+                    return yesterday.strftime("%m%d")
+                else:
+                    return now.strftime("%m%d")
+
+    # 전체 날짜 형식 (YYYY.MM.DD)
+    full_match = re.search(r'(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})', date_text)
+    if full_match:
+        _, month, day = full_match.groups()
+        return f"{int(month):02d}{int(day):02d}"
+
+
+def extract_date_mmdd_theqoo(date_text):
+    """더쿠 작성일 텍스트를 MMDD로 변환"""
+    if ':' in date_text and not re.search(r'\d{2,4}\.\d{2}\.\d{2}', date_text):
+        return datetime.today().strftime("%m%d")
+
+    month_day_match = re.search(r'(\d{1,2})[\.\-/](\d{1,2})', date_text)
+    if month_day_match:
+        month, day = month_day_match.groups()
+        return f"{int(month):02d}{int(day):02d}"
+
+    return "0000"
+
+
+def parse_fmkorea_list(soup):
+    """FM코리아 베스트 목록 파싱 (날짜가 있는 모든 행)"""
+    posts = []
+    for post in soup.select("div.li"):
+        try:
+            date_elem = post.select_one("span.regdate")
+            if not date_elem:
+                continue
+
+            # 시간은 주석(<!-- HH:MM -->)으로 들어있는 경우가 있음
+            html = date_elem.decode_contents()
+            m = re.search(r'<!--\s*(\d{1,2}:\d{2})\s*-->', html)
+            date_text = (m.group(1).strip() if m else date_elem.get_text(strip=True))
+
+            title_elem = post.select_one("h3.title a")
+            title_text = title_elem.get_text(" ", strip=True) if title_elem else ''
+            post_url = title_elem.get('href', '') if title_elem else ''
+            if post_url and not post_url.startswith('http'):
+                post_url = f"https://www.fmkorea.com{post_url}"
+
+            cmtm = re.search(r'\[(\d+)\]', title_text)
+            comments = int(cmtm.group(1)) if cmtm else 0
+            clean_title = re.sub(r'\s*\[\d+\]$', '', title_text)
+
+            posts.append({
+                'title': clean_title,
+                'url': post_url,
+                'comments': comments,
+                'date': date_text,
+            })
+        except Exception:
+            continue
+    return posts
+
+
+def parse_theqoo_list(soup):
+    """더쿠 핫게시판 목록 파싱 (공지 제외, 날짜가 있는 모든 행)"""
+    posts = []
+    rows = soup.select("table.theqoo_board_table tbody tr:not(.notice):not(.notice_expand)")
+    for row in rows:
+        try:
+            # 공지사항 추가 필터링
+            class_attr = ' '.join(row.get('class', []))
+            data_attr = row.get('data-permanent-notice') or ''
+            if ('notice' in class_attr.lower() or
+                data_attr == 'Y' or
+                'sticky' in class_attr.lower()):
+                continue
+
+            # 날짜 추출
+            time_elem = row.select_one("td.time")
+            date_text = time_elem.get_text(strip=True) if time_elem else ''
+            if not date_text:
+                continue
+
+            # 제목과 URL
+            title_elem = row.select_one("td.title a[href]")
+            title_text = title_elem.get_text(strip=True) if title_elem else ''
+            post_url = title_elem.get('href') if title_elem else ''
+            if post_url and not post_url.startswith('http'):
+                post_url = f"https://theqoo.net{post_url}"
+
+            # 댓글 수
+            comments = 0
+            reply_elem = row.select_one("td.title a.replyNum")
+            if reply_elem:
+                comment_match = re.search(r'(\d+)', reply_elem.get_text(strip=True))
+                if comment_match:
+                    comments = int(comment_match.group(1))
+
+            # 조회수
+            views = 0
+            views_elem = row.select_one("td.m_no")
+            if views_elem:
+                views_text = views_elem.get_text(strip=True).replace(",", "")
+                if views_text.isdigit():
+                    views = int(views_text)
+
+            posts.append({
+                'title': title_text,
+                'url': post_url,
+                'views': views,
+                'comments': comments,
+                'date': date_text,
+            })
+        except Exception:
+            continue
+    return posts
+
+
+def parse_instiz_list(soup):
+    """인스티즈 이슈 목록 파싱 (날짜가 있는 모든 행, 시간만 있으면 오늘 날짜 MM.DD)"""
+    today_str = datetime.today().strftime('%m.%d')
+    posts = []
+
+    for row in soup.select('td.listsubject'):
+        try:
+            if not any(cls.startswith('r') for cls in row.get('class', [])):
+                continue
+
+            title_link = row.select_one('a')
+            if not title_link:
+                continue
+
+            # a 태그 안의 div.sbj에서 제목 추출
+            title_raw = title_link.select_one('div.sbj')
+            if not title_raw:
+                continue
+
+            info_elem = row.select_one('div.listno.regdate')
+            if not info_elem:
+                continue
+                
+            info_text = info_elem.get_text(" ", strip=True)
+            if ':' in info_text and not re.search(r'\d{2}\.\d{2}', info_text):
+                date = today_str
+            else:
+                date_match = re.search(r'\d{2}\.\d{2}', info_text)
+                date = date_match.group() if date_match else today_str
+
+            post_url = title_link.get('href', '')
+
+            # 절대 경로 변환
+            if post_url and not post_url.startswith('http'):
+                if post_url.startswith('/'):
+                    post_url = f"https://www.instiz.net{post_url}"
+                else:
+                    post_url = f"https://www.instiz.net/{post_url}"
+
+            title_text = title_raw.get_text(" ", strip=True)
+            comment_tag = title_raw.select_one('span.cmt2')
+            comments = int(comment_tag.get_text(strip=True)) if comment_tag else 0
+            title = re.sub(r'\s*\[\d+\]$', '', title_text.split('(', 1)[0].strip())
+
+            views_match = re.search(r'조회\s([\d,]+)', info_text)
+            views = int(views_match.group(1).replace(',', '')) if views_match else 0
+
+            posts.append({
+                'title': title,
+                'url': post_url,
+                'views': views,
+                'comments': comments,
+                'date': date,
+            })
+        except Exception:
+            continue
+    return posts
+
+
+LEGACY_LIST_PARSERS = {
+    'dcinside': (lambda soup, board, page: parse_dcinside_list(soup, board, page),
+                 lambda post, target: is_today_post(post['date'], target)),
+    'fmkorea': (lambda soup, board, page: parse_fmkorea_list(soup),
+                lambda post, target: extract_date_mmdd(post['date']) == target),
+    'theqoo': (lambda soup, board, page: parse_theqoo_list(soup),
+               lambda post, target: extract_date_mmdd_theqoo(post['date']) == target and bool(post['title'])),
+    'instiz': (lambda soup, board, page: parse_instiz_list(soup),
+               lambda post, target: is_today_post(post['date'], target)),
+}
+
+
+def check_spec_parity(site_key, soup, target_date, page=1, partition=None):
+    """같은 목록 페이지를 기존 파서(parse_*_list)와 SITE_SPECS로 각각 파싱해 차이 목록 반환 (빈 목록이면 동등)
+
+    행 단위 필드 값과, 목표 날짜로 수집될 게시물 URL 집합을 비교한다.
+    """
+    spec = SITE_SPECS[site_key]
+    legacy_parse, legacy_is_target = LEGACY_LIST_PARSERS[site_key]
+    if spec.partition_field and partition is None:
+        partition = spec.partition_values()[0]
+
+    legacy = legacy_parse(soup, partition, page)
+    engine = spec.parse(soup, partition, page)
+
+    diffs = []
+    if len(legacy) != len(engine):
+        diffs.append(f"행 수: 기존 {len(legacy)} / 스펙 {len(engine)}")
+
+    for i, (old, new) in enumerate(zip(legacy, engine)):
+        for field in sorted(set(old) & set(new)):
+            if old[field] != new[field]:
+                diffs.append(f"{i}번째 행 {field}: 기존 {old[field]!r} / 스펙 {new[field]!r}")
+
+    legacy_targets = {post['url'] for post in legacy if legacy_is_target(post, target_date)}
+    engine_targets = {
+        post['url'] for post in engine
+        if spec.mmdd(post['date']) == target_date and (post['title'] or not spec.require_title)
+    }
+    for url in sorted(legacy_targets - engine_targets):
+        diffs.append(f"기존에만 수집: {url}")
+    for url in sorted(engine_targets - legacy_targets):
+        diffs.append(f"스펙에만 수집: {url}")
+    return diffs
+
+
+FIXTURE_PAGES = [
+    # (사이트, 파일, 파티션, 페이지, 0801에 수집될 URL)
+    ('dcinside', 'dcinside_dcbest_p1.html', 'dcbest', 1, {
+        'https://gall.dcinside.com/board/view/?id=dcbest&no=312000&_dcbest=9&page=1',
+        'https://gall.dcinside.com/board/view/?id=dcbest&no=311998&_dcbest=9&page=1',
+    }),
+    ('dcinside', 'dcinside_programming_p1.html', 'programming', 1, {
+        'https://gall.dcinside.com/board/view/?id=programming&no=2841570&page=1',
+    }),
+    ('fmkorea', 'fmkorea_p1.html', None, 1, {
+        'https://www.fmkorea.com/8012345001',
+        'https://www.fmkorea.com/8012344400',
+    }),
+    ('theqoo', 'theqoo_p1.html', None, 1, {'https://theqoo.net/hot/3712188'}),
+    ('instiz', 'instiz_p1.html', None, 1, {'https://www.instiz.net/pt/7811000'}),
+]
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return BeautifulSoup(f.read(), 'html.parser')
+
+
+@pytest.mark.parametrize('target_date', ['0801', '0731', datetime.now(KST).strftime('%m%d')])
+@pytest.mark.parametrize('site_key, name, partition, page, expected', FIXTURE_PAGES,
+                         ids=[page[1] for page in FIXTURE_PAGES])
+def test_spec_matches_legacy_parser(site_key, name, partition, page, expected, target_date):
+    assert check_spec_parity(site_key, load(name), target_date, page, partition) == []
+
+
+@pytest.mark.parametrize('site_key, name, partition, page, expected', FIXTURE_PAGES,
+                         ids=[page[1] for page in FIXTURE_PAGES])
+def test_spec_collects_target_urls(site_key, name, partition, page, expected):
+    spec = SITE_SPECS[site_key]
+    posts = spec.parse(load(name), partition, page)
+    collected = {
+        post['url'] for post in posts
+        if spec.mmdd(post['date']) == '0801' and (post['title'] or not spec.require_title)
+    }
+    assert collected == expected
+    assert all(main.post_id_from_url(url) for url in collected)
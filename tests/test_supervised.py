@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+'''
+감독 프로세스(SupervisedCrawler) 테스트: 자식이 사이트 도중에 죽었을 때 받아둔 페이지 처리
+실행: python -m pytest tests/test_supervised.py
+'''
+
+import os
+import time
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+import main
+
+
+def _fm_records(page, n=5):
+    return [{'title': f'글 {page}-{i}', 'url': f'https://www.fmkorea.com/{page * 1000 + i}', 'source': 'FM코리아',
+             'views': 0, 'comments': 10 * (i + 1), 'date': '2025.08.01'} for i in range(n)]
+
+
+def crashing_crawler(target_date, on_page=None, start_page=None, end_page=None, budget=None, **kwargs):
+    """1페이지를 보고한 뒤 조회수 보강 전에 죽는 FM코리아 크롤러 (spawn 자식에서 실행)"""
+    on_page(1, _fm_records(1))
+    time.sleep(1.0)
+    os._exit(1)
+
+
+def restarting_crawler(target_date, on_page=None, start_page=None, end_page=None, budget=None, **kwargs):
+    """처음에는 1페이지 뒤 죽고, 재시작하면 2페이지부터 보강까지 끝내는 크롤러"""
+    if not start_page:
+        crashing_crawler(target_date, on_page)
+    records = _fm_records(2)
+    for record in records:
+        record.update(views=record['comments'] * 100, views_estimated=False)
+    on_page(2, records)
+    return pd.DataFrame(records)
+
+
+class DetailFetcher:
+    def __init__(self):
+        self.urls = []
+
+    def get_soup(self, url, expect=None, loader=None):
+        self.urls.append(url)
+        views = int(url.rsplit('/', 1)[1]) % 1000 * 100 + 100
+        return BeautifulSoup(f'<div class="side fr"><span>조회 {views}</span></div>', 'html.parser')
+
+    def close(self):
+        pass
+
+
+def _supervise(monkeypatch, crawler):
+    monkeypatch.setenv('FMKOREA_VIEW_ENRICHMENT', 'all')
+    monkeypatch.setattr(main, 'cleanup_orphan_browsers', lambda: None)
+    fetcher = DetailFetcher()
+    monkeypatch.setattr(main.HybridFetcher, 'acquire', classmethod(lambda cls, *args, **kwargs: fetcher))
+    supervised = main.SupervisedCrawler('fmkorea', crawler, heartbeat_timeout=30, max_restarts=1)
+    return supervised('0801'), fetcher
+
+
+def test_carried_fmkorea_pages_are_enriched(monkeypatch):
+    df, fetcher = _supervise(monkeypatch, crashing_crawler)
+
+    assert len(df) == 5
+    assert len(fetcher.urls) == 5
+    assert df['views'].tolist() == [100, 200, 300, 400, 500]
+    assert not df['views_estimated'].any()
+
+
+def test_only_carried_pages_are_enriched_after_restart(monkeypatch):
+    df, fetcher = _supervise(monkeypatch, restarting_crawler)
+
+    assert len(df) == 10
+    # 자식에서 보강까지 끝난 2페이지는 다시 가져오지 않음
+    assert sorted(fetcher.urls) == [f'https://www.fmkorea.com/{1000 + i}' for i in range(5)]
+    assert (df['views'] > 0).all()
+    assert df['views_estimated'].eq(False).all()
+
+
+def test_failed_enrichment_marks_carried_views_estimated(monkeypatch):
+    def broken(records, fetcher, budget):
+        raise RuntimeError("상세 페이지 수집 불가")
+    monkeypatch.setattr(main.SITE_SPECS['fmkorea'], 'post_process', broken)
+
+    df, _ = _supervise(monkeypatch, crashing_crawler)
+    assert df['views_estimated'].eq(True).all()
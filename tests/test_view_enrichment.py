@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+'''
+FM코리아 조회수 보강의 추정 표시(views_estimated) 테스트
+실행: python -m pytest tests/test_view_enrichment.py
+'''
+
+from datetime import date
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+import main
+
+
+class DetailFetcher:
+    """상세 페이지 조회수를 돌려주는 가짜 페처 (failing URL은 None)"""
+
+    def __init__(self, views, failing=()):
+        self.views = views
+        self.failing = set(failing)
+
+    def get_soup(self, url, expect=None, loader=None):
+        if url in self.failing:
+            return None
+        return BeautifulSoup(f'<div class="side fr"><span>조회 {self.views[url]:,}</span></div>', 'html.parser')
+
+
+def _records(n):
+    return [{'title': f'글 {i}', 'url': f'https://www.fmkorea.com/{i}', 'source': 'FM코리아',
+             'views': 0, 'comments': 100 - i, 'date': '2025.08.01'} for i in range(n)]
+
+
+def test_failed_detail_fetch_is_estimated_not_zero(monkeypatch):
+    monkeypatch.setenv('FMKOREA_VIEW_ENRICHMENT', 'all')
+    records = _records(5)
+    views = {r['url']: 1000 * (i + 1) for i, r in enumerate(records)}
+    fetcher = DetailFetcher(views, failing={records[2]['url']})
+
+    enriched = main.enrich_fmkorea_views(records, fetcher)
+
+    assert [r['views_estimated'] for r in enriched] == [False, False, True, False, False]
+    assert enriched[0]['views'] == 1000
+    # 실패한 게시물은 0이 아니라 표본으로 추정
+    assert enriched[2]['views'] > 0
+
+
+def test_estimated_marker_is_persisted_in_csv_and_archive(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for name in ('G_TOKEN', 'TITLE_INDEX_DIR', 'BODY_STORE_DIR', 'OUTPUT_MODE'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('ARCHIVE_PATH', str(tmp_path / 'archive.sqlite'))
+
+    fm = pd.DataFrame([
+        {'title': '실측 글', 'url': 'https://www.fmkorea.com/1', 'source': 'FM코리아', 'views': 500,
+         'comments': 10, 'date': '2025.08.01', 'views_estimated': False},
+        {'title': '추정 글', 'url': 'https://www.fmkorea.com/2', 'source': 'FM코리아', 'views': 300,
+         'comments': 5, 'date': '2025.08.01', 'views_estimated': True},
+    ])
+    dc = pd.DataFrame([{'title': '디시 글', 'url': 'https://gall.dcinside.com/1', 'source': '디시인사이드',
+                        'views': 100, 'comments': 1, 'date': '25.08.01'}])
+
+    result = main.finalize_results({'FM코리아': fm, '디시인사이드': dc}, main.HotScoreCalculator(), date(2025, 8, 1))
+
+    # 토큰이 없으므로 업로드 대신 로컬에 저장된 CSV 확인
+    csv = pd.read_csv(result['upload_result']['local_file'], encoding='utf-8-sig')
+    assert dict(zip(csv['url'], csv['views_estimated'])) == {
+        'https://www.fmkorea.com/1': False,
+        'https://www.fmkorea.com/2': True,
+        'https://gall.dcinside.com/1': False,
+    }
+
+    archive = main.CrawlArchive(str(tmp_path / 'archive.sqlite'))
+    stored = archive.top_posts(10)
+    archive.close()
+    assert dict(zip(stored['url'], stored['views_estimated'])) == {
+        'https://www.fmkorea.com/1': 0,
+        'https://www.fmkorea.com/2': 1,
+        'https://gall.dcinside.com/1': 0,
+    }